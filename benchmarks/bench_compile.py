@@ -0,0 +1,100 @@
+"""Benchmarks for the SQLStandard compilation."""
+import tempfile
+
+from toki import datatypes as dtypes
+from toki import types as tps
+from toki.backends.cache import DiskCompileCache
+from toki.backends.sql_standard import SQLStandard
+
+
+class TimeCompileBatch:
+    """Compile a batch of expressions that share most of their sub-trees."""
+
+    params = [10, 100]
+    param_names = ['distinct']
+
+    def setup(self, distinct):
+        self.con = SQLStandard()
+        self.exprs = [
+            dtypes.int32(i % distinct) * dtypes.float64(1.5)
+            for i in range(300)
+        ]
+        # build the rules before timing
+        self.con.compile(self.exprs[0])
+
+    def time_compile_loop(self, distinct):
+        [self.con.compile(expr) for expr in self.exprs]
+
+    def time_compile_many(self, distinct):
+        self.con.compile_many(self.exprs)
+
+
+class TimeCompileShape:
+    """Compile expressions of growing depth and width."""
+
+    params = [1, 8, 32, 128]
+    param_names = ['size']
+
+    def setup(self, size):
+        schema = tps.TableSchema.expr(
+            {
+                'c{}'.format(i): {'type': 'float64', 'nullable': False}
+                for i in range(size + 1)
+            }
+        )
+        table = tps.Table.expr('t', schema)
+        self.con = SQLStandard()
+
+        # a chain of ``size`` operations
+        self.deep = table['c0']
+        for _ in range(size):
+            self.deep = self.deep * dtypes.float64(1.5) + table['c1']
+
+        # a balanced sum of ``size + 1`` columns
+        columns = [table['c{}'.format(i)] for i in range(size + 1)]
+        while len(columns) > 1:
+            pairs = zip(columns[::2], columns[1::2])
+            columns = [x + y for x, y in pairs] + columns[len(columns) & ~1 :]
+        self.wide = columns[0]
+        # build the rules before timing
+        self.con.compile(table['c0'] + table['c0'])
+
+    def time_compile_deep(self, size):
+        self.con.compile(self.deep)
+
+    def time_compile_wide(self, size):
+        self.con.compile(self.wide)
+
+
+class TimeCompileDiskCache:
+    """Compile a known expression in a new backend, as a new worker does."""
+
+    params = [8, 128]
+    param_names = ['size']
+
+    def setup(self, size):
+        self.directory = tempfile.TemporaryDirectory()
+        table = tps.Table.expr(
+            't',
+            tps.TableSchema.expr(
+                {'c0': {'type': 'float64', 'nullable': False}}
+            ),
+        )
+        # the operations between literals are compiled by the rewrite
+        self.expr = table['c0']
+        for i in range(size):
+            self.expr = self.expr + dtypes.int32(i) * dtypes.float64(1.5)
+        SQLStandard(disk_cache=DiskCompileCache(self.directory.name)).compile(
+            self.expr
+        )
+
+    def teardown(self, size):
+        self.directory.cleanup()
+
+    def time_compile_cold(self, size):
+        SQLStandard().compile(self.expr)
+
+    def time_compile_cold_disk_cache(self, size):
+        cache = DiskCompileCache(self.directory.name)
+        SQLStandard(disk_cache=cache).compile(self.expr)
+        cache.close()
@@ -0,0 +1,58 @@
+"""Benchmarks for the SQLStandard execution over a SQLite file."""
+import os
+import sqlite3
+import tempfile
+import time
+
+from toki import types as tps
+from toki.backends.sql_standard import SQLStandard
+
+
+class TimeExecute:
+    """Execute a column expression end to end (compile, query, fetch)."""
+
+    params = [1_000, 100_000]
+    param_names = ['rows']
+    timeout = 120
+
+    def setup(self, rows):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        database = os.path.join(self.tmpdir.name, 'toki.db')
+        connection = sqlite3.connect(database)
+        connection.execute('CREATE TABLE t (a INTEGER, b REAL)')
+        connection.executemany(
+            'INSERT INTO t VALUES (?, ?)',
+            ((i, i / 2) for i in range(rows)),
+        )
+        connection.commit()
+        connection.close()
+
+        schema = tps.TableSchema.expr(
+            {
+                'a': {'type': 'int64', 'nullable': False},
+                'b': {'type': 'float64', 'nullable': False},
+            }
+        )
+        table = tps.Table.expr('t', schema)
+        self.expr = (table['a'] + table['b']) * table['a']
+        self.con = SQLStandard(database=database)
+        self.con.connect()
+
+    def teardown(self, rows):
+        self.con.close()
+        self.tmpdir.cleanup()
+
+    def time_execute(self, rows):
+        self.con.execute(self.expr)
+
+    def time_execute_stream(self, rows):
+        for _ in self.con.execute_stream(self.expr):
+            pass
+
+    def track_rows_per_second(self, rows):
+        # throughput of a single run, so it is comparable between sizes
+        start = time.perf_counter()
+        self.con.execute(self.expr)
+        return rows / (time.perf_counter() - start)
+
+    track_rows_per_second.unit = 'rows/s'
@@ -0,0 +1,20 @@
+"""Benchmarks for the import and startup time of the toki modules."""
+
+
+class TimeImport:
+    """Import the modules in a new interpreter."""
+
+    def timeraw_import_toki(self):
+        return 'import toki'
+
+    def timeraw_import_sql_standard(self):
+        return 'import toki.backends.sql_standard'
+
+    def timeraw_first_compile(self):
+        # the startup of a short-lived job: import, then compile once
+        return '''
+from toki import datatypes as dtypes
+from toki.backends.sql_standard import SQLStandard
+
+SQLStandard().compile(dtypes.int8(1) + dtypes.int16(2))
+'''
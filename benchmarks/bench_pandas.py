@@ -0,0 +1,40 @@
+"""Benchmarks for the PandasBackend evaluation."""
+import numpy as np
+import pandas as pd
+
+from toki import types as tps
+from toki.backends.pandas_backend import PandasBackend
+
+
+class TimeFusedEvaluation:
+    """Evaluate a chain of column operations, fused and unfused."""
+
+    params = [[100_000, 4_000_000], [True, False]]
+    param_names = ['rows', 'fused']
+
+    def setup(self, rows, fused):
+        schema = tps.TableSchema.expr(
+            {
+                'a': {'type': 'int64', 'nullable': False},
+                'b': {'type': 'float64', 'nullable': False},
+                'c': {'type': 'float64', 'nullable': False},
+            }
+        )
+        table = tps.Table.expr('t', schema)
+        data = pd.DataFrame(
+            {
+                'a': np.arange(rows),
+                'b': np.random.rand(rows),
+                'c': np.random.rand(rows),
+            }
+        )
+        self.con = PandasBackend({'t': data}, fused=fused)
+        self.program = self.con.compile(
+            (table['a'] + table['b']) * table['c'] - 1
+        )
+
+    def time_run(self, rows, fused):
+        self.con.run(self.program)
+
+    def peakmem_run(self, rows, fused):
+        self.con.run(self.program)
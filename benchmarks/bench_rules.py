@@ -0,0 +1,34 @@
+"""Benchmarks for the rules dispatch used by the backends."""
+import metadsl_rewrite
+
+from toki import datatypes as dtypes
+from toki.backends.sql_standard import STRATEGY, SQLStandard
+from toki.rules import RegisterStrategy
+
+
+def _extra_rule(x: int, y: int) -> str:
+    # stands for operators of other types (string, temporal, decimal, ...)
+    return dtypes.int8(x) == dtypes.int8(y), lambda: '{} = {}'.format(x, y)
+
+
+class TimeCompileRuleCount:
+    """Compile time as the number of registered rules grows."""
+
+    params = ([0, 588, 1764], [True, False])
+    param_names = ['extra_rules', 'indexed']
+
+    def setup(self, extra_rules, indexed):
+        strategy = RegisterStrategy(indexed=indexed)
+        for rule in STRATEGY:
+            strategy.register(rule)
+        extra = metadsl_rewrite.rule(_extra_rule)
+        for _ in range(extra_rules):
+            strategy.register(extra)
+
+        self.con = SQLStandard(strategy)
+        self.expr = dtypes.float64(1.5) // dtypes.int16(2)
+        # build the rules before timing
+        self.con.compile(self.expr)
+
+    def time_compile(self, extra_rules, indexed):
+        self.con.compile(self.expr)
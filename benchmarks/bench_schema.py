@@ -0,0 +1,58 @@
+"""Benchmarks for the schema lookups of wide tables."""
+from toki import types as tps
+
+
+class TimeSchemaLookup:
+    """Get columns and projections from tables with many columns."""
+
+    params = [10, 1000, 10000]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        self.names = ['c{}'.format(i) for i in range(columns)]
+        schema = tps.TableSchema.expr(
+            {
+                name: {'type': 'float64', 'nullable': False}
+                for name in self.names
+            }
+        )
+        self.table = tps.Table.expr('t', schema)
+
+    def time_column(self, columns):
+        self.table[self.names[-1]]
+
+    def time_projection(self, columns):
+        self.table[self.names[::10]]
+
+    def time_projection_schema(self, columns):
+        self.table[self.names[::10]].schema
+
+    def time_fingerprint(self, columns):
+        tps.fingerprint(self.table)
+
+    def time_repr(self, columns):
+        repr(self.table)
+
+
+class TimeSchemaBuild:
+    """Create the schema of tables with many columns."""
+
+    params = [10, 1000, 10000]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        self.structure = {
+            'c{}'.format(i): {'type': 'float64', 'nullable': False}
+            for i in range(columns)
+        }
+
+    def time_schema(self, columns):
+        tps.TableSchema.expr(self.structure)
+
+    def peakmem_tables(self, columns):
+        [
+            tps.Table.expr(
+                't{}'.format(i), tps.TableSchema.expr(self.structure)
+            )
+            for i in range(10)
+        ]
@@ -0,0 +1,89 @@
+"""Benchmarks for the expressions binary serialization."""
+import pickle
+
+import metadsl
+
+from toki import types as tps
+from toki.serialization import deserialize, serialize
+from toki.types import function_name, postorder
+
+
+def _plain(expr):
+    """
+    Get the expression as nested tuples of its types, functions and values.
+
+    The toki expressions can't be pickled (the constructors are not
+    reachable by their names), so pickle is measured over this form, with
+    the same information as the binary format.
+    """
+    plain = {}
+
+    def value(v):
+        if isinstance(v, metadsl.Expression):
+            return plain[id(v)]
+        if isinstance(v, (list, tuple)):
+            return type(v)(value(item) for item in v)
+        if isinstance(v, tps.SchemaLayout):
+            return (v.names, v.types, v.nullable)
+        return v
+
+    for node in postorder(expr):
+        plain[id(node)] = (
+            type(node).__module__,
+            type(node).__qualname__,
+            function_name(node.function),
+            getattr(getattr(node.function, 'owner', None), '__name__', None),
+            [value(arg) for arg in node.args],
+            getattr(node, 'rename', None),
+        )
+    return plain[id(expr)]
+
+
+class TimeSerialize:
+    """
+    Encode and decode a sum of columns, against pickle.
+
+    Pickle is recursive, so it fails for much deeper expressions.
+    """
+
+    params = [10, 100, 300]
+    param_names = ['columns']
+
+    def setup(self, columns):
+        names = ['c{}'.format(i) for i in range(columns)]
+        schema = tps.TableSchema.expr(
+            {name: {'type': 'float64', 'nullable': False} for name in names}
+        )
+        table = tps.Table.expr('t', schema)
+        expr = table[names[0]]
+        for name in names[1:]:
+            expr = expr + table[name] * 2
+        self.expr = expr
+        self.data = serialize(expr)
+        self.plain = _plain(expr)
+        self.pickled = pickle.dumps(self.plain)
+
+    def time_serialize(self, columns):
+        serialize(self.expr)
+
+    def time_serialize_not_structural(self, columns):
+        serialize(self.expr, structural=False)
+
+    def time_deserialize(self, columns):
+        deserialize(self.data)
+
+    def time_pickle_dumps(self, columns):
+        pickle.dumps(_plain(self.expr))
+
+    def time_pickle_loads(self, columns):
+        pickle.loads(self.pickled)
+
+    def track_size(self, columns):
+        return len(self.data)
+
+    track_size.unit = 'bytes'
+
+    def track_pickle_size(self, columns):
+        return len(self.pickled)
+
+    track_pickle_size.unit = 'bytes'
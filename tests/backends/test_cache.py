@@ -0,0 +1,216 @@
+"""Tests for `toki.backends.cache` module."""
+import multiprocessing
+import sqlite3
+
+import metadsl_rewrite
+import pytest
+
+from toki import datatypes as dtypes
+from toki.backends.cache import CompileCache, DiskCompileCache
+from toki.backends.sql_standard import STRATEGY, SQLStandard
+from toki.rules import RegisterStrategy
+
+
+@pytest.mark.parametrize(
+    'policy,expected', [('lru', ['a', 'c']), ('fifo', ['b', 'c'])]
+)
+def test_cache_eviction(policy, expected):
+    cache = CompileCache(maxsize=2, policy=policy)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1
+    cache.put('c', 3)
+
+    assert [k for k in 'abc' if k in cache] == expected
+    assert cache.stats['evictions'] == 1
+
+
+def test_cache_invalid_args():
+    with pytest.raises(ValueError):
+        CompileCache(maxsize=0)
+    with pytest.raises(ValueError):
+        CompileCache(policy='random')
+
+
+def test_compile_cached():
+    con = SQLStandard(cache=CompileCache(maxsize=8))
+
+    assert con.compile(dtypes.int8(1) + dtypes.int16(2)) == '1 + 2'
+    assert con.compile(dtypes.int8(1) + dtypes.int16(2)) == '1 + 2'
+    assert con.compile(dtypes.int8(1) + dtypes.int16(3)) == '1 + 3'
+    assert con.cache.hits == 1
+    assert con.cache.misses == 2
+
+
+def _int8_rule(x: int) -> str:
+    return dtypes.int8(x), lambda: 'int8 {}'.format(x)
+
+
+def test_compile_cache_invalidated():
+    strategy = RegisterStrategy()
+    for rule in STRATEGY:
+        strategy.register(rule)
+    con = SQLStandard(strategy, cache=CompileCache())
+
+    con.compile(dtypes.int8(1) + dtypes.int16(2))
+    assert len(con.cache) == 1
+
+    strategy.register(metadsl_rewrite.rule(_int8_rule))
+    assert con.compile(dtypes.int8(1)) == 'int8 1'
+    assert len(con.cache) == 1
+
+
+def _int8_cast_rule(x: int) -> str:
+    return dtypes.int8(x), lambda: 'CAST({} AS TINYINT)'.format(x)
+
+
+def test_compile_cache_shared():
+    strategy_a, strategy_b = RegisterStrategy(), RegisterStrategy()
+    strategy_a.register(metadsl_rewrite.rule(_int8_rule))
+    strategy_b.register(metadsl_rewrite.rule(_int8_cast_rule))
+    assert strategy_a.version == strategy_b.version
+
+    cache = CompileCache()
+    con_a = SQLStandard(strategy_a, cache=cache)
+    con_b = SQLStandard(strategy_b, cache=cache)
+    assert con_a.compile(dtypes.int8(1)) == 'int8 1'
+    assert con_b.compile(dtypes.int8(1)) == 'CAST(1 AS TINYINT)'
+    assert con_a.compile(dtypes.int8(1)) == 'int8 1'
+    assert cache.hits == 1
+
+
+@pytest.mark.parametrize(
+    'policy,expected', [('lru', ['a', 'c']), ('fifo', ['b', 'c'])]
+)
+def test_disk_cache_eviction(tmp_path, policy, expected):
+    cache = DiskCompileCache(str(tmp_path), maxsize=2, policy=policy)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    assert cache.get('a') == '1'
+    cache.put('c', '3')
+
+    assert [k for k in 'abc' if k in cache] == expected
+    assert cache.stats['evictions'] == 1
+    assert cache.stats['size'] == 2
+
+
+def test_disk_cache_persistent(tmp_path):
+    cache = DiskCompileCache(str(tmp_path))
+    cache.put('a', 'SELECT 1')
+    cache.close()
+
+    cache = DiskCompileCache(str(tmp_path))
+    assert cache.get('a') == 'SELECT 1'
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(TypeError):
+        cache.put('a', 1)
+
+
+def test_disk_cache_invalid_args(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCompileCache(str(tmp_path), maxsize=0)
+    with pytest.raises(ValueError):
+        DiskCompileCache(str(tmp_path), policy='random')
+
+
+def _put_many(directory, worker):
+    cache = DiskCompileCache(directory, maxsize=1000)
+    for i in range(50):
+        cache.put('{}-{}'.format(worker, i), str(i))
+        assert cache.get('{}-{}'.format(worker, i)) == str(i)
+
+
+def test_disk_cache_processes(tmp_path):
+    context = multiprocessing.get_context('fork')
+    processes = [
+        context.Process(target=_put_many, args=(str(tmp_path), worker))
+        for worker in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0] * 4
+    assert len(DiskCompileCache(str(tmp_path))) == 200
+
+
+def test_compile_disk_cached(tmp_path, monkeypatch):
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    con = SQLStandard(disk_cache=DiskCompileCache(str(tmp_path)))
+    assert con.compile(expr) == '1 + 2'
+    assert con.disk_cache.stats['misses'] == 1
+
+    # a new backend, e.g. from another process, doesn't rewrite it
+    con = SQLStandard(
+        cache=CompileCache(), disk_cache=DiskCompileCache(str(tmp_path))
+    )
+    monkeypatch.setattr(con, '_rewrite', None)
+    assert con.compile(expr) == '1 + 2'
+    assert con.compile(expr) == '1 + 2'
+    assert con.disk_cache.stats['hits'] == 1
+
+    # the compiled values depend on the rules and options
+    strategy = RegisterStrategy()
+    for rule in STRATEGY:
+        strategy.register(rule)
+    strategy.register(metadsl_rewrite.rule(_int8_rule))
+    con = SQLStandard(strategy, disk_cache=DiskCompileCache(str(tmp_path)))
+    assert con.compile(expr) == '(int8 1) + 2'
+    con = SQLStandard(
+        optimize=True, disk_cache=DiskCompileCache(str(tmp_path))
+    )
+    assert con.compile(expr) == '3'
+    assert con.disk_cache.stats['size'] == 3
+
+
+def test_rules_signature():
+    strategy = RegisterStrategy()
+    other = RegisterStrategy()
+    for rule in STRATEGY:
+        strategy.register(rule)
+        other.register(rule)
+    assert strategy.signature == other.signature
+
+    signature = strategy.signature
+    strategy.register(metadsl_rewrite.rule(_int8_rule))
+    assert strategy.signature != signature
+
+
+def test_compile_disk_cache_locked(tmp_path):
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    cache = DiskCompileCache(str(tmp_path), timeout=0.01)
+    cache.put('a', '1')
+
+    # another process holds the write lock
+    other = sqlite3.connect(cache.path, isolation_level=None)
+    other.execute('BEGIN IMMEDIATE')
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            cache.put('b', '2')
+        con = SQLStandard(disk_cache=cache)
+        assert con.compile(expr) == '1 + 2'
+    finally:
+        other.execute('ROLLBACK')
+        other.close()
+
+    assert len(cache) == 1
+    cache.put('b', '2')
+    assert cache.get('b') == '2'
+
+
+def test_compile_disk_cache_unwritable(tmp_path):
+    # the directory can't be created, e.g. on a read-only file system
+    (tmp_path / 'file').write_text('')
+    cache = DiskCompileCache(str(tmp_path / 'file' / 'cache'))
+    with pytest.raises(OSError):
+        cache.get('a')
+
+    con = SQLStandard(cache=CompileCache(), disk_cache=cache)
+    assert con.compile(dtypes.int8(1) + dtypes.int16(2)) == '1 + 2'
+    assert con.compile(dtypes.int8(1) + dtypes.int16(2)) == '1 + 2'
+    assert con.cache.hits == 1
@@ -0,0 +1,243 @@
+"""Tests for `toki.backends.pandas_backend` module."""
+import asyncio
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from toki import datatypes as dtypes
+from toki import types as tps
+from toki.backends.core import execute_many_async
+from toki.backends.pandas_backend import (
+    PandasBackend,
+    Program,
+    _run_partition,
+    fuse,
+)
+from toki.cost import CostModel
+from toki.statistics import ColumnStatistics, TableStatistics
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'float64', 'nullable': True},
+            'c': {'type': 'bool', 'nullable': False},
+        }
+    )
+    return tps.Table.expr('t', schema)
+
+
+@pytest.fixture
+def con():
+    data = pd.DataFrame(
+        {'a': [1, 2, 3], 'b': [10.0, 20.0, np.nan], 'c': [True, False, True]}
+    )
+    return PandasBackend({'t': data})
+
+
+def test_execute_table(con, table):
+    result = con.execute(table)
+    pd.testing.assert_frame_equal(result, con.tables['t'])
+    assert result is not con.tables['t']
+
+    assert list(con.execute(table[['a', 'c']]).columns) == ['a', 'c']
+    assert con.execute(table['a'])['a'].tolist() == [1, 2, 3]
+    assert con.execute(table['a'].name('x'))['x'].tolist() == [1, 2, 3]
+
+    result = con.execute(table[['a', 'b']][['a']]['a'] + table[['c']]['c'])
+    assert result.iloc[:, 0].tolist() == [2, 2, 4]
+
+
+def test_execute_operations(con, table):
+    result = con.execute((table['a'] + table['b']) * table['a'] - 1)
+    assert list(result.columns) == ['((a + b) * a) - 1']
+    assert result.iloc[:2, 0].tolist() == [10.0, 43.0]
+    assert np.isnan(result.iloc[2, 0])
+
+    result = con.execute((table['a'] > 1) & table['c'])
+    assert result.iloc[:, 0].tolist() == [False, False, True]
+
+    result = con.execute(table['a'] / 2)
+    assert result.iloc[:, 0].tolist() == [0.5, 1.0, 1.5]
+
+    result = con.execute(dtypes.int8(1) + dtypes.int16(2))
+    assert result.iloc[0, 0] == 3
+
+
+def test_compile_shares_sources(con, table):
+    program = con.compile(table['a'] * table['a'] + table['b'])
+    opcodes = [step[0] for step in program.steps]
+    assert opcodes.count('table') == 1
+    assert opcodes.count('column') == 2
+
+
+def test_compile_common_subexpressions(con, table):
+    norm = (table['a'] - table['b']) / table['b']
+    program = con.compile(norm * 2 + norm * 3)
+    opcodes = [step[0] for step in program.steps]
+    assert opcodes.count('column') == 2
+    # ``norm`` is computed once, its fused step is used twice
+    assert opcodes.count('fused') == 2
+
+    result = con.execute(norm * 2 + norm * 3)
+    assert result.iloc[:2, 0].tolist() == [-4.5, -4.5]
+
+
+def test_execute_stream(con, table):
+    chunks = list(con.execute_stream(table, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+
+
+def test_execute_many_async(con, table):
+    exprs = [table['a'] + i for i in range(4)]
+    results = asyncio.run(execute_many_async(con, exprs, concurrency=2))
+    assert [r.iloc[0, 0] for r in results] == [1, 2, 3, 4]
+
+
+def test_table_not_registered(table):
+    with pytest.raises(KeyError):
+        PandasBackend().execute(table)
+
+
+@pytest.mark.parametrize('blocksize', [1, 2, 1024])
+def test_fused(table, blocksize):
+    data = pd.DataFrame(
+        {
+            'a': np.arange(5, dtype='int32'),
+            'b': np.linspace(0, 1, 5),
+            'c': [True, False, True, True, False],
+        }
+    )
+    fused = PandasBackend({'t': data}, blocksize=blocksize)
+    unfused = PandasBackend({'t': data}, fused=False)
+
+    for expr in [
+        (table['a'] + table['b']) * table['a'] - 1,
+        (table['a'] > 1) & table['c'],
+        table['a'] * (dtypes.int8(2) + dtypes.int8(3)),
+    ]:
+        pd.testing.assert_frame_equal(
+            fused.execute(expr), unfused.execute(expr)
+        )
+
+    program = fused.compile((table['a'] + table['b']) * table['a'] - 1)
+    opcodes = [step[0] for step in program.steps]
+    assert opcodes.count('fused') == 1
+    assert 'ufunc' not in opcodes
+
+
+def test_fused_shared_step_not_merged():
+    # the add step is used twice, so it is computed once by its own step
+    program = Program(
+        [
+            ('literal', np.arange(3), ()),
+            ('ufunc', np.add, (0, 0)),
+            ('ufunc', np.multiply, (1, 1)),
+            ('ufunc', np.negative, (2,)),
+        ]
+    )
+    fused = fuse(program, blocksize=2)
+    assert [step[0] for step in fused.steps] == ['literal', 'ufunc', 'fused']
+    assert PandasBackend().run(fused).tolist() == [0, -4, -16]
+
+
+def test_partitioned(table):
+    rows = 1000
+    data = pd.DataFrame(
+        {
+            'a': np.arange(rows, dtype='int32'),
+            'b': np.random.rand(rows),
+            'c': np.arange(rows) % 2 == 0,
+        }
+    )
+    con = PandasBackend({'t': data}, partition_size=300, workers=2)
+    sequential = PandasBackend({'t': data})
+
+    try:
+        for expr in [
+            (table['a'] + table['b']) * table['a'] - 1,
+            (table['a'] > 10) & table['c'],
+            table['a'],
+        ]:
+            pd.testing.assert_frame_equal(
+                con.execute(expr), sequential.execute(expr)
+            )
+        assert con._executor is not None
+
+        # whole tables are not split
+        pd.testing.assert_frame_equal(con.execute(table), data)
+    finally:
+        con.close()
+    assert con._executor is None
+
+
+def test_statistics(con, table):
+    statistics = con.statistics(table)
+    assert statistics.row_count == 3
+    assert statistics.columns['a'] == ColumnStatistics(1, 3, 0, 3)
+    assert statistics.columns['b'] == ColumnStatistics(10.0, 20.0, 1, 2)
+    assert con.statistics(table) is statistics
+
+    # binding new data invalidates the statistics
+    con.register('t', con.tables['t'].iloc[:1])
+    assert con.statistics(table).row_count == 1
+
+
+def test_partitioned_cost_model(table):
+    data = pd.DataFrame(
+        {'a': np.arange(10, dtype='int32'), 'b': np.ones(10), 'c': True}
+    )
+    expr = table['a'] + table['b']
+
+    # small expressions are evaluated sequentially
+    con = PandasBackend({'t': data}, cost_model=CostModel(), workers=2)
+    pd.testing.assert_frame_equal(
+        con.execute(expr), PandasBackend({'t': data}).execute(expr)
+    )
+    assert con._executor is None
+
+    con = PandasBackend(
+        {'t': data}, cost_model=CostModel(partition_cost=0.1), workers=2
+    )
+    try:
+        pd.testing.assert_frame_equal(
+            con.execute(expr), PandasBackend({'t': data}).execute(expr)
+        )
+        assert con._executor is not None
+    finally:
+        con.close()
+
+    # the partitions are chosen from the statistics
+    con = PandasBackend(
+        {'t': data}, cost_model=CostModel(partition_cost=0.1), workers=2
+    )
+    con.statistics_cache.set('t', TableStatistics(1))
+    pd.testing.assert_frame_equal(
+        con.execute(expr), PandasBackend({'t': data}).execute(expr)
+    )
+    assert con._executor is None
+
+
+def _fail(values):
+    raise ValueError('partition failed')
+
+
+def test_run_partition_error():
+    column = np.arange(4, dtype='int64')
+    memory = shared_memory.SharedMemory(create=True, size=column.nbytes)
+    try:
+        shared = (memory.name, column.dtype.str, len(column))
+        steps = [('column', 'a', ()), ('ufunc', _fail, (0,))]
+        # the worker error is raised, not a ``BufferError`` from the views
+        with pytest.raises(ValueError, match='partition failed'):
+            _run_partition(steps, {0: shared}, shared, 0, 2)
+
+        # a step that returns the input view
+        _run_partition(steps[:1], {0: shared}, shared, 0, 2)
+    finally:
+        memory.close()
+        memory.unlink()
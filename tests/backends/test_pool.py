@@ -0,0 +1,147 @@
+"""Tests for `toki.backends.pool` module."""
+import threading
+import time
+
+import pytest
+
+from toki.backends.pool import ConnectionPool
+
+
+class Connection:
+    def __init__(self):
+        self.closed = False
+        self.healthy = True
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuse():
+    pool = ConnectionPool(Connection, maxsize=2)
+    with pool.connection() as connection:
+        assert pool.stats['in_use'] == 1
+        assert pool.stats['utilisation'] == 0.5
+    with pool.connection() as connection_:
+        assert connection_ is connection
+
+    assert pool.stats['created'] == 1
+    assert pool.stats['acquisitions'] == 2
+    assert pool.stats['in_use'] == 0
+
+
+def test_pool_open_close():
+    pool = ConnectionPool(Connection, minsize=2, maxsize=3)
+    pool.open()
+    assert pool.stats['idle'] == 2
+
+    connection = pool.acquire()
+    pool.close()
+    assert pool.size == 1
+    pool.release(connection)
+    assert connection.closed
+    assert pool.size == 0
+
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+
+
+def test_pool_health_check():
+    pool = ConnectionPool(Connection, health_check=lambda c: c.healthy)
+    with pool.connection() as connection:
+        connection.healthy = False
+
+    with pool.connection() as connection_:
+        assert connection_ is not connection
+    assert connection.closed
+    assert pool.stats['failed_checks'] == 1
+    assert pool.size == 1
+
+
+def test_pool_idle_eviction():
+    pool = ConnectionPool(Connection, minsize=1, maxsize=2, idle_timeout=0)
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+
+    # the minimum size is kept
+    assert pool.size == 1
+    assert pool.stats['evicted'] == 1
+
+
+def test_pool_wait():
+    pool = ConnectionPool(Connection, maxsize=1)
+    connection = pool.acquire()
+
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.01)
+
+    timer = threading.Timer(0.05, pool.release, [connection])
+    timer.start()
+    start = time.monotonic()
+    assert pool.acquire(timeout=5) is connection
+    timer.join()
+
+    assert pool.stats['waits'] == 1
+    assert pool.stats['max_wait_time'] <= time.monotonic() - start
+    assert pool.stats['max_wait_time'] > 0
+
+
+def test_pool_invalid_args():
+    with pytest.raises(ValueError):
+        ConnectionPool(Connection, maxsize=0)
+    with pytest.raises(ValueError):
+        ConnectionPool(Connection, minsize=3, maxsize=2)
+
+
+def test_pool_close_waiting():
+    pool = ConnectionPool(Connection, maxsize=1)
+    connection = pool.acquire()
+    errors = []
+
+    def acquire():
+        try:
+            pool.acquire(timeout=5)
+        except RuntimeError as error:
+            errors.append(error)
+
+    thread = threading.Thread(target=acquire)
+    thread.start()
+    time.sleep(0.05)
+    pool.close()
+    thread.join(5)
+    assert len(errors) == 1
+    assert pool.stats['created'] == 1
+
+    pool.release(connection)
+    assert pool.size == 0
+
+
+def test_pool_slow_factory():
+    started, done = threading.Event(), threading.Event()
+
+    def factory():
+        if not started.is_set():
+            started.set()
+            done.wait(5)
+        return Connection()
+
+    pool = ConnectionPool(factory, maxsize=2)
+    thread = threading.Thread(target=pool.acquire)
+    thread.start()
+    started.wait(5)
+    # the slow connect doesn't block the other threads
+    assert pool.stats['in_use'] == 1
+    pool.release(pool.acquire(timeout=1))
+    done.set()
+    thread.join(5)
+    assert pool.size == 2
+
+
+def test_pool_factory_error():
+    def factory():
+        raise OSError('unreachable')
+
+    pool = ConnectionPool(factory, maxsize=1)
+    with pytest.raises(OSError):
+        pool.acquire()
+    assert pool.size == 0
@@ -1,8 +1,17 @@
 """Tests for `toki.datatypes` module."""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
 import pytest
 
 from toki import datatypes as dtypes
-from toki.backends.sql_standard import SQLStandard
+from toki import types as tps
+from toki.backends.cache import CompileCache
+from toki.backends.core import execute_many_async
+from toki.backends.sql_standard import STRATEGY, SQLStandard, sqlite_pool
+from toki.rules import _rule_key
+from toki.statistics import ColumnStatistics
 
 from .common import NUMBER_TYPES
 
@@ -53,3 +62,347 @@ def test_compile(con, tp_x, tp_y):
     assert con.compile(x_expr // y_expr) == '{} // {}'.format(x, y)
     assert con.compile(x_expr ** y_expr) == '{} ** {}'.format(x, y)
     assert con.compile(x_expr % y_expr) == '{} % {}'.format(x, y)
+
+
+def test_compile_many(con):
+    exprs = [dtypes.int8(i % 3) + dtypes.int16(2) for i in range(9)]
+    assert con.compile_many(exprs) == [con.compile(e) for e in exprs]
+    assert con.compile_many([]) == []
+
+
+def test_compile_many_shared():
+    con = SQLStandard(cache=CompileCache())
+    exprs = [dtypes.int8(i % 3) * dtypes.float64(2.5) for i in range(9)]
+
+    assert con.compile_many(exprs)[:3] == ['0 * 2.5', '1 * 2.5', '2 * 2.5']
+    # each distinct expression is compiled once
+    assert con.cache.misses == 3
+    assert con.cache.hits == 0
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'int64', 'nullable': True},
+        }
+    )
+    return tps.Table.expr('t', schema)
+
+
+@pytest.fixture
+def con_data(tmp_path):
+    con = SQLStandard(database=str(tmp_path / 'toki.db'), arraysize=2)
+    con.connect()
+    with con.pool.connection() as connection:
+        connection.executescript(
+            '''
+            CREATE TABLE t (a INTEGER, b INTEGER);
+            INSERT INTO t VALUES (1, 10), (2, 20), (3, NULL);
+            '''
+        )
+    yield con
+    con.close()
+
+
+def test_compile_table(con, table):
+    assert con.compile(table) == 'SELECT * FROM t'
+    assert con.compile(table[['a', 'b']]) == 'SELECT a, b FROM t'
+    assert con.compile(table['a']) == 'SELECT a FROM t'
+    assert con.compile(table['a'].name('x')) == 'SELECT a AS x FROM t'
+    # nested projections are collapsed
+    assert con.compile(table[['a', 'b']][['a']]['a']) == 'SELECT a FROM t'
+    assert (
+        con.compile(table[['a']]['a'] + table[['b']]['b'])
+        == 'SELECT a + b FROM t'
+    )
+    assert con.compile(table['a'] + table['b']) == 'SELECT a + b FROM t'
+    assert con.compile(table['a'] > 1) == 'SELECT a > 1 FROM t'
+    assert (
+        con.compile((table['a'] + table['b']) * table['a'] - 1)
+        == 'SELECT ((a + b) * a) - 1 FROM t'
+    )
+
+
+def test_execute(con_data, table):
+    result = con_data.execute(table)
+    assert list(result.columns) == ['a', 'b']
+    assert result['a'].tolist() == [1, 2, 3]
+
+    result = con_data.execute(table['a'] * table['b'])
+    assert result.iloc[:2, 0].tolist() == [10, 40]
+    assert result.iloc[:, 0].isna().tolist() == [False, False, True]
+
+    result = con_data.execute(dtypes.int8(1) + dtypes.int16(2))
+    assert result.iloc[0, 0] == 3
+
+
+def test_execute_empty(con_data, table):
+    with con_data.pool.connection() as connection:
+        connection.execute('DELETE FROM t')
+    result = con_data.execute(table)
+    assert list(result.columns) == ['a', 'b']
+    assert result.empty
+
+
+def test_execute_stream(con_data, table):
+    chunks = list(con_data.execute_stream(table, chunksize=2))
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert list(chunks[0].columns) == ['a', 'b']
+    assert pd.concat(chunks)['a'].tolist() == [1, 2, 3]
+
+    # default chunk size is the backend arraysize
+    assert len(next(con_data.execute_stream(table['a']))) == 2
+
+
+@pytest.mark.parametrize('database', [':memory:', 'toki.db'])
+def test_execute_stream_nested(tmp_path, table, database):
+    if database != ':memory:':
+        database = str(tmp_path / database)
+    con = SQLStandard(database=database, arraysize=1)
+    with con.pool.connection() as connection:
+        connection.executescript(
+            '''
+            CREATE TABLE t (a INTEGER, b INTEGER);
+            INSERT INTO t VALUES (1, 10), (2, 20);
+            '''
+        )
+
+    # the queries inside the stream loop use the stream connection
+    for chunk in con.execute_stream(table):
+        assert con.execute(table['a'])['a'].tolist() == [1, 2]
+        assert con.statistics(table).row_count == 2
+        inner = con.execute_stream(table['b'])
+        assert next(inner)['b'].tolist() == [10]
+        inner.close()
+    assert con.pool.stats['in_use'] == 0
+    con.close()
+
+
+def test_execute_stream_timeout(table):
+    con = SQLStandard(pool=sqlite_pool(timeout=0.01))
+    with con.pool.connection() as connection:
+        connection.execute('CREATE TABLE t (a INTEGER, b INTEGER)')
+        connection.execute('INSERT INTO t VALUES (1, 10)')
+
+    stream = con.execute_stream(table)
+    next(stream)
+    # other threads wait for the stream connection
+    with ThreadPoolExecutor(1) as executor:
+        with pytest.raises(TimeoutError, match='execute_stream'):
+            executor.submit(con.execute, table).result()
+    stream.close()
+    assert con.execute(table)['a'].tolist() == [1]
+
+
+def test_execute_async(con_data, table):
+    async def run():
+        await con_data.connect_async()
+        query = await con_data.compile_async(table['a'])
+        result = await con_data.execute_async(table['a'])
+        return query, result
+
+    query, result = asyncio.run(run())
+    assert query == 'SELECT a FROM t'
+    assert result['a'].tolist() == [1, 2, 3]
+
+
+@pytest.mark.parametrize('concurrency', [1, 4])
+def test_execute_many_async(con_data, table, concurrency):
+    exprs = [table['a'] + i for i in range(8)]
+    results = asyncio.run(
+        execute_many_async(con_data, exprs, concurrency=concurrency)
+    )
+    assert [r.iloc[0, 0] for r in results] == list(range(1, 9))
+
+    with pytest.raises(ValueError):
+        asyncio.run(execute_many_async(con_data, exprs, concurrency=0))
+
+
+def test_shared_pool(con_data, table):
+    pool = sqlite_pool(con_data.database, maxsize=2)
+    backends = [SQLStandard(database=con_data.database, pool=pool)]
+    backends.append(SQLStandard(database=con_data.database, pool=pool))
+
+    for backend in backends:
+        assert backend.execute(table['a'])['a'].tolist() == [1, 2, 3]
+        backend.close()
+
+    # the given pool is not closed by the backends
+    assert pool.stats['size'] == 1
+    assert pool.stats['acquisitions'] == 2
+    pool.close()
+
+
+def test_sqlite_pool_memory():
+    pool = sqlite_pool(maxsize=4)
+    assert pool.maxsize == 1
+    with pool.connection() as connection:
+        connection.execute('CREATE TABLE t (a INTEGER)')
+    with pool.connection() as connection:
+        connection.execute('SELECT * FROM t')
+
+
+def test_compile_template(con, table):
+    template, params = con.compile_template(
+        dtypes.int8(1) + dtypes.float64(2.5)
+    )
+    assert (template, params) == ('?1 + ?2', [1, 2.5])
+
+    assert con.compile_template(table['a'] + 3) == (
+        'SELECT a + ?1 FROM t',
+        [3],
+    )
+    assert con.compile_template(table['a'] + 5) == (
+        'SELECT a + ?1 FROM t',
+        [5],
+    )
+    assert con.compile_template(table[['a']]) == ('SELECT a FROM t', [])
+
+    # a new literal value is not compiled again
+    assert con.template_cache.stats['misses'] == 3
+    assert con.template_cache.stats['hits'] == 1
+
+
+def test_execute_parameterized(con_data, table):
+    con_data.parameterized = True
+    result = con_data.execute(table['a'] * 10)
+    assert result.iloc[:, 0].tolist() == [10, 20, 30]
+
+    result = con_data.execute(table['a'] * 2)
+    assert result.iloc[:, 0].tolist() == [2, 4, 6]
+    assert con_data.template_cache.stats['hits'] == 1
+
+
+def test_compile_optimize(table):
+    con = SQLStandard(optimize=True)
+    expr = dtypes.int32(3) * dtypes.int32(4) + table['a']
+    assert con.compile(expr) == 'SELECT 12 + a FROM t'
+    assert con.compile_template(expr) == ('SELECT ?1 + a FROM t', [12])
+    assert SQLStandard().compile(expr) == 'SELECT (3 * 4) + a FROM t'
+
+
+def test_compile_common_subexpressions(con, table):
+    norm = (table['a'] - table['b']) / table['b']
+    assert con.compile(norm * 2 + norm * 3) == (
+        'SELECT (_cse0 * 2) + (_cse0 * 3) '
+        'FROM (SELECT a, b, (a - b) / b AS _cse0 FROM t)'
+    )
+    # repeated sub-expressions that use other ones are computed next
+    assert con.compile((norm * 2) * (norm * 2) + norm) == (
+        'SELECT (_cse1 * _cse1) + _cse0 '
+        'FROM (SELECT a, b, _cse0, _cse0 * 2 AS _cse1 '
+        'FROM (SELECT a, b, (a - b) / b AS _cse0 FROM t))'
+    )
+    assert con.compile(table['a'] + table['b']) == 'SELECT a + b FROM t'
+
+
+def test_execute_common_subexpressions(con_data, table):
+    norm = table['a'] * table['b']
+    result = con_data.execute(norm + norm * 2)
+    assert result.iloc[:2, 0].tolist() == [30, 120]
+
+
+def test_execute_deep_chain(tmp_path):
+    # deeper than the recursion limit and SQLite's expression depth limit
+    names = ['c{}'.format(i) for i in range(1500)]
+    schema = tps.TableSchema.expr(
+        {name: {'type': 'int64', 'nullable': False} for name in names}
+    )
+    table = tps.Table.expr('t', schema)
+    expr = table[names[0]]
+    for name in names[1:]:
+        expr = expr + table[name]
+
+    query = SQLStandard().compile(expr)
+    assert query.startswith('SELECT ((((((((((c0 + c1) + (c2 + c3))')
+
+    con = SQLStandard(database=str(tmp_path / 'toki.db'))
+    con.connect()
+    with con.pool.connection() as connection:
+        connection.execute(
+            'CREATE TABLE t ({})'.format(
+                ', '.join('{} INTEGER'.format(name) for name in names)
+            )
+        )
+        connection.execute(
+            'INSERT INTO t VALUES ({})'.format(
+                ', '.join(str(i) for i in range(len(names)))
+            )
+        )
+    assert con.execute(expr).iloc[0, 0] == sum(range(len(names)))
+    con.close()
+
+
+def test_statistics(con_data, table):
+    statistics = con_data.statistics(table)
+    assert statistics.row_count == 3
+    assert statistics.columns['a'] == ColumnStatistics(1, 3, 0, 3)
+    assert statistics.columns['b'] == ColumnStatistics(10, 20, 1, 2)
+
+    # the statistics are cached until refreshed
+    with con_data.pool.connection() as connection:
+        connection.execute('INSERT INTO t VALUES (4, 40)')
+    assert con_data.statistics(table) is statistics
+    assert con_data.statistics(table, refresh=True).row_count == 4
+
+
+def test_statistics_wide(tmp_path):
+    # more aggregates than the columns a SQLite result set can hold
+    names = ['c{}'.format(i) for i in range(600)]
+    schema = tps.TableSchema.expr(
+        {name: {'type': 'int64', 'nullable': True} for name in names}
+    )
+    table = tps.Table.expr('t', schema)
+    con = SQLStandard(database=str(tmp_path / 'toki.db'))
+    with con.pool.connection() as connection:
+        connection.execute('CREATE TABLE t ({})'.format(', '.join(names)))
+        connection.execute(
+            'INSERT INTO t VALUES ({})'.format(
+                ', '.join(str(i) for i in range(600))
+            )
+        )
+        connection.execute('INSERT INTO t (c0) VALUES (-1)')
+
+    statistics = con.statistics(table)
+    assert statistics.row_count == 2
+    assert len(statistics.columns) == 600
+    assert statistics.columns['c0'] == ColumnStatistics(-1, 0, 0, 2)
+    assert statistics.columns['c599'] == ColumnStatistics(599, 599, 1, 1)
+    con.close()
+
+
+def test_quoted_names(tmp_path):
+    schema = tps.TableSchema.expr(
+        {
+            'order': {'type': 'int32', 'nullable': False},
+            'a b': {'type': 'int64', 'nullable': True},
+        }
+    )
+    table = tps.Table.expr('my table', schema)
+    con = SQLStandard(database=str(tmp_path / 'toki.db'))
+    with con.pool.connection() as connection:
+        connection.executescript(
+            '''
+            CREATE TABLE "my table" ("order" INTEGER, "a b" INTEGER);
+            INSERT INTO "my table" VALUES (1, 10), (2, NULL);
+            '''
+        )
+
+    assert (
+        con.compile(table['order'] + table['a b'])
+        == 'SELECT "order" + "a b" FROM "my table"'
+    )
+    assert con.execute(table[['a b']])['a b'].tolist()[:1] == [10]
+    statistics = con.statistics(table)
+    assert statistics.row_count == 2
+    assert statistics.columns['order'] == ColumnStatistics(1, 2, 0, 2)
+    assert statistics.columns['a b'] == ColumnStatistics(10, 10, 1, 1)
+    con.close()
+
+
+def test_lazy_rules_keys():
+    # the rules are dispatched by the declared key before they are built
+    for rule in STRATEGY:
+        assert rule.key == _rule_key(rule.rule)
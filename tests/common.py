@@ -2,7 +2,7 @@
 from toki import operations as ops
 
 INT_TYPES = ('int8', 'int16', 'int32', 'int64')
-FLOAT_TYPES = ('float16', 'float16', 'float64')
+FLOAT_TYPES = ('float16', 'float32', 'float64')
 NUMBER_TYPES = INT_TYPES + FLOAT_TYPES
 
 numeric_ops_map = {
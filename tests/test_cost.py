@@ -0,0 +1,43 @@
+"""Tests for `toki.cost` module."""
+import pytest
+
+from toki import datatypes as dtypes
+from toki import types as tps
+from toki.cost import CostModel, PlanEstimate, estimate
+from toki.statistics import TableStatistics
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'int64', 'nullable': True},
+            'c': {'type': 'int64', 'nullable': True},
+        }
+    )
+    return tps.Table.expr('t', schema)
+
+
+def test_estimate(table):
+    def statistics(source):
+        return TableStatistics(1000) if source.name == 't' else None
+
+    plan = estimate((table['a'] + table['b']) * table['a'], statistics)
+    assert plan == PlanEstimate(1000, 2, 2, 1)
+
+    assert estimate(table[['a', 'c']], statistics) == PlanEstimate(
+        1000, 0, 2, 2
+    )
+    assert estimate(dtypes.int8(1) + dtypes.int8(2), statistics) == (
+        PlanEstimate(1, 1, 0, 1)
+    )
+
+
+@pytest.mark.parametrize(
+    'rows,workers,expected',
+    [(10, 4, 1), (1_000_000, 4, 1), (100_000_000, 4, 4), (100_000_000, 1, 1)],
+)
+def test_partitions(rows, workers, expected):
+    model = CostModel()
+    assert model.partitions(PlanEstimate(rows, 2, 2), workers) == expected
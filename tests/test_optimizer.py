@@ -0,0 +1,154 @@
+"""Tests for `toki.optimizer` module."""
+import pytest
+
+from toki import datatypes as dtypes
+from toki import types as tps
+from toki.optimizer import (
+    FOLD_STRATEGY,
+    collapse_projections,
+    fold_constants,
+    reassociate,
+)
+from toki.rules import _rule_key
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr({'x': {'type': 'int32', 'nullable': False}})
+    return tps.Table.expr('t', schema)
+
+
+@pytest.mark.parametrize(
+    'expr,expected',
+    [
+        (dtypes.int32(3) * dtypes.int32(4), dtypes.int32(12)),
+        (dtypes.int8(2) + dtypes.int16(3), dtypes.int16(5)),
+        (dtypes.int64(2) ** dtypes.int64(10), dtypes.int64(1024)),
+        (dtypes.int8(7) // dtypes.int8(2), dtypes.int8(3)),
+        (dtypes.int8(7) % dtypes.int8(2), dtypes.int8(1)),
+        (dtypes.float64(1.5) * dtypes.int16(2), dtypes.float64(3.0)),
+        (dtypes.float16(1) + dtypes.int8(1), dtypes.float16(2.0)),
+        # nested sub-trees are folded from the leaves
+        (
+            dtypes.int32(3) * dtypes.int32(4) + dtypes.int8(1),
+            dtypes.int32(13),
+        ),
+    ],
+)
+def test_fold(expr, expected):
+    result = fold_constants(expr)
+    assert type(result) is type(expected)
+    assert result.value == expected.value
+
+
+@pytest.mark.parametrize(
+    'expr',
+    [
+        # overflow of the result type
+        dtypes.int8(100) + dtypes.int8(28),
+        dtypes.int16(2) ** dtypes.int16(20),
+        dtypes.float16(60000.0) * dtypes.float16(2.0),
+        # negative integer power results in a float
+        dtypes.int32(2) ** dtypes.int32(-1),
+        # division by zero and negative values rounded differently
+        dtypes.int32(1) // dtypes.int32(0),
+        dtypes.int32(-7) % dtypes.int32(2),
+        # databases could divide integers as floordiv
+        dtypes.int32(1) / dtypes.int32(2),
+    ],
+)
+def test_not_folded(expr):
+    assert type(fold_constants(expr)) is type(expr)
+
+
+def test_fold_with_columns(table):
+    expr = dtypes.int32(3) * dtypes.int32(4) + table['x']
+    result = fold_constants(expr)
+    assert result.args[0] == dtypes.int32(12)
+    assert result.args[1] == table['x']
+
+    result = fold_constants(table['x'] + dtypes.int8(2) * dtypes.int8(3))
+    assert result.args[1] == dtypes.int8(6)
+
+
+def test_collapse_projections():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'int32', 'nullable': False},
+        }
+    )
+    table = tps.Table.expr('t', schema)
+
+    assert collapse_projections(table[['a', 'b']][['a']]['a']) == table['a']
+    assert collapse_projections(table[['a', 'b']][['b']]) == table[['b']]
+
+    expr = table[['a', 'b']]['a'] + table[['b']]['b']
+    assert collapse_projections(expr) == table['a'] + table['b']
+
+    result = collapse_projections(table[['a', 'b']]['a'].name('x'))
+    assert result.rename == 'x'
+
+    # expressions without nested projections are unchanged
+    expr = table['a'] + table['b']
+    assert collapse_projections(expr) is expr
+
+
+def _depth(expr):
+    depth = {}
+    for node in tps.postorder(expr):
+        depth[id(node)] = 1 + max(
+            [depth[id(arg)] for arg in node.args if id(arg) in depth] or [0]
+        )
+    return depth[id(expr)]
+
+
+def _leaves(expr):
+    return [
+        node
+        for node in tps.postorder(expr)
+        if not isinstance(node, (tps.Table, tps.TableSchema))
+        and not isinstance(node, type(expr))
+    ]
+
+
+def test_reassociate():
+    schema = tps.TableSchema.expr(
+        {
+            'c{}'.format(i): {'type': 'int64', 'nullable': False}
+            for i in range(100)
+        }
+    )
+    table = tps.Table.expr('t', schema)
+    expr = table['c0']
+    for i in range(1, 100):
+        expr = expr + table['c{}'.format(i)]
+
+    result = reassociate(expr)
+    assert _depth(expr) == 102
+    assert _depth(result) == 10
+    # the operands order is kept
+    assert [node.columns for node in _leaves(result)] == [
+        'c{}'.format(i) for i in range(100)
+    ]
+
+    # the chains inside other operations are rebalanced too
+    result = reassociate(expr * table['c0'])
+    assert _depth(result) == 11
+
+    # short chains are unchanged
+    expr = table['c0'] + table['c1'] + table['c2']
+    assert reassociate(expr) is expr
+
+
+def test_reassociate_python_operand(table):
+    expr = table['x']
+    for _ in range(40):
+        expr = 1 + expr
+    # python values can't be the left operand of the new operations
+    assert reassociate(expr) is expr
+
+
+def test_fold_rules_keys():
+    for rule in FOLD_STRATEGY:
+        assert rule.key == _rule_key(rule.rule)
@@ -0,0 +1,192 @@
+"""Tests for `toki.rules` module."""
+import metadsl_rewrite
+import pytest
+
+from toki import datatypes as dtypes
+from toki import operations as ops
+from toki.rules import (
+    LazyRule,
+    RegisterStrategy,
+    StrategyDispatch,
+    _rule_key,
+    dispatch_key,
+    rule_name,
+)
+
+
+def _rule(x: int) -> str:
+    return dtypes.int8(x), lambda: str(x)
+
+
+def test_rules_cached():
+    strategy = RegisterStrategy()
+    strategy.register(metadsl_rewrite.rule(_rule))
+
+    rules = strategy.get_rules()
+    assert strategy.get_rules() is rules
+    assert strategy.rebuild_count == 1
+    assert strategy.stats['rules'] == 1
+
+
+def test_rules_rebuilt_on_register():
+    strategy = RegisterStrategy()
+    strategy.register(metadsl_rewrite.rule(_rule))
+    rules = strategy.get_rules()
+    version = strategy.version
+
+    strategy.register(metadsl_rewrite.rule(_rule))
+    assert strategy.version == version + 1
+    assert strategy.get_rules() is not rules
+    assert strategy.rebuild_count == 2
+    assert strategy.rebuild_time > 0
+
+
+def test_strategies_not_shared():
+    strategy_a = RegisterStrategy()
+    strategy_b = RegisterStrategy()
+    strategy_a.register(metadsl_rewrite.rule(_rule))
+
+    assert strategy_a.stats['rules'] == 1
+    assert strategy_b.stats['rules'] == 0
+
+
+def _add_rule(x: int, y: int) -> str:
+    return dtypes.int8(x) + dtypes.int16(y), lambda: '{} + {}'.format(x, y)
+
+
+def test_dispatch_key():
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    assert dispatch_key(expr) == (ops.Add, dtypes.Int8, dtypes.Int16)
+    assert dispatch_key(1) is None
+
+
+def test_dispatch_candidates():
+    rule = metadsl_rewrite.rule(_add_rule)
+    fallback = metadsl_rewrite.rule(_rule)
+    dispatch = StrategyDispatch(fallback, rule)
+
+    assert list(dispatch.candidates(dtypes.int8(1) + dtypes.int16(2))) == [
+        (0, fallback),
+        (1, rule),
+    ]
+    assert list(dispatch.candidates(dtypes.int8(1) + dtypes.int8(2))) == [
+        (0, fallback)
+    ]
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_dispatch_compile(indexed):
+    strategy = RegisterStrategy(indexed=indexed)
+    strategy.register(metadsl_rewrite.rule(_add_rule))
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    assert metadsl_rewrite.execute(expr, strategy.get_rules()) == '1 + 2'
+
+
+def _float_rule(x: float) -> str:
+    return dtypes.float64(x), lambda: str(x)
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_profiling(indexed):
+    strategy = RegisterStrategy(indexed=indexed, profile=True)
+    strategy.register(metadsl_rewrite.rule(_add_rule))
+    # a rule that is not indexed, so it is tried for every expression
+    strategy.register(metadsl_rewrite.rule(_float_rule))
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    assert metadsl_rewrite.execute(expr, strategy.get_rules()) == '1 + 2'
+
+    profile = strategy.profile.to_dict()
+    # a pass replaces the addition and the next one finds no match
+    assert profile['iterations'] == 2
+    rules = {rule['position']: rule for rule in profile['rules']}
+    assert rules[0]['rule'] == rule_name(strategy._inner_strategy[0])
+    assert rules[0]['matches'] == 1
+    assert rules[1]['matches'] == 0
+    assert rules[1]['attempts'] >= 1
+    assert all(rule['time'] >= 0 for rule in profile['rules'])
+
+    folded = strategy.profile.to_folded().splitlines()
+    assert len(folded) == len(rules)
+    assert folded[0].startswith('rewrite;')
+
+
+def test_profiling_toggle():
+    strategy = RegisterStrategy()
+    strategy.register(metadsl_rewrite.rule(_add_rule))
+    assert strategy.profile is None
+    version = strategy.version
+
+    strategy.set_profiling(True)
+    metadsl_rewrite.execute(
+        dtypes.int8(1) + dtypes.int16(2), strategy.get_rules()
+    )
+    assert strategy.profile.to_dict()['rules'][0]['matches'] == 1
+    assert strategy.version == version
+
+    strategy.profile.reset()
+    assert strategy.profile.to_dict() == {'iterations': 0, 'rules': []}
+
+    strategy.set_profiling(False)
+    assert strategy.profile is None
+
+
+def test_rule_name():
+    assert rule_name(metadsl_rewrite.rule(_add_rule)).endswith(
+        '_add_rule[Add,Int8,Int16]'
+    )
+    assert rule_name(metadsl_rewrite.rule(_rule)).endswith('_rule')
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_lazy_rules(indexed):
+    strategy = RegisterStrategy(indexed=indexed)
+    strategy.register_lazy(
+        lambda: metadsl_rewrite.rule(_add_rule),
+        key=(ops.Add, dtypes.Int8, dtypes.Int16),
+    )
+    strategy.register_lazy(
+        lambda: metadsl_rewrite.rule(_float_rule), name='float_rule'
+    )
+    assert strategy.stats['lazy_rules'] == 2
+
+    expr = dtypes.int8(1) + dtypes.int16(2)
+    assert metadsl_rewrite.execute(expr, strategy.get_rules()) == '1 + 2'
+    lazy_add, lazy_float = strategy
+    assert lazy_add.built
+    assert str(lazy_float) == 'float_rule'
+    if indexed:
+        # a rule that is not indexed is tried for every expression
+        assert lazy_float.built
+    assert _rule_key(lazy_add) == _rule_key(lazy_add.rule)
+
+
+def test_lazy_rule_not_tried():
+    strategy = RegisterStrategy()
+    strategy.register_lazy(
+        lambda: metadsl_rewrite.rule(_add_rule),
+        key=(ops.Add, dtypes.Int8, dtypes.Int16),
+    )
+    expr = dtypes.int8(1) + dtypes.int8(2)
+    metadsl_rewrite.execute(expr, strategy.get_rules())
+    assert strategy.stats['lazy_rules'] == 1
+    assert isinstance(next(iter(strategy)), LazyRule)
+
+
+@pytest.mark.parametrize('indexed', [True, False])
+def test_can_rewrite(indexed):
+    strategy = RegisterStrategy(indexed=indexed)
+    strategy.register_lazy(
+        lambda: metadsl_rewrite.rule(_add_rule),
+        key=(ops.Add, dtypes.Int8, dtypes.Int16),
+    )
+    assert strategy.can_rewrite(dtypes.int8(1) + dtypes.int16(2))
+    assert strategy.can_rewrite(
+        (dtypes.int8(1) + dtypes.int16(2)) * dtypes.int16(3)
+    )
+    # without the index, every rule could match
+    assert strategy.can_rewrite(dtypes.int8(1) + dtypes.int8(2)) is (
+        not indexed
+    )
+
+    strategy.register(metadsl_rewrite.rule(_float_rule))
+    assert strategy.can_rewrite(dtypes.int8(1) + dtypes.int8(2))
@@ -0,0 +1,119 @@
+"""Tests for `toki.serialization` module."""
+import pytest
+
+import toki
+from toki import datatypes as dtypes
+from toki import types as tps
+from toki.serialization import MAGIC, deserialize, serialize
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'float64', 'nullable': True},
+        }
+    )
+    return tps.Table.expr('t', schema, 'db')
+
+
+def _exprs(table):
+    return [
+        table,
+        table.schema,
+        table['a'],
+        table[['b', 'a']],
+        table['a'] + table['b'],
+        table['a'] - -3.5,
+        (table['a'] > 1) & (table['b'] < 2),
+        dtypes.int8(3) + dtypes.int16(2),
+        dtypes.float64(1.5),
+    ]
+
+
+def test_round_trip(table):
+    for expr in _exprs(table):
+        data = serialize(expr)
+        assert data.startswith(MAGIC)
+        result = deserialize(data)
+        assert type(result) is type(expr)
+        assert result is not expr
+        assert tps.fingerprint(result) == tps.fingerprint(expr)
+
+    result = deserialize(serialize(table['a'] + table['b']))
+    assert result == table['a'] + table['b']
+    assert result.args[0].source.schema.structure is table.schema.structure
+    assert toki.deserialize(toki.serialize(table)) == table
+
+
+def test_rename(table):
+    result = deserialize(serialize(table['a'].name('x') + 1))
+    assert result.args[0].rename == 'x'
+
+
+def test_values(table):
+    value = [table['a'], {'k': (1, -300, None, True, b'\x00')}, 'a']
+    result = deserialize(serialize(value))
+    assert result[0] == table['a']
+    assert result[1:] == value[1:]
+
+    with pytest.raises(TypeError):
+        serialize([object()])
+
+
+@pytest.mark.parametrize('structural', [True, False])
+def test_shared(table, structural):
+    norm = table['a'] * table['b']
+    data = serialize(norm + norm * 2, structural=structural)
+    result = deserialize(data)
+    assert result.args[0] is result.args[1].args[0]
+    assert len(data) < len(serialize(norm)) * 2
+
+    # the structurally identical expressions are encoded once as well
+    expr = table['a'] * table['b'] + table['a'] * table['b']
+    result = deserialize(serialize(expr, structural=structural))
+    assert (result.args[0] is result.args[1]) is structural
+
+
+def test_interning(table):
+    data = serialize(table['a'] + table['b'])
+    with tps.interning():
+        assert deserialize(data) is table['a'] + table['b']
+
+
+def test_deep():
+    names = ['c{}'.format(i) for i in range(2000)]
+    schema = tps.TableSchema.expr(
+        {name: {'type': 'int64', 'nullable': False} for name in names}
+    )
+    table = tps.Table.expr('t', schema)
+    expr = table[names[0]]
+    for name in names[1:]:
+        expr = expr + table[name]
+
+    result = deserialize(serialize(expr))
+    assert tps.fingerprint(result) == tps.fingerprint(expr)
+
+
+@pytest.mark.parametrize(
+    'data',
+    [
+        b'',
+        b'PICKLE',
+        MAGIC + b'\x63',
+        # a class that is not an expression
+        MAGIC + b'\x01\x02\x02os\x06system\x01\x00\x01',
+    ],
+)
+def test_invalid(data):
+    with pytest.raises(ValueError):
+        deserialize(data)
+
+
+def test_truncated(table):
+    data = serialize(table['a'] + 1)
+    with pytest.raises(ValueError):
+        deserialize(data[:-1])
+    with pytest.raises(ValueError):
+        deserialize(data + b'\x00')
@@ -0,0 +1,29 @@
+"""Tests for `toki.statistics` module."""
+import pytest
+
+from toki.statistics import StatisticsCache, TableStatistics
+
+
+def test_statistics_freshness():
+    statistics = TableStatistics(10, gathered_at=0.0)
+    assert statistics.age > 0
+    assert statistics.is_fresh()
+    assert not statistics.is_fresh(max_age=60)
+    assert TableStatistics(10).is_fresh(max_age=60)
+
+
+def test_statistics_cache():
+    cache = StatisticsCache(max_age=60)
+    cache.set('t', TableStatistics(10))
+    cache.set('old', TableStatistics(10, gathered_at=0.0))
+
+    assert cache.get('t').row_count == 10
+    # stale statistics are removed
+    assert cache.get('old') is None
+    assert len(cache) == 1
+
+    cache.invalidate('t')
+    assert 't' not in cache
+
+    with pytest.raises(ValueError):
+        StatisticsCache(max_age=-1)
@@ -0,0 +1,167 @@
+"""Tests for `toki.types` module."""
+import pytest
+
+from toki import datatypes as dtypes
+from toki import types as tps
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'int64', 'nullable': True},
+        }
+    )
+    return tps.Table.expr('t', schema)
+
+
+def test_fingerprint_structural(table):
+    assert tps.fingerprint(table['a'] + table['b']) == tps.fingerprint(
+        table['a'] + table['b']
+    )
+    assert tps.fingerprint(dtypes.int8(1) + dtypes.int8(2)) == (
+        tps.fingerprint(dtypes.int8(1) + dtypes.int8(2))
+    )
+
+
+def test_fingerprint_differs(table):
+    fingerprints = {
+        tps.fingerprint(expr)
+        for expr in [
+            table['a'] + table['b'],
+            table['a'] * table['b'],
+            table['b'] + table['a'],
+            table['a'] + 1,
+            table['a'] + 1.0,
+            dtypes.int8(1) + dtypes.int8(2),
+            dtypes.int8(1) + dtypes.int16(2),
+            table[['a', 'b']],
+            table[['a']],
+        ]
+    }
+    assert len(fingerprints) == 9
+
+
+def test_interning(table):
+    with tps.interning():
+        assert table['a'] is table['a']
+        assert (table['a'] + table['b']) is (table['a'] + table['b'])
+        assert (dtypes.int8(1) + 2) is (dtypes.int8(1) + 2)
+        assert (table['a'] + 1) is not (table['a'] + 1.0)
+        assert table[['a', 'b']] is table[['a', 'b']]
+
+        expr = table['a'] * table['b']
+        assert tps.is_interned(expr)
+        assert expr.args[0] is table['a']
+        assert hash(expr) == hash(table['a'] * table['b'])
+
+    assert table['a'] is not table['a']
+    assert table['a'] == table['a']
+    assert not tps.is_interned(table['a'])
+
+
+def test_interning_rename(table):
+    with tps.interning():
+        column = table['a'].name('x')
+        assert column.rename == 'x'
+        assert table['a'].rename is None
+
+
+def test_intern_expr_copy(table):
+    # the expressions built without interning are not changed
+    expr = (table['a'] + 1) * (table['a'] + 1)
+    args = list(expr.args)
+    interned = tps.intern_expr(expr)
+
+    assert interned is not expr
+    assert interned == expr
+    assert interned.args[0] is interned.args[1]
+    assert expr.args == args and expr.args[0] is not expr.args[1]
+    assert not tps.is_interned(expr)
+    assert not tps.is_interned(expr.args[0])
+    assert tps.intern_expr((table['a'] + 1) * (table['a'] + 1)) is interned
+
+
+def test_intern_expr_containers(table):
+    # the expressions inside tuple and dict arguments are interned too
+    add = table['a'] + 1
+    expr = type(add)(
+        add.function, [(table['a'] + 1,), {'k': table['a'] + 1}], {}
+    )
+    interned = tps.intern_expr(expr)
+
+    first, second = interned.args
+    assert type(first) is tuple and type(second) is dict
+    assert first[0] is second['k']
+    assert first[0] is tps.intern_expr(table['a'] + 1)
+    assert not tps.is_interned(expr.args[0][0])
+
+
+def test_interning_hash_literal():
+    with tps.interning():
+        assert hash(dtypes.int8(1)) == hash(dtypes.int8(1))
+        assert hash(dtypes.float64(1.5)) != hash(dtypes.int8(1))
+    with pytest.raises(TypeError):
+        hash(dtypes.int8(1))
+
+
+def test_projection_schema(table):
+    assert list(table[['b']].schema.structure) == ['b']
+    assert table[['a', 'b']]['a'].columns == 'a'
+
+
+def test_schema_layout(table):
+    layout = table.schema.structure
+    assert isinstance(layout, tps.SchemaLayout)
+    assert list(layout) == ['a', 'b']
+    assert layout['b'] == {'type': 'int64', 'nullable': True}
+    assert layout.index['b'] == 1
+    assert layout.column_type('a') is tps.IntegerColumn
+    assert 'c' not in layout
+    with pytest.raises(AttributeError):
+        layout.names = ('c',)
+
+    # the schemas with the same columns share the layout
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'int64', 'nullable': True},
+        }
+    )
+    assert schema.structure is layout
+    assert tps.TableSchema.expr(layout).structure is layout
+    assert tps.fingerprint(schema) == tps.fingerprint(table.schema)
+    assert table[['b', 'a']].schema.structure is layout.select(['b', 'a'])
+    assert list(layout.select(['b', 'a'])) == ['b', 'a']
+
+    schema = tps.TableSchema.expr({'a': {'type': 'int32', 'nullable': True}})
+    assert schema.structure != layout.select(['a'])
+    assert tps.fingerprint(schema) != tps.fingerprint(table[['a']].schema)
+
+
+def test_schema_unknown_type():
+    schema = tps.TableSchema.expr({'s': {'type': 'string', 'nullable': True}})
+    table = tps.Table.expr('t', schema)
+    with pytest.raises(KeyError):
+        table['s']
+    with pytest.raises(TypeError):
+        table['x']
+
+
+def test_name_copies(table):
+    column = table['a']
+    renamed = column.name('x')
+    assert renamed is not column
+    assert renamed.rename == 'x'
+    assert column.rename is None
+
+
+def test_expression_children(table):
+    expr = table['a'] + table['b']
+    assert tps.expression_children(expr) == list(expr.args)
+    assert tps.expression_children([expr, {'k': (table['a'],)}]) == [
+        expr,
+        table['a'],
+    ]
+    assert tps.expression_children(1) == []
@@ -0,0 +1,75 @@
+"""Tests for `toki.viz` module."""
+import io
+
+import pytest
+
+from toki import types as tps
+from toki.viz import iter_dot, iter_graph, visualize, write_dot
+
+
+@pytest.fixture
+def table():
+    schema = tps.TableSchema.expr(
+        {
+            'a': {'type': 'int32', 'nullable': False},
+            'b': {'type': 'float64', 'nullable': False},
+        }
+    )
+    return tps.Table.expr('t', schema)
+
+
+def _nodes(items):
+    return [item for item in items if item[0] == 'node']
+
+
+def _edges(items):
+    return [item[1:] for item in items if item[0] == 'edge']
+
+
+def test_iter_graph(table):
+    norm = (table['a'] - table['b']) / table['b']
+    items = list(iter_graph(norm * 2 + norm * 3))
+
+    # the right operands are walked, and ``norm`` is a single node
+    names = [type(node).__name__ for _, _, node, _ in _nodes(items)]
+    assert names.count('Divide') == 1
+    assert names.count('FloatingColumn') == 1
+    assert names.count('Table') == 1
+    assert ('n0', 'n1') in _edges(items)
+    assert ('n0', 'n2') in _edges(items)
+
+    # just the same objects are a single node
+    identity = _nodes(iter_graph(norm * 2 + norm * 3, structural=False))
+    assert len(identity) > len(_nodes(items))
+
+
+def test_iter_graph_limits(table):
+    expr = (table['a'] - table['b']) / table['b']
+
+    items = list(iter_graph(expr, max_depth=1))
+    assert [item[1] for item in _nodes(items)] == ['n0', 'n1', 'n2']
+    assert [item[3] for item in _nodes(items)] == [0, 2, 1]
+
+    items = list(iter_graph(expr, max_nodes=2))
+    assert len(_nodes(items)) == 2
+    assert _nodes(items)[0][3] == 1
+
+
+def test_iter_dot(table):
+    expr = table['a'] + table['b']
+    dot = ''.join(iter_dot(expr))
+    assert dot == ''.join(iter_dot(table['a'] + table['b']))
+    assert dot.startswith('digraph {\n')
+    assert '  n0 -> n1\n' in dot
+    assert "IntegerColumn ('a')" in dot
+
+    stream = io.StringIO()
+    write_dot(expr, stream)
+    assert stream.getvalue() == dot
+
+
+def test_visualize(table):
+    graph = visualize(table['a'] + table['b'])
+    assert graph.source == visualize(table['a'] + table['b']).source
+    assert 'n0 -> n1' in graph.source
+    assert 'n0 -> n2' in graph.source
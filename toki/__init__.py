@@ -7,3 +7,4 @@ __email__ = 'ivan.ogasawara@gmail.com'
 __version__ = '0.0.1'
 
 from toki import api  # noqa: F401
+from toki.serialization import deserialize, serialize  # noqa: F401
@@ -63,6 +63,9 @@ def _binop_prepare(op_method, name):
 
 
 def _define_type_bin_methods(type_ref, ops_map, op_method):
+    # the same function is used by all the types, so an operation matches
+    # the same rules regardless of the type of its left operand
+    op_fns = {class_name: op_method(class_name) for class_name in ops_map}
     for tp in type_ref:
         for class_name, method_name in ops_map.items():
             op_modifies = ['']
@@ -74,7 +77,7 @@ def _define_type_bin_methods(type_ref, ops_map, op_method):
                     class_name,
                     tp,
                     '__{}{}__'.format(modify, method_name),
-                    op_method(class_name),
+                    op_fns[class_name],
                 )
 
 
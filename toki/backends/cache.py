@@ -0,0 +1,331 @@
+"""Compiled expressions cache."""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+CACHE_POLICIES = ('lru', 'fifo')
+
+
+class CompileCache:
+    """
+    Bounded cache for compiled expressions.
+
+    Parameters
+    ----------
+    maxsize : int, default 128
+        Maximum number of entries, when it is reached an entry is evicted.
+    policy : str, default 'lru'
+        Eviction policy: ``lru`` evicts the least recently used entry and
+        ``fifo`` evicts the oldest inserted entry.
+
+    The cache can be shared by backends running in different threads.
+    """
+
+    def __init__(self, maxsize: int = 128, policy: str = 'lru'):
+        if maxsize < 1:
+            raise ValueError('Cache maxsize should be greater than 0.')
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                'Cache policy ``{}`` not supported. Options: {}.'.format(
+                    policy, ', '.join(CACHE_POLICIES)
+                )
+            )
+        self.maxsize = maxsize
+        self.policy = policy
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get the cached value for the given key.
+
+        Parameters
+        ----------
+        key : Hashable
+        default : Any, default None
+            Value returned when the key is not cached.
+
+        Returns
+        -------
+        Any
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            if self.policy == 'lru':
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        """
+        Add a value to the cache.
+
+        Parameters
+        ----------
+        key : Hashable
+        value : Any
+        """
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return
+
+            self._data[key] = value
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Remove all the cached values."""
+        with self._lock:
+            self._data.clear()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get the cache statistics.
+
+        Returns
+        -------
+        dict
+            ``size``, ``maxsize``, ``hits``, ``misses`` and ``evictions``
+            values.
+        """
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+class DiskCompileCache:
+    """
+    Bounded cache for compiled expressions, stored in a SQLite database.
+
+    The cache can be shared by processes, e.g. short-lived workers that
+    compile the same expressions, and by threads. The database uses the
+    write-ahead log, so the readers don't block the writer.
+
+    Parameters
+    ----------
+    directory : str, optional, default None
+        Directory of the cache database, created if needed. By default,
+        ``~/.cache/toki``.
+    maxsize : int, default 10000
+        Maximum number of entries, when it is exceeded the entries are
+        evicted by ``policy``.
+    policy : str, default 'lru'
+        Eviction policy: ``lru`` evicts the least recently used entries and
+        ``fifo`` evicts the oldest inserted entries. With ``fifo``, reading
+        an entry doesn't write to the database.
+    timeout : float, default 5.0
+        Seconds to wait for the database lock held by other processes.
+
+    The keys and values are strings, so the keys should be stable between
+    processes (e.g. the expression fingerprint, see ``SQLStandard``).
+
+    The database errors (``sqlite3.Error``, e.g. when the lock isn't
+    released in ``timeout``) and the errors creating the directory
+    (``OSError``) are raised, ``SQLStandard`` ignores them.
+    """
+
+    filename = 'compile-cache.sqlite3'
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        maxsize: int = 10000,
+        policy: str = 'lru',
+        timeout: float = 5.0,
+    ):
+        if maxsize < 1:
+            raise ValueError('Cache maxsize should be greater than 0.')
+        if policy not in CACHE_POLICIES:
+            raise ValueError(
+                'Cache policy ``{}`` not supported. Options: {}.'.format(
+                    policy, ', '.join(CACHE_POLICIES)
+                )
+            )
+        if directory is None:
+            directory = os.path.join(os.path.expanduser('~'), '.cache', 'toki')
+        self.directory = directory
+        self.path = os.path.join(directory, self.filename)
+        self.maxsize = maxsize
+        self.policy = policy
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection can't be used by a forked process, so each process
+        # opens its own
+        if self._connection is None or self._pid != os.getpid():
+            os.makedirs(self.directory, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            try:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute('PRAGMA synchronous=NORMAL')
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS compiled ('
+                    'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                    'accessed REAL NOT NULL)'
+                )
+                connection.execute(
+                    'CREATE INDEX IF NOT EXISTS compiled_accessed '
+                    'ON compiled (accessed)'
+                )
+            except BaseException:
+                # e.g. the database is locked, it is opened again next time
+                connection.close()
+                raise
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._connect()
+                .execute('SELECT COUNT(*) FROM compiled')
+                .fetchone()[0]
+            )
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return (
+                self._connect()
+                .execute('SELECT 1 FROM compiled WHERE key = ?', (key,))
+                .fetchone()
+                is not None
+            )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get the cached value for the given key.
+
+        Parameters
+        ----------
+        key : str
+        default : Any, default None
+            Value returned when the key is not cached.
+
+        Returns
+        -------
+        Any
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                'SELECT value FROM compiled WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return default
+
+            self.hits += 1
+            if self.policy == 'lru':
+                try:
+                    connection.execute(
+                        'UPDATE compiled SET accessed = ? WHERE key = ?',
+                        (time.time(), key),
+                    )
+                except sqlite3.OperationalError:
+                    # the database is locked by a writer, the recency is
+                    # just a hint for the eviction
+                    pass
+            return row[0]
+
+    def put(self, key: str, value: str):
+        """
+        Add a value to the cache.
+
+        Parameters
+        ----------
+        key : str
+        value : str
+        """
+        if not isinstance(value, str):
+            raise TypeError('Cache values should be strings.')
+        with self._lock:
+            connection = self._connect()
+            try:
+                connection.execute('BEGIN IMMEDIATE')
+                connection.execute(
+                    'INSERT OR REPLACE INTO compiled VALUES (?, ?, ?)',
+                    (key, value, time.time()),
+                )
+                evicted = connection.execute(
+                    'DELETE FROM compiled WHERE key IN ('
+                    'SELECT key FROM compiled ORDER BY accessed DESC '
+                    'LIMIT -1 OFFSET ?)',
+                    (self.maxsize,),
+                ).rowcount
+                connection.execute('COMMIT')
+            except BaseException:
+                if connection.in_transaction:
+                    connection.execute('ROLLBACK')
+                raise
+            self.evictions += evicted
+
+    def clear(self):
+        """Remove all the cached values, for every process."""
+        with self._lock:
+            self._connect().execute('DELETE FROM compiled')
+
+    def close(self):
+        """Close the database connection, it is opened again if needed."""
+        with self._lock:
+            if self._connection is not None and self._pid == os.getpid():
+                self._connection.close()
+            self._connection = None
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get the cache statistics.
+
+        The hits, misses and evictions are counted by this process.
+
+        Returns
+        -------
+        dict
+            ``size``, ``maxsize``, ``hits``, ``misses`` and ``evictions``
+            values.
+        """
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
@@ -1,9 +1,27 @@
 """Define the public toki API."""
-from typing import Any, Protocol, Union
-
-import pandas as pd
+from __future__ import annotations
+
+import asyncio
+import functools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Protocol,
+    Union,
+)
 
 import toki
+from toki.statistics import TableStatistics
+
+if TYPE_CHECKING:
+    # pandas is slow to import, it is imported by the backends that use it
+    import pandas as pd
 
 
 class Backend(Protocol):
@@ -25,6 +43,24 @@ class Backend(Protocol):
         Union[str, Any]
         """
 
+    def compile_many(
+        self, exprs: Iterable[toki.types.Expr]
+    ) -> List[Union[str, Any]]:
+        """
+        Compile a batch of toki expressions.
+
+        Sub-expressions shared by the expressions are compiled once.
+
+        Parameters
+        ----------
+        exprs : Iterable[toki.types.Expr]
+
+        Returns
+        -------
+        List[Union[str, Any]]
+            The compiled expressions, in the same order of ``exprs``.
+        """
+
     def execute(
         self, expr: toki.types.Expr
     ) -> Union[pd.DataFrame, str, int, float, bool, Any]:
@@ -40,6 +76,145 @@ class Backend(Protocol):
         Union[pd.DataFrame, str, int, float, bool, Any]
         """
 
+    def execute_stream(
+        self, expr: toki.types.Expr, chunksize: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute a toki expression, yielding the result in chunks.
+
+        The chunks are fetched lazily, so the memory used is proportional
+        to ``chunksize`` instead of the result size.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        chunksize : int, optional, default None
+            Number of rows for each chunk, when not given the backend
+            default is used.
+
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+        """
+
+    def statistics(
+        self, table: toki.types.Table, refresh: bool = False
+    ) -> TableStatistics:
+        """
+        Get the statistics of a table.
+
+        The statistics are gathered from the backend the first time and
+        then cached, until they are stale (see ``StatisticsCache``).
+
+        Parameters
+        ----------
+        table : toki.types.Table
+        refresh : bool, default False
+            When True, the statistics are gathered again.
+
+        Returns
+        -------
+        TableStatistics
+        """
+
+    async def connect_async(self, executor: Optional[Executor] = None):
+        """
+        Connect to the backend without blocking the event loop.
+
+        By default, ``connect`` runs in a thread, backends with an
+        asynchronous driver can override it.
+
+        Parameters
+        ----------
+        executor : Executor, optional, default None
+            When not given, the event loop default executor is used.
+        """
+        await _run_sync(executor, self.connect)
+
+    async def compile_async(
+        self, expr: toki.types.Expr, executor: Optional[Executor] = None
+    ) -> Union[str, Any]:
+        """
+        Compile a toki expression without blocking the event loop.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        executor : Executor, optional, default None
+            When not given, the event loop default executor is used.
+
+        Returns
+        -------
+        Union[str, Any]
+        """
+        return await _run_sync(executor, self.compile, expr)
+
+    async def execute_async(
+        self, expr: toki.types.Expr, executor: Optional[Executor] = None
+    ) -> Union[pd.DataFrame, str, int, float, bool, Any]:
+        """
+        Execute a toki expression without blocking the event loop.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        executor : Executor, optional, default None
+            When not given, the event loop default executor is used.
+
+        Returns
+        -------
+        Union[pd.DataFrame, str, int, float, bool, Any]
+        """
+        return await _run_sync(executor, self.execute, expr)
+
+
+async def _run_sync(
+    executor: Optional[Executor], fn: Callable, *args: Any
+) -> Any:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, functools.partial(fn, *args))
+
+
+async def execute_many_async(
+    backend: Backend,
+    exprs: Iterable[toki.types.Expr],
+    concurrency: int = 4,
+    executor: Optional[Executor] = None,
+) -> List[Union[pd.DataFrame, str, int, float, bool, Any]]:
+    """
+    Execute independent toki expressions concurrently.
+
+    Parameters
+    ----------
+    backend : Backend
+    exprs : Iterable[toki.types.Expr]
+    concurrency : int, default 4
+        Maximum number of expressions executed at the same time.
+    executor : Executor, optional, default None
+        Executor used by synchronous drivers, when not given a thread pool
+        with ``concurrency`` workers is used and shut down at the end.
+
+    Returns
+    -------
+    List[Union[pd.DataFrame, str, int, float, bool, Any]]
+        The results, in the same order of ``exprs``.
+    """
+    if concurrency < 1:
+        raise ValueError('Concurrency should be greater than 0.')
+
+    semaphore = asyncio.Semaphore(concurrency)
+    pool = executor or ThreadPoolExecutor(max_workers=concurrency)
+
+    async def _execute(expr):
+        async with semaphore:
+            return await backend.execute_async(expr, executor=pool)
+
+    try:
+        return list(await asyncio.gather(*(_execute(e) for e in exprs)))
+    finally:
+        if executor is None:
+            pool.shutdown(wait=False)
+
 
 class BackendTranslator(Protocol):
     """Backend translator protocol."""
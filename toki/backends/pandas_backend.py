@@ -0,0 +1,810 @@
+"""In-process backend that evaluates expressions over DataFrames."""
+import contextlib
+import os
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import metadsl
+import numpy as np
+import pandas as pd
+
+from toki import datatypes as dtypes
+from toki import operations as ops
+from toki import types as tps
+from toki.backends.core import Backend, BackendTranslator
+from toki.cost import CostModel, PlanEstimate, estimate
+from toki.optimizer import collapse_projections
+from toki.statistics import ColumnStatistics, StatisticsCache, TableStatistics
+from toki.types import postorder
+
+UFUNC_MAP = {
+    ops.Add: np.add,
+    ops.Subtract: np.subtract,
+    ops.Multiply: np.multiply,
+    ops.Divide: np.true_divide,
+    ops.FloorDivide: np.floor_divide,
+    ops.Power: np.power,
+    ops.Modulus: np.mod,
+    ops.Equals: np.equal,
+    ops.NotEquals: np.not_equal,
+    ops.GreaterEqual: np.greater_equal,
+    ops.GreaterThan: np.greater,
+    ops.LessEqual: np.less_equal,
+    ops.LessThan: np.less,
+    ops.And: np.logical_and,
+    ops.Or: np.logical_or,
+    ops.Xor: np.logical_xor,
+    ops.Not: np.logical_not,
+}
+
+# used just to label the result columns, as the SQL backends do
+LABEL_MAP = {
+    ops.Add: '{} + {}',
+    ops.Subtract: '{} - {}',
+    ops.Multiply: '{} * {}',
+    ops.Divide: '{} / {}',
+    ops.FloorDivide: '{} // {}',
+    ops.Power: '{} ** {}',
+    ops.Modulus: '{} % {}',
+    ops.Equals: '{} = {}',
+    ops.NotEquals: '{} <> {}',
+    ops.GreaterEqual: '{} >= {}',
+    ops.GreaterThan: '{} > {}',
+    ops.LessEqual: '{} <= {}',
+    ops.LessThan: '{} < {}',
+    ops.And: '{} AND {}',
+    ops.Or: '{} OR {}',
+    ops.Xor: '{} XOR {}',
+    ops.Not: 'NOT {}',
+}
+
+# a step of a program: (opcode, operand, argument slots). The result of each
+# step is stored in the slot with the same position of the step.
+Step = Tuple[str, Any, Tuple[int, ...]]
+
+SOURCE_OPCODES = ('table', 'project', 'column')
+# opcodes of the programs that can be evaluated by row partitions
+ELEMENTWISE_OPCODES = SOURCE_OPCODES + ('literal', 'ufunc', 'fused')
+
+
+def _is_leaf(expr) -> bool:
+    return isinstance(expr, (tps.TableBase, dtypes.DataType))
+
+
+def _scalar(value: Any) -> Any:
+    # NumPy scalars to Python values
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def table_key(table: tps.Table) -> str:
+    """Get the name a table is bound to, e.g. ``schema.table``."""
+    return '.'.join(
+        name
+        for name in (
+            table.database_name,
+            table.database_schema_name,
+            table.name,
+        )
+        if name
+    )
+
+
+class Program:
+    """
+    Compiled expression evaluated by ``PandasBackend``.
+
+    The steps are in post-order, so the arguments of a step are always
+    computed before it. Structurally identical sub-expressions are the same
+    step, so they are computed once and their array is reused.
+
+    Parameters
+    ----------
+    steps : List[Step]
+    label : str, optional, default None
+        Name of the result column, for value expressions.
+    """
+
+    def __init__(self, steps: List[Step], label: Optional[str] = None):
+        self.steps = steps
+        self.label = label
+
+        # a slot is released after the last step that uses it
+        last_use: Dict[int, int] = {}
+        for i, (_, _, args) in enumerate(steps):
+            for arg in args:
+                last_use[arg] = i
+        self.releases: List[List[int]] = [[] for _ in steps]
+        for slot, i in last_use.items():
+            self.releases[i].append(slot)
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __repr__(self) -> str:
+        return '\n'.join(
+            '{}: {} {} {}'.format(i, opcode, operand, list(args))
+            for i, (opcode, operand, args) in enumerate(self.steps)
+        )
+
+
+class FusedKernel:
+    """
+    Chain of ufuncs evaluated in a single blocked pass.
+
+    The inputs are split in blocks of ``blocksize`` rows and the whole
+    chain is computed for a block before the next one, so the intermediate
+    results are kept in small scratch buffers (reused by every block)
+    instead of arrays as large as the inputs.
+
+    Parameters
+    ----------
+    operations : List[Tuple[np.ufunc, Tuple[int, ...]]]
+        Ufuncs in evaluation order with their operands, an operand lower
+        than ``n_inputs`` is an input, otherwise it is the result of the
+        operation ``operand - n_inputs``. The last one is the result.
+    n_inputs : int
+    blocksize : int
+    """
+
+    def __init__(
+        self,
+        operations: List[Tuple[np.ufunc, Tuple[int, ...]]],
+        n_inputs: int,
+        blocksize: int,
+    ):
+        self.operations = operations
+        self.n_inputs = n_inputs
+        self.blocksize = blocksize
+
+    def __repr__(self) -> str:
+        return 'fused[{}]'.format(
+            ', '.join(ufunc.__name__ for ufunc, _ in self.operations)
+        )
+
+    def _evaluate(self, inputs: List[Any]) -> List[Any]:
+        values = list(inputs)
+        for ufunc, operands in self.operations:
+            values.append(ufunc(*(values[i] for i in operands)))
+        return values[self.n_inputs :]
+
+    def __call__(self, *inputs: Any) -> Any:
+        is_array = [
+            isinstance(value, np.ndarray) and value.ndim > 0
+            for value in inputs
+        ]
+        sizes = {len(v) for v, array in zip(inputs, is_array) if array}
+        if len(sizes) != 1 or 0 in sizes:
+            # nothing to split (or broadcasting), evaluate it at once
+            return self._evaluate(list(inputs))[-1]
+
+        size = sizes.pop()
+        blocksize = self.blocksize
+        result = None
+        # scratch buffer for each intermediate array, or its value when it
+        # is a scalar (computed from scalars only)
+        buffers: List[Any] = []
+
+        for start in range(0, size, blocksize):
+            stop = min(start + blocksize, size)
+            values = [
+                value[start:stop] if array else value
+                for value, array in zip(inputs, is_array)
+            ]
+
+            if result is None:
+                # the first block defines the result types
+                block = self._evaluate(values)
+                for value in block[:-1]:
+                    if isinstance(value, np.ndarray) and value.ndim > 0:
+                        value = np.empty(blocksize, dtype=value.dtype)
+                    buffers.append(value)
+                result = np.empty(size, dtype=block[-1].dtype)
+                result[start:stop] = block[-1]
+                continue
+
+            last = len(self.operations) - 1
+            for i, (ufunc, operands) in enumerate(self.operations):
+                buffer = result[start:stop] if i == last else buffers[i]
+                if not isinstance(buffer, np.ndarray):
+                    values.append(buffer)
+                    continue
+                if i != last:
+                    buffer = buffer[: stop - start]
+                ufunc(*(values[j] for j in operands), out=buffer)
+                values.append(buffer)
+
+        return result
+
+
+def fuse(program: Program, blocksize: int = 16384) -> Program:
+    """
+    Fuse the chains of ufunc steps of a program.
+
+    A ufunc step used just by another ufunc step is merged into it, so
+    each chain becomes one ``fused`` step evaluated by a ``FusedKernel``.
+
+    Parameters
+    ----------
+    program : Program
+    blocksize : int, default 16384
+        Number of rows evaluated at once by the fused steps.
+
+    Returns
+    -------
+    Program
+    """
+    steps = program.steps
+    consumers: Dict[int, List[int]] = {}
+    for i, (_, _, args) in enumerate(steps):
+        for arg in args:
+            consumers.setdefault(arg, []).append(i)
+
+    internal = [
+        opcode == 'ufunc'
+        and i != len(steps) - 1
+        and len(consumers.get(i, [])) == 1
+        and steps[consumers[i][0]][0] == 'ufunc'
+        for i, (opcode, _, _) in enumerate(steps)
+    ]
+
+    new_steps: List[Step] = []
+    remap: Dict[int, int] = {}
+
+    for i, (opcode, operand, args) in enumerate(steps):
+        if internal[i]:
+            continue
+        if opcode == 'ufunc' and any(internal[arg] for arg in args):
+            inputs: List[int] = []
+            local: Dict[int, int] = {}
+            operations: List[Tuple[np.ufunc, Tuple[int, ...]]] = []
+            # the chain members are in post-order, as in the program
+            members = _chain(steps, internal, i)
+            for member in members:
+                for arg in steps[member][2]:
+                    if not internal[arg] and arg not in inputs:
+                        inputs.append(arg)
+            for member in members:
+                ufunc, member_args = steps[member][1], steps[member][2]
+                operations.append(
+                    (
+                        ufunc,
+                        tuple(
+                            local[arg] if internal[arg] else inputs.index(arg)
+                            for arg in member_args
+                        ),
+                    )
+                )
+                local[member] = len(inputs) + len(operations) - 1
+            step: Step = (
+                'fused',
+                FusedKernel(operations, len(inputs), blocksize),
+                tuple(remap[arg] for arg in inputs),
+            )
+        else:
+            step = (opcode, operand, tuple(remap[arg] for arg in args))
+        new_steps.append(step)
+        remap[i] = len(new_steps) - 1
+
+    return Program(new_steps, program.label)
+
+
+def _chain(steps: List[Step], internal: List[bool], root: int) -> List[int]:
+    """Get the steps fused into ``root``, in post-order."""
+    members: List[int] = []
+    stack = [(root, False)]
+    while stack:
+        i, expanded = stack.pop()
+        if expanded:
+            members.append(i)
+            continue
+        stack.append((i, True))
+        for arg in reversed(steps[i][2]):
+            if internal[arg]:
+                stack.append((arg, False))
+    return members
+
+
+def _evaluate(steps: List[Step], inputs: Dict[int, Any]) -> Any:
+    """Evaluate the value steps of a program, with the given columns."""
+    slots: List[Any] = [None] * len(steps)
+    for i, (opcode, operand, args) in enumerate(steps):
+        if i in inputs:
+            slots[i] = inputs[i]
+        elif opcode == 'literal':
+            slots[i] = operand
+        elif opcode in ('ufunc', 'fused'):
+            slots[i] = operand(*(slots[arg] for arg in args))
+    return slots[-1]
+
+
+# a shared memory array: (name, dtype, size)
+SharedArray = Tuple[str, str, int]
+
+
+@contextlib.contextmanager
+def _attach(shared: SharedArray) -> Iterator[np.ndarray]:
+    name, dtype, size = shared
+    memory = shared_memory.SharedMemory(name=name)
+    try:
+        array: np.ndarray = np.ndarray(size, dtype=dtype, buffer=memory.buf)
+        try:
+            yield array
+        finally:
+            # the memory can't be closed while a view of it is referenced
+            del array
+    finally:
+        memory.close()
+
+
+def _run_partition(
+    steps: List[Step],
+    inputs: Dict[int, SharedArray],
+    output: SharedArray,
+    start: int,
+    stop: int,
+):
+    """Evaluate a row range in a worker, reading the shared columns."""
+    arrays: Dict[int, np.ndarray] = {}
+    with contextlib.ExitStack() as stack:
+        try:
+            for i, shared in inputs.items():
+                arrays[i] = stack.enter_context(_attach(shared))[start:stop]
+            values = _evaluate(steps, arrays)
+            stack.enter_context(_attach(output))[start:stop] = values
+        except BaseException as error:
+            # the frames of the error reference the views too, they are
+            # released so the error isn't masked by a ``BufferError``
+            traceback.clear_frames(error.__traceback__)
+            raise
+        finally:
+            # the views are released before the memory is closed
+            arrays.clear()
+            values = None
+
+
+class PandasTranslator(BackendTranslator):
+    """Translate a toki expression to a ``Program``."""
+
+    def translate(self, expr) -> Program:
+        steps: List[Step] = []
+        slots: Dict[int, int] = {}
+        # steps by structure: the steps have no side effects, so a step
+        # equal to a previous one (e.g. a repeated sub-expression) reuses
+        # its slot, computed once.
+        emitted: Dict[tuple, int] = {}
+
+        def _emit(step: Step) -> int:
+            opcode, operand, args = step
+            key = (opcode, type(operand).__qualname__, repr(operand), args)
+            if key not in emitted:
+                steps.append(step)
+                emitted[key] = len(steps) - 1
+            return emitted[key]
+
+        def _arg(arg) -> int:
+            if isinstance(arg, metadsl.Expression):
+                return slots[id(arg)]
+            return _emit(('literal', arg, ()))
+
+        nodes = []
+        if isinstance(expr, metadsl.Expression):
+            nodes = postorder(expr, is_leaf=_is_leaf)
+        for node in nodes:
+            if isinstance(node, tps.Column):
+                step: Step = (
+                    'column',
+                    node.columns,
+                    (self._source(node.source, slots, _emit),),
+                )
+            elif isinstance(node, tps.TableBase):
+                step = ('frame', None, (self._source(node, slots, _emit),))
+            elif isinstance(node, dtypes.DataType):
+                step = ('literal', self.literal(node), ())
+            elif type(node) in UFUNC_MAP:
+                step = (
+                    'ufunc',
+                    UFUNC_MAP[type(node)],
+                    tuple(_arg(arg) for arg in node.args),
+                )
+            else:
+                raise NotImplementedError(
+                    'Expression ``{}`` not supported.'.format(
+                        type(node).__name__
+                    )
+                )
+            slots[id(node)] = _emit(step)
+
+        if not steps:
+            _emit(('literal', expr, ()))
+
+        label = None
+        if not isinstance(expr, tps.TableBase) or isinstance(expr, tps.Column):
+            label = self.label(expr)
+        return Program(steps, label)
+
+    def _source(self, source: tps.TableBase, slots: Dict[int, int], emit):
+        """Emit the steps for a table source, sharing the repeated ones."""
+        if id(source) in slots:
+            return slots[id(source)]
+
+        if isinstance(source, tps.Table):
+            slot = emit(('table', table_key(source), ()))
+        elif isinstance(source, tps.Projection):
+            parent = self._source(source.source, slots, emit)
+            columns = source.columns
+            if isinstance(columns, str):
+                columns = [columns]
+            slot = emit(('project', list(columns), (parent,)))
+        else:
+            raise NotImplementedError(
+                'Table ``{}`` not supported.'.format(type(source).__name__)
+            )
+        slots[id(source)] = slot
+        return slot
+
+    def literal(self, value: dtypes.DataType) -> Any:
+        """Get a data type value as the NumPy scalar of the same type."""
+        np_type = getattr(np, type(value).__name__.lower(), None)
+        if np_type is None:
+            return value.value
+        return np_type(value.value)
+
+    def label(self, expr) -> str:
+        """Get the result column name for a value expression."""
+        labels: Dict[int, str] = {}
+
+        def _operand(arg) -> str:
+            if not isinstance(arg, metadsl.Expression):
+                return str(arg)
+            if isinstance(arg, ops.OperationExpr):
+                return '({})'.format(labels[id(arg)])
+            return labels[id(arg)]
+
+        if not isinstance(expr, metadsl.Expression):
+            return str(expr)
+        for node in postorder(expr, is_leaf=_is_leaf):
+            if isinstance(node, tps.Column):
+                labels[id(node)] = node.columns
+            elif isinstance(node, dtypes.DataType):
+                labels[id(node)] = str(node.value)
+            elif type(node) in LABEL_MAP:
+                labels[id(node)] = LABEL_MAP[type(node)].format(
+                    *(_operand(arg) for arg in node.args)
+                )
+            else:
+                labels[id(node)] = type(node).__name__
+        return getattr(expr, 'rename', None) or labels[id(expr)]
+
+
+class PandasBackend(Backend):
+    """
+    Backend that evaluates expressions over in-memory DataFrames.
+
+    Tables are looked up by name in the bound DataFrames and the column
+    operations are computed by vectorized NumPy functions, so there is no
+    round trip to a database.
+    """
+
+    translator: BackendTranslator = PandasTranslator()
+
+    def __init__(
+        self,
+        tables: Optional[Dict[str, pd.DataFrame]] = None,
+        fused: bool = True,
+        blocksize: int = 16384,
+        partition_size: Optional[int] = None,
+        workers: Optional[int] = None,
+        cost_model: Optional[CostModel] = None,
+        statistics_cache: Optional[StatisticsCache] = None,
+    ):
+        """
+        Initialize the pandas backend.
+
+        Parameters
+        ----------
+        tables : Dict[str, pd.DataFrame], optional, default None
+            DataFrames by table name (see ``table_key``).
+        fused : bool, default True
+            When True, chains of column operations are evaluated in a
+            single blocked pass (see ``fuse``), without a temporary array
+            for each operation.
+        blocksize : int, default 16384
+            Number of rows evaluated at once by the fused operations.
+        partition_size : int, optional, default None
+            When given, element-wise column expressions with more rows are
+            split in partitions of this size, evaluated by a process pool.
+            The columns and the result are kept in shared memory, so they
+            are not pickled.
+        workers : int, optional, default None
+            Number of processes for the partitioned execution, by default
+            the number of CPUs.
+        cost_model : CostModel, optional, default None
+            When given, it chooses the number of partitions of the
+            element-wise column expressions (see ``CostModel.partitions``),
+            instead of ``partition_size``, so the expressions are split
+            just when it is worth it. The choice is made from the table
+            statistics (see ``toki.cost.estimate``), before the columns
+            are loaded.
+        statistics_cache : StatisticsCache, optional, default None
+            Cache for the table statistics gathered by ``statistics``. By
+            default, a ``StatisticsCache`` without expiration is used.
+        """
+        self.tables: Dict[str, pd.DataFrame] = dict(tables or {})
+        self.fused = fused
+        self.blocksize = blocksize
+        self.partition_size = partition_size
+        self.workers = workers
+        self.cost_model = cost_model
+        self.statistics_cache = (
+            StatisticsCache() if statistics_cache is None else statistics_cache
+        )
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def register(self, name: str, data: pd.DataFrame):
+        """
+        Bind a DataFrame to a table name.
+
+        Parameters
+        ----------
+        name : str
+        data : pd.DataFrame
+        """
+        self.tables[name] = data
+        self.statistics_cache.invalidate(name)
+
+    def connect(self) -> None:
+        """Nothing to connect, the data is in memory."""
+
+    def close(self) -> None:
+        """Shut down the partitioned execution processes."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def compile(self, expr) -> Program:
+        program = self.translator.translate(collapse_projections(expr))
+        if self.fused:
+            program = fuse(program, self.blocksize)
+        return program
+
+    def compile_many(self, exprs: Iterable) -> List[Program]:
+        return [self.compile(expr) for expr in exprs]
+
+    def _table(self, name: str) -> pd.DataFrame:
+        try:
+            return self.tables[name]
+        except KeyError:
+            raise KeyError('Table ``{}`` not registered.'.format(name))
+
+    def run(
+        self, program: Program, plan: Optional[PlanEstimate] = None
+    ) -> Any:
+        """
+        Evaluate a compiled program.
+
+        Parameters
+        ----------
+        program : Program
+        plan : PlanEstimate, optional, default None
+            Estimate of the work, used by ``cost_model``. By default, it is
+            estimated from the program steps and the table sizes.
+
+        Returns
+        -------
+        Any
+            A DataFrame, an array or a scalar, from the last step.
+        """
+        if self.partition_size is not None or self.cost_model is not None:
+            result = self._run_partitioned(program, plan)
+            if result is not None:
+                return result
+
+        slots: List[Any] = [None] * len(program)
+
+        for i, (opcode, operand, args) in enumerate(program.steps):
+            values = [slots[arg] for arg in args]
+            if opcode in ('ufunc', 'fused'):
+                result = operand(*values)
+            elif opcode == 'column':
+                result = values[0][operand].to_numpy()
+            elif opcode == 'literal':
+                result = operand
+            elif opcode == 'table':
+                result = self._table(operand)
+            elif opcode == 'project':
+                result = values[0][operand]
+            elif opcode == 'frame':
+                # a new frame, so the bound one isn't changed by the caller
+                result = values[0].copy(deep=False)
+            else:
+                raise NotImplementedError(
+                    'Step ``{}`` not supported.'.format(opcode)
+                )
+            # the intermediate arrays are released as soon as possible
+            for slot in program.releases[i]:
+                slots[slot] = None
+            slots[i] = result
+
+        return slots[-1]
+
+    def _sources(self, program: Program) -> Dict[int, Any]:
+        sources: Dict[int, Any] = {}
+        for i, (opcode, operand, args) in enumerate(program.steps):
+            if opcode == 'table':
+                sources[i] = self._table(operand)
+            elif opcode == 'project':
+                sources[i] = sources[args[0]][operand]
+            elif opcode == 'column':
+                sources[i] = sources[args[0]][operand].to_numpy()
+        return sources
+
+    def _row_statistics(self, name: str) -> TableStatistics:
+        # the gathered statistics, or just the row count, which doesn't
+        # need a scan of the columns
+        statistics = self.statistics_cache.get(name)
+        if statistics is None:
+            statistics = TableStatistics(len(self._table(name)))
+        return statistics
+
+    def _estimate(self, program: Program) -> PlanEstimate:
+        """Estimate the work of a program from its steps."""
+        rows = 1
+        operations = 0
+        columns = 0
+        for opcode, operand, _ in program.steps:
+            if opcode == 'table':
+                rows = max(rows, self._row_statistics(operand).row_count)
+            elif opcode == 'column':
+                columns += 1
+            elif opcode == 'fused':
+                operations += len(operand.operations)
+            elif opcode == 'ufunc':
+                operations += 1
+        return PlanEstimate(rows, operations, columns)
+
+    def _run_partitioned(
+        self, program: Program, plan: Optional[PlanEstimate] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Evaluate an element-wise program by row partitions.
+
+        Returns
+        -------
+        np.ndarray, optional
+            None if the program can't be (or isn't worth being) split.
+        """
+        steps = program.steps
+        if program.label is None or any(
+            opcode not in ELEMENTWISE_OPCODES for opcode, _, _ in steps
+        ):
+            return None
+
+        workers = self.workers or os.cpu_count() or 1
+        partitions = None
+        if self.cost_model is not None:
+            if plan is None:
+                plan = self._estimate(program)
+            partitions = self.cost_model.partitions(plan, workers)
+            if partitions == 1:
+                # decided before the columns are loaded
+                return None
+
+        sources = self._sources(program)
+        columns = {
+            i: value for i, value in sources.items() if steps[i][0] == 'column'
+        }
+        sizes = {len(column) for column in columns.values()}
+        if len(sizes) != 1 or any(
+            column.dtype.hasobject for column in columns.values()
+        ):
+            return None
+
+        size = sizes.pop()
+        if partitions is not None:
+            partition_size = -(-size // partitions)
+        else:
+            partition_size = self.partition_size  # type: ignore
+        if size <= partition_size:
+            return None
+
+        # the first row defines the result type
+        sample = np.asarray(
+            _evaluate(steps, {i: c[:1] for i, c in columns.items()})
+        )
+        if sample.ndim == 0 or sample.dtype.hasobject:
+            return None
+
+        with contextlib.ExitStack() as stack:
+
+            def _share(array: np.ndarray) -> SharedArray:
+                memory = shared_memory.SharedMemory(
+                    create=True, size=max(array.nbytes, 1)
+                )
+                stack.callback(memory.unlink)
+                stack.callback(memory.close)
+                shared = (memory.name, array.dtype.str, len(array))
+                with _attach(shared) as view:
+                    view[:] = array
+                return shared
+
+            inputs = {i: _share(column) for i, column in columns.items()}
+            output = _share(np.empty(size, dtype=sample.dtype))
+
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=workers)
+            starts = range(0, size, partition_size)
+            futures = [
+                self._executor.submit(
+                    _run_partition,
+                    steps,
+                    inputs,
+                    output,
+                    start,
+                    min(start + partition_size, size),
+                )
+                for start in starts
+            ]
+            for future in futures:
+                future.result()
+
+            with _attach(output) as view:
+                # copied, since the shared memory is released at the end
+                return view.copy()
+
+    def statistics(
+        self, table: tps.Table, refresh: bool = False
+    ) -> TableStatistics:
+        name = table_key(table)
+        statistics = None if refresh else self.statistics_cache.get(name)
+        if statistics is None:
+            data = self._table(name)
+            columns = {}
+            for column in table.schema.structure:
+                values = data[column].dropna()
+                columns[column] = ColumnStatistics(
+                    _scalar(values.min()) if len(values) else None,
+                    _scalar(values.max()) if len(values) else None,
+                    len(data) - len(values),
+                    values.nunique(),
+                )
+            statistics = TableStatistics(len(data), columns)
+            self.statistics_cache.set(name, statistics)
+        return statistics
+
+    def execute(self, expr) -> pd.DataFrame:
+        plan = None
+        if self.cost_model is not None:
+            plan = estimate(
+                expr, lambda table: self._row_statistics(table_key(table))
+            )
+        program = self.compile(expr)
+        result = self.run(program, plan)
+        if program.label is None:
+            return result
+        return pd.DataFrame({program.label: np.atleast_1d(result)})
+
+    def execute_stream(
+        self, expr, chunksize: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute an expression, yielding the result in chunks.
+
+        The result is computed at once, since the data is in memory, and
+        then split.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        chunksize : int, optional, default None
+            Number of rows for each chunk, the whole result by default.
+
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+        """
+        result = self.execute(expr)
+        chunksize = chunksize or max(len(result), 1)
+        for start in range(0, len(result), chunksize):
+            yield result.iloc[start : start + chunksize]
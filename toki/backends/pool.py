@@ -0,0 +1,315 @@
+"""Database connections pool."""
+import contextlib
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Iterator, Optional, Tuple
+
+
+class ConnectionPool:
+    """
+    Thread safe pool of database connections.
+
+    Connections are created on demand by ``factory`` up to ``maxsize`` and
+    are reused after they are released, so driver-level resources bound to
+    a connection (e.g. the prepared statements cache) are reused as well.
+
+    Parameters
+    ----------
+    factory : Callable[[], Any]
+        Function that opens a new connection.
+    minsize : int, default 0
+        Number of connections opened by ``open`` and kept by the idle
+        eviction.
+    maxsize : int, default 4
+        Maximum number of connections, when all of them are borrowed
+        ``acquire`` waits for a connection to be released.
+    idle_timeout : float, optional, default 300.0
+        Seconds a connection can stay idle before it is closed, None keeps
+        the idle connections open.
+    health_check : Callable[[Any], bool], optional, default None
+        Function called with an idle connection before it is borrowed, when
+        it returns False or raises an error the connection is discarded.
+    timeout : float, optional, default None
+        Maximum seconds ``acquire`` waits for a connection, None waits
+        forever.
+    close : Callable[[Any], None], optional, default None
+        Function that closes a connection, by default its ``close`` method
+        is called.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        minsize: int = 0,
+        maxsize: int = 4,
+        idle_timeout: Optional[float] = 300.0,
+        health_check: Optional[Callable[[Any], bool]] = None,
+        timeout: Optional[float] = None,
+        close: Optional[Callable[[Any], None]] = None,
+    ):
+        if maxsize < 1:
+            raise ValueError('Pool maxsize should be greater than 0.')
+        if not 0 <= minsize <= maxsize:
+            raise ValueError(
+                'Pool minsize should be between 0 and maxsize ({}).'.format(
+                    maxsize
+                )
+            )
+        self.factory = factory
+        self.minsize = minsize
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.health_check = health_check
+        self.timeout = timeout
+        self._close = close or (lambda connection: connection.close())
+
+        self._idle: Deque[Tuple[Any, float]] = deque()
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+
+        self.created = 0
+        self.evicted = 0
+        self.failed_checks = 0
+        self.acquisitions = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.peak_in_use = 0
+
+    @property
+    def size(self) -> int:
+        """Number of open connections."""
+        return self._size
+
+    @property
+    def in_use(self) -> int:
+        """Number of borrowed connections."""
+        return self._size - len(self._idle)
+
+    def open(self):
+        """Open connections up to ``minsize``."""
+        with self._condition:
+            self._closed = False
+            missing = max(self.minsize - self._size, 0)
+            self._size += missing
+
+        for _ in range(missing):
+            connection = self._create()
+            with self._condition:
+                self._idle.append((connection, time.monotonic()))
+                self._condition.notify()
+
+    def _create(self) -> Any:
+        # the slot is reserved by the caller, so the size limit is respected
+        # and a slow connect doesn't hold the lock
+        try:
+            connection = self.factory()
+        except BaseException:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.created += 1
+        return connection
+
+    def _discard(self, connection: Any):
+        self._size -= 1
+        try:
+            self._close(connection)
+        except Exception:
+            pass
+
+    def _healthy(self, connection: Any) -> bool:
+        if self.health_check is None:
+            return True
+        try:
+            return bool(self.health_check(connection))
+        except Exception:
+            return False
+
+    def _evict_idle(self, now: float):
+        if self.idle_timeout is None:
+            return
+        # the oldest released connections are on the left
+        while (
+            self._idle
+            and self._size > self.minsize
+            and now - self._idle[0][1] > self.idle_timeout
+        ):
+            connection, _ = self._idle.popleft()
+            self._discard(connection)
+            self.evicted += 1
+
+    def evict_idle(self):
+        """Close the connections idle for more than ``idle_timeout``."""
+        with self._condition:
+            self._evict_idle(time.monotonic())
+
+    def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Borrow a connection from the pool.
+
+        Parameters
+        ----------
+        timeout : float, optional, default None
+            Maximum seconds to wait for a connection, the pool ``timeout``
+            by default.
+
+        Returns
+        -------
+        Any
+            The connection, it should be given back with ``release``.
+
+        Raises
+        ------
+        TimeoutError
+            When no connection is released in time.
+        RuntimeError
+            When the pool is closed, also while waiting for a connection.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        waited = False
+
+        while True:
+            with self._condition:
+                connection, idle, waited_ = self._reserve(timeout, start)
+            waited = waited or waited_
+
+            # the connect and the health check are made without the lock
+            if not idle:
+                connection = self._create()
+            elif not self._healthy(connection):
+                with self._condition:
+                    self.failed_checks += 1
+                    self._discard(connection)
+                    self._condition.notify()
+                continue
+
+            with self._condition:
+                if self._closed:
+                    self._discard(connection)
+                    raise RuntimeError('Connection pool is closed.')
+                elapsed = time.monotonic() - start
+                self.acquisitions += 1
+                if waited:
+                    self.waits += 1
+                self.wait_time += elapsed
+                self.max_wait_time = max(self.max_wait_time, elapsed)
+                self.peak_in_use = max(self.peak_in_use, self.in_use)
+                return connection
+
+    def _reserve(
+        self, timeout: Optional[float], start: float
+    ) -> Tuple[Any, bool, bool]:
+        # called with the lock held, it takes an idle connection or reserves
+        # the slot of a new one, waiting when all of them are borrowed.
+        waited = False
+        while True:
+            # ``close`` wakes up the waiting threads
+            if self._closed:
+                raise RuntimeError('Connection pool is closed.')
+
+            self._evict_idle(time.monotonic())
+
+            if self._idle:
+                # the most recently released connection is reused
+                connection, _ = self._idle.pop()
+                return connection, True, waited
+
+            if self._size < self.maxsize:
+                self._size += 1
+                return None, False, waited
+
+            remaining = None
+            if timeout is not None:
+                remaining = timeout - (time.monotonic() - start)
+                if remaining <= 0:
+                    raise TimeoutError(
+                        'No connection available after {}s, all the {} '
+                        'connections are borrowed.'.format(
+                            timeout, self.maxsize
+                        )
+                    )
+            waited = True
+            self._condition.wait(remaining)
+
+    def release(self, connection: Any):
+        """
+        Give a borrowed connection back to the pool.
+
+        Parameters
+        ----------
+        connection : Any
+        """
+        with self._condition:
+            if self._closed:
+                self._discard(connection)
+            else:
+                now = time.monotonic()
+                self._idle.append((connection, now))
+                self._evict_idle(now)
+            self._condition.notify()
+
+    @contextlib.contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow a connection while the context is active.
+
+        Parameters
+        ----------
+        timeout : float, optional, default None
+            See ``acquire``.
+        """
+        connection = self.acquire(timeout)
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        """
+        Close the idle connections.
+
+        Borrowed connections are closed when they are released.
+        """
+        with self._condition:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._discard(connection)
+            self._condition.notify_all()
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get the pool statistics.
+
+        Returns
+        -------
+        dict
+            ``size``, ``idle``, ``in_use``, ``maxsize``, ``utilisation``
+            (borrowed connections over ``maxsize``), ``peak_in_use``,
+            ``created``, ``evicted``, ``failed_checks``, ``acquisitions``,
+            ``waits``, ``wait_time`` and ``max_wait_time`` (in seconds)
+            values.
+        """
+        with self._condition:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self.in_use,
+                'maxsize': self.maxsize,
+                'utilisation': self.in_use / self.maxsize,
+                'peak_in_use': self.peak_in_use,
+                'created': self.created,
+                'evicted': self.evicted,
+                'failed_checks': self.failed_checks,
+                'acquisitions': self.acquisitions,
+                'waits': self.waits,
+                'wait_time': self.wait_time,
+                'max_wait_time': self.max_wait_time,
+            }
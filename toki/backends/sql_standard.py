@@ -1,11 +1,40 @@
-from typing import Union
+from __future__ import annotations
 
+import contextlib
+import functools
+import re
+import sqlite3
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import metadsl
 import metadsl_rewrite
-import pandas as pd
 
+import toki
 from toki import datatypes as dtypes
-from toki.backends.core import Backend
-from toki.rules import RegisterStrategy
+from toki import operations as ops
+from toki import types as tps
+from toki.backends.cache import CompileCache, DiskCompileCache
+from toki.backends.core import Backend, BackendTranslator
+from toki.backends.pool import ConnectionPool
+from toki.datatypes import number_types
+from toki.optimizer import collapse_projections, fold_constants, reassociate
+from toki.rules import REWRITE_LOCK, RegisterStrategy
+from toki.statistics import ColumnStatistics, StatisticsCache, TableStatistics
+from toki.types import fingerprint, postorder
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 STRATEGY = RegisterStrategy()
 
@@ -27,8 +56,114 @@ BIN_OPS = {
     'ne': '{} <> {}',
 }
 
+LOGICAL_OPS = {
+    'and': '{} AND {}',
+    'or': '{} OR {}',
+}
+
+OPS_MAP = {
+    ops.Add: 'add',
+    ops.Divide: 'truediv',
+    ops.FloorDivide: 'floordiv',
+    ops.Modulus: 'mod',
+    ops.Multiply: 'mul',
+    ops.Subtract: 'sub',
+    ops.Power: 'pow',
+    ops.GreaterEqual: 'ge',
+    ops.GreaterThan: 'gt',
+    ops.LessEqual: 'le',
+    ops.LessThan: 'lt',
+    ops.NotEquals: 'ne',
+    ops.And: 'and',
+    ops.Or: 'or',
+}
+
 FN_MAP = {}
 
+_MISSING = object()
+
+# names that can't be used as identifiers without quotes
+SQL_KEYWORDS = frozenset(
+    '''
+    ALL AND AS ASC BETWEEN BY CASE CAST CHECK COLLATE COLUMN CONSTRAINT
+    CREATE CROSS CURRENT_DATE CURRENT_TIME CURRENT_TIMESTAMP DEFAULT DELETE
+    DESC DISTINCT DROP ELSE END ESCAPE EXCEPT EXISTS FALSE FOREIGN FROM FULL
+    GLOB GROUP HAVING IN INDEX INNER INSERT INTERSECT INTO IS ISNULL JOIN
+    KEY LEFT LIKE LIMIT MATCH NATURAL NOT NOTNULL NULL OFFSET ON OR ORDER
+    OUTER PRIMARY REFERENCES REGEXP RIGHT SELECT SET TABLE THEN TO TRUE
+    UNION UNIQUE UPDATE USING VALUES WHEN WHERE WITH
+    '''.split()
+)
+
+_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+
+# SQLite limit of columns in a result set (``SQLITE_MAX_COLUMN``)
+MAX_RESULT_COLUMNS = 2000
+
+_STATISTICS_ITEMS = 'MIN({0}), MAX({0}), COUNT({0}), COUNT(DISTINCT {0})'
+
+# seconds the default pool of a backend waits for a connection
+POOL_TIMEOUT = 30.0
+
+
+def _is_column(expr) -> bool:
+    return isinstance(expr, tps.Column)
+
+
+def _value_args(expr) -> List[Any]:
+    """Get the arguments of a value expression that are expressions."""
+    if isinstance(expr, tps.Column):
+        return []
+    return [arg for arg in expr.args if isinstance(arg, metadsl.Expression)]
+
+
+class _Param:
+    """
+    Placeholder for a literal value lifted out of the compiled SQL.
+
+    It behaves as the value for the rewrite rules, but it is formatted as
+    the ``?N`` placeholder (1-based). Its representation doesn't include
+    the value, so expressions that differ just in their literal values have
+    the same fingerprint.
+    """
+
+    index: int
+
+    def __new__(cls, value, index: int):
+        obj = super().__new__(cls, value)  # type: ignore
+        obj.index = index
+        return obj
+
+    def __format__(self, format_spec: str) -> str:
+        return '?{}'.format(self.index)
+
+    def __str__(self) -> str:
+        return '?{}'.format(self.index)
+
+    def __repr__(self) -> str:
+        return '?{}'.format(self.index)
+
+    def __eq__(self, other) -> bool:
+        return (
+            type(self) is type(other)
+            and self.index == other.index
+            and super().__eq__(other)
+        )
+
+    def __ne__(self, other) -> bool:
+        return not self == other
+
+    def __hash__(self) -> int:
+        return hash((self.index, super().__hash__()))
+
+
+class IntParam(_Param, int):
+    """Placeholder for an integer literal."""
+
+
+class FloatParam(_Param, float):
+    """Placeholder for a float literal."""
+
 
 def op_num_builder(op, tp_x, tp_y):
     dunder_op = '__{}__'.format(op)
@@ -91,31 +226,818 @@ def op_num_builder(op, tp_x, tp_y):
     return _fn
 
 
-int_types = ('int8', 'int16', 'int32', 'int64')
-float_types = ('float16', 'float16', 'float64')
+OP_CLASSES = {name: op for op, name in OPS_MAP.items()}
 
-number_types = int_types + float_types
 
+def op_num_rule(op, tp_x, tp_y):
+    FN_MAP[op] = op_num_builder(op, tp_x, tp_y)
+    return metadsl_rewrite.rule(FN_MAP[op])
+
+
+# the rules are built by the first compile that needs them
 for tp_x in number_types:
     for tp_y in number_types:
         for op in BIN_OPS:
-            FN_MAP[op] = op_num_builder(op, tp_x, tp_y)
-            STRATEGY.register(metadsl_rewrite.rule(FN_MAP[op]))
+            if op == 'ne':
+                # numbers don't dispatch ``ne`` yet (see ``toki.api``), so
+                # its rule template would be a bool matching any 0 or 1.
+                continue
+            STRATEGY.register_lazy(
+                functools.partial(op_num_rule, op, tp_x, tp_y),
+                key=(
+                    OP_CLASSES[op],
+                    getattr(dtypes, tp_x.capitalize()),
+                    getattr(dtypes, tp_y.capitalize()),
+                ),
+                name='{}.op_num_rule'.format(__name__),
+            )
+
+
+def _sqlite_ping(connection: sqlite3.Connection) -> bool:
+    return connection.execute('SELECT 1').fetchone() == (1,)
+
+
+def sqlite_pool(
+    database: str = ':memory:',
+    minsize: int = 0,
+    maxsize: int = 4,
+    cached_statements: int = 128,
+    **kwargs,
+) -> ConnectionPool:
+    """
+    Create a pool of SQLite connections.
+
+    Parameters
+    ----------
+    database : str, default ':memory:'
+    minsize : int, default 0
+    maxsize : int, default 4
+        Each ``:memory:`` connection has its own database, so it is limited
+        to 1 in this case.
+    cached_statements : int, default 128
+        Number of prepared statements cached by each connection.
+    **kwargs
+        Other ``ConnectionPool`` parameters.
+
+    Returns
+    -------
+    ConnectionPool
+    """
+
+    def factory() -> sqlite3.Connection:
+        # connections are borrowed by different threads
+        return sqlite3.connect(
+            database,
+            check_same_thread=False,
+            cached_statements=cached_statements,
+        )
+
+    if database == ':memory:':
+        maxsize = 1
+        minsize = min(minsize, maxsize)
+        # closing the connection would drop the database
+        kwargs.setdefault('idle_timeout', None)
+    kwargs.setdefault('health_check', _sqlite_ping)
+    return ConnectionPool(factory, minsize=minsize, maxsize=maxsize, **kwargs)
+
+
+class SQLStandardTranslator(BackendTranslator):
+    """
+    Translate the expressions that are not handled by the rewrite rules.
+
+    Tables, projections and columns are translated to ``SELECT`` queries.
+    Values that were already compiled by the rules (strings) are used as
+    they are.
+    """
+
+    def translate(self, expr) -> str:
+        if isinstance(expr, tps.Column) or not isinstance(expr, tps.TableBase):
+            source = self.source(expr)
+            if source is None:
+                return self.fragment(expr)
+            return self.select(expr, source)
+
+        if isinstance(expr, tps.Table):
+            return 'SELECT * FROM {}'.format(self.table_name(expr))
+
+        columns = expr.columns
+        if isinstance(columns, str):
+            columns = [columns]
+        return 'SELECT {} FROM {}'.format(
+            ', '.join(self.identifier(column) for column in columns),
+            self.from_clause(expr.source),
+        )
+
+    def select(self, expr, source: tps.TableBase) -> str:
+        """
+        Translate a value expression to a ``SELECT`` query.
+
+        The sub-expressions repeated in the expression are computed once,
+        by inner projections: a sub-expression is selected with an alias
+        (``_cse0``, ``_cse1``, ...) by a projection over the source and the
+        outer query uses the alias. The repeated sub-expressions that use
+        other ones are computed by the next inner projection. The inner
+        projections select just the columns used by the expression.
+        """
+        memo: Dict[int, str] = {}
+        levels = self.common_subexpressions(expr, memo)
+
+        aliases: Dict[str, str] = {}
+        from_clause = self.from_clause(source)
+        if levels:
+            # the columns used, in order of appearance
+            used = list(
+                dict.fromkeys(
+                    self.identifier(node.columns)
+                    for node in postorder(expr, is_leaf=_is_column)
+                    if isinstance(node, tps.Column)
+                )
+            )
+        for level in sorted(set(levels.values())):
+            items = used + list(aliases.values())
+            level_aliases = {}
+            for key, node in self._common_nodes(expr, memo, levels, level):
+                alias = '_cse{}'.format(len(aliases) + len(level_aliases))
+                fragment = self.fragment(node, aliases, memo)
+                items.append('{} AS {}'.format(fragment, alias))
+                level_aliases[key] = alias
+            from_clause = '(SELECT {} FROM {})'.format(
+                ', '.join(items), from_clause
+            )
+            aliases.update(level_aliases)
+
+        return 'SELECT {} FROM {}'.format(
+            self.select_item(expr, aliases, memo), from_clause
+        )
+
+    def _common_nodes(self, expr, memo, levels, level):
+        seen = set()
+        for node in postorder(expr, is_leaf=_is_column):
+            key = memo.get(id(node))
+            if levels.get(key) == level and key not in seen:
+                seen.add(key)
+                yield key, node
+
+    def common_subexpressions(
+        self, expr, memo: Optional[Dict[int, str]] = None
+    ) -> Dict[str, int]:
+        """
+        Find the operations repeated in a value expression.
+
+        Structurally identical operations are the same sub-expression, even
+        when they are different objects. Operations without columns are not
+        included, since they are computed once by the database.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        memo : Dict[int, str], optional, default None
+            Fingerprints by expression ``id``, filled by this method.
+
+        Returns
+        -------
+        Dict[str, int]
+            The level of each repeated sub-expression, by fingerprint. The
+            level is the number of repeated sub-expressions nested in it.
+        """
+        memo = {} if memo is None else memo
+        fingerprint(expr, memo)
+
+        counts: Dict[str, int] = {}
+        has_column: Dict[int, bool] = {}
+        nodes = list(postorder(expr, is_leaf=_is_column))
+        for node in nodes:
+            args = _value_args(node)
+            has_column[id(node)] = isinstance(node, tps.Column) or any(
+                has_column[id(arg)] for arg in args
+            )
+            for arg in args:
+                if isinstance(arg, ops.BinaryOp) and has_column[id(arg)]:
+                    key = memo[id(arg)]
+                    counts[key] = counts.get(key, 0) + 1
+
+        repeated = {key for key, count in counts.items() if count > 1}
+        depth: Dict[int, int] = {}
+        levels: Dict[str, int] = {}
+        for node in nodes:
+            args = _value_args(node)
+            depth[id(node)] = max(
+                [depth[id(arg)] + (memo[id(arg)] in repeated) for arg in args]
+                or [0]
+            )
+            if memo[id(node)] in repeated:
+                levels[memo[id(node)]] = depth[id(node)]
+        return levels
+
+    def identifier(self, name: str) -> str:
+        """
+        Quote a table or column name, when it isn't a plain identifier.
+
+        Names with other characters than letters, digits and underscores,
+        and SQL keywords (see ``SQL_KEYWORDS``) are quoted with double
+        quotes, the other names are used as they are.
+        """
+        if _IDENTIFIER.match(name) and name.upper() not in SQL_KEYWORDS:
+            return name
+        return '"{}"'.format(name.replace('"', '""'))
+
+    def table_name(self, table: tps.Table) -> str:
+        return '.'.join(
+            self.identifier(name)
+            for name in (
+                table.database_name,
+                table.database_schema_name,
+                table.name,
+            )
+            if name
+        )
+
+    def from_clause(self, source: tps.TableBase) -> str:
+        if isinstance(source, tps.Table):
+            return self.table_name(source)
+        return '({})'.format(self.translate(source))
+
+    def source(self, expr) -> Optional[tps.TableBase]:
+        """
+        Get the source table of a value expression.
+
+        Returns
+        -------
+        TableBase, optional
+            None if the expression doesn't use any column.
+        """
+        sources = {}
+        memo: Dict[int, str] = {}
+        for node in postorder(expr, is_leaf=_is_column):
+            if isinstance(node, tps.Column):
+                key = fingerprint(node.source, memo)
+                sources.setdefault(key, node.source)
+
+        if len(sources) > 1:
+            raise NotImplementedError(
+                'Expressions from more than one table are not supported yet.'
+            )
+        return next(iter(sources.values()), None)
+
+    def select_item(
+        self,
+        expr,
+        aliases: Optional[Dict[str, str]] = None,
+        memo: Optional[Dict[int, str]] = None,
+    ) -> str:
+        result = self.fragment(expr, aliases, memo)
+        if getattr(expr, 'rename', None):
+            result = '{} AS {}'.format(result, self.identifier(expr.rename))
+        return result
+
+    def fragment(
+        self,
+        expr,
+        aliases: Optional[Dict[str, str]] = None,
+        memo: Optional[Dict[int, str]] = None,
+    ) -> str:
+        """
+        Translate a value expression to a SQL fragment.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        aliases : Dict[str, str], optional, default None
+            Column aliases of sub-expressions computed by an inner
+            projection, by fingerprint (see ``select``).
+        memo : Dict[int, str], optional, default None
+            Fingerprints by expression ``id``.
+        """
+        fragments: Dict[int, str] = {}
+        aliased = set()
+        memo = {} if memo is None else memo
+
+        for node in postorder(expr, is_leaf=_is_column):
+            if aliases and node is not expr:
+                alias = aliases.get(fingerprint(node, memo))
+                if alias is not None:
+                    fragments[id(node)] = alias
+                    aliased.add(id(node))
+                    continue
+
+            if isinstance(node, tps.Column):
+                fragments[id(node)] = self.identifier(node.columns)
+            elif isinstance(node, dtypes.DataType):
+                fragments[id(node)] = self.literal(node.value)
+            elif isinstance(node, ops.BinaryOp) and type(node) in OPS_MAP:
+                op = OPS_MAP[type(node)]
+                fragments[id(node)] = {**BIN_OPS, **LOGICAL_OPS}[op].format(
+                    *(
+                        self._operand(arg, fragments, aliased)
+                        for arg in node.args
+                    )
+                )
+            else:
+                raise NotImplementedError(
+                    'Expression ``{}`` not supported.'.format(
+                        type(node).__name__
+                    )
+                )
+
+        if isinstance(expr, metadsl.Expression):
+            return fragments[id(expr)]
+        return self.literal(expr)
+
+    def _operand(self, arg, fragments: Dict[int, str], aliased=()) -> str:
+        if isinstance(arg, ops.BinaryOp) and id(arg) not in aliased:
+            return '({})'.format(fragments[id(arg)])
+        if isinstance(arg, metadsl.Expression):
+            return fragments[id(arg)]
+        if isinstance(arg, str):
+            # already compiled by the rules
+            return '({})'.format(arg) if ' ' in arg else arg
+        return self.literal(arg)
+
+    def literal(self, value) -> str:
+        if value is None:
+            return 'NULL'
+        if isinstance(value, bool):
+            return 'TRUE' if value else 'FALSE'
+        if isinstance(value, str):
+            return "'{}'".format(value.replace("'", "''"))
+        return str(value)
 
 
 class SQLStandard(Backend):
-    # translator: BackendTranslator = TokiExampleTranslator
+    translator: BackendTranslator = SQLStandardTranslator()
+
+    def __init__(
+        self,
+        strategy: RegisterStrategy = STRATEGY,
+        cache: Optional[CompileCache] = None,
+        database: str = ':memory:',
+        arraysize: int = 1024,
+        pool: Optional[ConnectionPool] = None,
+        parameterized: bool = False,
+        template_cache: Optional[CompileCache] = None,
+        optimize: bool = False,
+        statistics_cache: Optional[StatisticsCache] = None,
+        disk_cache: Optional[DiskCompileCache] = None,
+    ):
+        """
+        Initialize the SQL standard backend.
+
+        Parameters
+        ----------
+        strategy : RegisterStrategy, default STRATEGY
+        cache : CompileCache, optional, default None
+            When given, compiled expressions are cached by their structural
+            fingerprint, the backend class, the rules ``signature`` and
+            version and ``optimize``, so it can be shared by backends.
+        database : str, default ':memory:'
+            SQLite database used by ``execute``.
+        arraysize : int, default 1024
+            Number of rows fetched at once by ``execute``.
+        pool : ConnectionPool, optional, default None
+            Pool the connections are borrowed from, it can be shared by
+            backends (see ``sqlite_pool``). By default, the backend uses
+            its own ``sqlite_pool`` (with one connection for ``:memory:``)
+            that waits ``POOL_TIMEOUT`` seconds for a connection.
+        parameterized : bool, default False
+            When True, ``execute`` runs the query template from
+            ``compile_template`` binding the literal values, so the
+            database reuses the prepared statement.
+        template_cache : CompileCache, optional, default None
+            Cache for ``compile_template``, keyed by the expression shape.
+            By default, a ``CompileCache`` with its default size is used.
+        optimize : bool, default False
+            When True, the operations between literals are folded (see
+            ``toki.optimizer.fold_constants``) before the rules are applied.
+        statistics_cache : StatisticsCache, optional, default None
+            Cache for the table statistics gathered by ``statistics``. By
+            default, a ``StatisticsCache`` without expiration is used.
+        disk_cache : DiskCompileCache, optional, default None
+            Cache shared by processes, used when an expression is not in
+            ``cache`` (or ``template_cache``). The compiled expressions
+            are keyed by their fingerprint, the backend class, the rules
+            ``signature`` and ``optimize``, so a new process compiles the
+            known expressions without the rewrite. When the cache can't be
+            used (e.g. its database is locked or its directory is
+            read-only), the expressions are compiled without it.
 
-    def __init__(self, strategy: RegisterStrategy = STRATEGY):
+        Each query borrows a connection from the pool, so the backend can
+        be used from different threads (e.g. by ``execute_async``). The
+        queries made by a thread that already borrowed a connection (e.g.
+        inside an ``execute_stream`` loop) use that connection.
+        """
         self.strategy = strategy
+        self.cache = cache
+        self.database = database
+        self.arraysize = arraysize
+        self._owns_pool = pool is None
+        self.pool = (
+            sqlite_pool(database, timeout=POOL_TIMEOUT)
+            if pool is None
+            else pool
+        )
+        self._borrowed = threading.local()
+        self.parameterized = parameterized
+        self.optimize = optimize
+        self.template_cache = (
+            CompileCache() if template_cache is None else template_cache
+        )
+        self.statistics_cache = (
+            StatisticsCache() if statistics_cache is None else statistics_cache
+        )
+        self.disk_cache = disk_cache
+        self._cache_version = strategy.version
 
     def connect(self) -> None:
-        ...
+        self.pool.open()
+
+    def close(self) -> None:
+        """Close the connections, unless the pool was given."""
+        if self._owns_pool:
+            self.pool.close()
 
     def compile(self, expr) -> str:
-        return metadsl_rewrite.execute(expr, self.strategy.get_rules())
+        return self._compile_cached(expr, self.cache)
+
+    def compile_template(self, expr) -> Tuple[str, List[Union[int, float]]]:
+        """
+        Compile an expression to a query template and its parameters.
+
+        The literal numbers are replaced by ``?N`` placeholders (see
+        ``parameterize``) and the template is cached by the expression
+        shape, so expressions that differ just in their literal values are
+        compiled once.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+
+        Returns
+        -------
+        Tuple[str, List[Union[int, float]]]
+            The template and the values for its placeholders.
+        """
+        if self.optimize:
+            # folded first, so a folded sub-tree becomes a single parameter
+            expr = fold_constants(expr)
+        template_expr, params = self.parameterize(expr)
+        return self._compile_cached(template_expr, self.template_cache), params
+
+    def parameterize(self, expr) -> Tuple[Any, List[Union[int, float]]]:
+        """
+        Replace the literal numbers of an expression by placeholders.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+
+        Returns
+        -------
+        Tuple[toki.types.Expr, List[Union[int, float]]]
+            A copy of the expression with ``IntParam`` and ``FloatParam``
+            placeholders and the values replaced, in placeholder order.
+        """
+        params: List[Union[int, float]] = []
+        replaced: Dict[int, Any] = {}
+
+        def _param(value):
+            if isinstance(value, (bool, _Param)) or not isinstance(
+                value, (int, float)
+            ):
+                return value
+            params.append(value)
+            param_type = IntParam if isinstance(value, int) else FloatParam
+            return param_type(value, len(params))
+
+        for node in postorder(expr, is_leaf=_is_column):
+            # just data types and operations take literal values
+            holds_literals = isinstance(
+                node, (dtypes.DataType, ops.OperationExpr)
+            )
+            args = list(node.args) + list(node.kwargs.values())
+            new_args = [
+                replaced.get(id(arg), _param(arg) if holds_literals else arg)
+                for arg in args
+            ]
+            if all(new is old for new, old in zip(new_args, args)):
+                continue
+
+            new_values = iter(new_args)
+            new_node = node._map(lambda _: next(new_values))
+            if getattr(node, 'rename', None):
+                new_node.rename = node.rename
+            replaced[id(node)] = new_node
+
+        return replaced.get(id(expr), expr), params
+
+    def _compile_cached(self, expr, cache: Optional[CompileCache]) -> str:
+        if cache is None and self.disk_cache is None:
+            return self._compile(expr)
+
+        version = self.strategy.version
+        if version != self._cache_version:
+            # new rules were registered, compiled values are outdated
+            for cache_ in (self.cache, self.template_cache):
+                if cache_ is not None:
+                    cache_.clear()
+            self._cache_version = version
+
+        key = fingerprint(expr)
+        # a cache can be shared by backends with different rules
+        cache_key = (
+            type(self),
+            self.strategy.signature,
+            version,
+            self.optimize,
+            key,
+        )
+        result = _MISSING if cache is None else cache.get(cache_key, _MISSING)
+        if result is _MISSING:
+            result = self._compile_persistent(expr, key)
+            if cache is not None:
+                cache.put(cache_key, result)
+        return result
+
+    def _compile_persistent(self, expr, key: str) -> str:
+        if self.disk_cache is None:
+            return self._compile(expr)
+
+        disk_key = '{}.{}:{}:{}:{}:{}'.format(
+            type(self).__module__,
+            type(self).__qualname__,
+            toki.__version__,
+            self.strategy.signature,
+            int(self.optimize),
+            key,
+        )
+        # the disk cache is optional, so its errors (e.g. a locked database
+        # or a read-only directory) are a miss or a skipped store
+        try:
+            result = self.disk_cache.get(disk_key, _MISSING)
+        except (sqlite3.Error, OSError):
+            result = _MISSING
+        if result is _MISSING:
+            result = self._compile(expr)
+            if isinstance(result, str):
+                try:
+                    self.disk_cache.put(disk_key, result)
+                except (sqlite3.Error, OSError):
+                    pass
+        return result
+
+    def _rewrite(self, expr):
+        # the rewrite engine is recursive, so long chains are rebalanced
+        expr = reassociate(collapse_projections(expr))
+        if self.optimize:
+            expr = fold_constants(expr)
+        if not self.strategy.can_rewrite(expr):
+            return expr
+        with REWRITE_LOCK:
+            return metadsl_rewrite.execute(expr, self.strategy.get_rules())
+
+    def _compile(self, expr) -> str:
+        result = self._rewrite(expr)
+        if isinstance(result, metadsl.Expression):
+            # the rewrite makes a copy of the expression without its alias
+            if getattr(expr, 'rename', None):
+                result.rename = expr.rename
+            result = self.translator.translate(result)
+        return result
+
+    def compile_many(self, exprs: Iterable) -> List[str]:
+        """
+        Compile a batch of expressions.
+
+        Each distinct operation sub-tree is rewritten once for the whole
+        batch, and its rewritten value is used in place of the sub-tree by
+        the expressions that share it.
+
+        Parameters
+        ----------
+        exprs : Iterable
+
+        Returns
+        -------
+        List[str]
+            The compiled expressions, in the same order of ``exprs``.
+        """
+        # keep the expressions alive while their ids are used as keys
+        exprs = list(exprs)
+        fingerprints: Dict[int, str] = {}
+        compiled: Dict[str, Any] = {}
+        rewritten: Dict[str, Any] = {}
+
+        results = []
+        for expr in exprs:
+            key = fingerprint(expr, fingerprints)
+            if key not in compiled:
+                compiled[key] = self._compile_shared(
+                    expr, fingerprints, rewritten
+                )
+            results.append(compiled[key])
+        return results
+
+    def _compile_shared(
+        self, expr, fingerprints: Dict[int, str], rewritten: Dict[str, Any]
+    ):
+        substitutes: Dict[int, Any] = {}
+
+        for node in postorder(expr):
+            if node is expr:
+                break
+            if not isinstance(node, ops.OperationExpr):
+                continue
+
+            key = fingerprints[id(node)]
+            if key not in rewritten:
+                rewritten[key] = self._rewrite(
+                    self._substitute(node, substitutes)
+                )
+            # the rewrite is made from the leaves to the root, so a rewritten
+            # sub-tree can be replaced by its result before the parent.
+            if not isinstance(rewritten[key], metadsl.Expression):
+                substitutes[id(node)] = rewritten[key]
+
+        return self.compile(self._substitute(expr, substitutes))
+
+    def _substitute(self, node, substitutes: Dict[int, Any]):
+        if any(id(arg) in substitutes for arg in node.args):
+            node = node._map(lambda arg: substitutes.get(id(arg), arg))
+        return node
+
+    def _query(self, expr) -> Tuple[str, List[Union[int, float]]]:
+        if self.parameterized:
+            query, params = self.compile_template(expr)
+        else:
+            query, params = self.compile(expr), []
+        if not query.lstrip().upper().startswith('SELECT'):
+            query = 'SELECT {}'.format(query)
+        return query, params
+
+    @contextlib.contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a connection, reusing the one held by the current thread.
+
+        A suspended ``execute_stream`` keeps its connection, so without the
+        reuse a query made inside the stream loop would wait for it.
+        """
+        # the generators can be resumed by other threads, so the state of
+        # the thread that borrowed the connection is kept
+        state = getattr(self._borrowed, 'state', None)
+        if state is None or not state['users']:
+            try:
+                connection = self.pool.acquire()
+            except TimeoutError as error:
+                raise TimeoutError(
+                    '{} The connections are held by the running queries '
+                    'and by the streams from ``execute_stream`` that are '
+                    'not exhausted or closed.'.format(error)
+                ) from error
+            state = self._borrowed.state = {
+                'connection': connection,
+                'users': 0,
+            }
+
+        state['users'] += 1
+        try:
+            yield state['connection']
+        finally:
+            state['users'] -= 1
+            if not state['users']:
+                self.pool.release(state['connection'])
+
+    @contextlib.contextmanager
+    def _cursor(self, expr) -> Iterator[sqlite3.Cursor]:
+        """Execute the expression query, closing the cursor at the end."""
+        query, params = self._query(expr)
+
+        with self._connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                yield cursor
+            finally:
+                cursor.close()
+
+    def statistics(
+        self, table: tps.Table, refresh: bool = False
+    ) -> TableStatistics:
+        """
+        Get the statistics of a table.
+
+        The statistics are gathered by aggregate queries over the table
+        the first time and then cached in ``statistics_cache``.
+
+        Parameters
+        ----------
+        table : toki.types.Table
+        refresh : bool, default False
+            When True, the statistics are gathered again.
+
+        Returns
+        -------
+        TableStatistics
+        """
+        name = self.translator.table_name(table)
+        statistics = None if refresh else self.statistics_cache.get(name)
+        if statistics is None:
+            statistics = self._gather_statistics(
+                name, list(table.schema.structure)
+            )
+            self.statistics_cache.set(name, statistics)
+        return statistics
+
+    def _gather_statistics(
+        self, name: str, columns: List[str]
+    ) -> TableStatistics:
+        # each query scans the table once, for as many columns as its result
+        # can hold (4 aggregates for each column, besides the row count)
+        batch_size = (MAX_RESULT_COLUMNS - 1) // 4
+        row_count = 0
+        statistics = {}
+        with self._connection() as connection:
+            for start in range(0, max(len(columns), 1), batch_size):
+                batch = columns[start : start + batch_size]
+                items = ['COUNT(*)'] + [
+                    _STATISTICS_ITEMS.format(self.translator.identifier(c))
+                    for c in batch
+                ]
+                query = 'SELECT {} FROM {}'.format(', '.join(items), name)
+                row = connection.execute(query).fetchone()
+
+                row_count = row[0]
+                for i, column in enumerate(batch):
+                    values = row[1 + 4 * i : 5 + 4 * i]
+                    min_value, max_value, count, distinct = values
+                    statistics[column] = ColumnStatistics(
+                        min_value, max_value, row_count - count, distinct
+                    )
+        return TableStatistics(row_count, statistics)
+
+    def _dataframe(self, names: List[str], columns: List[list]):
+        # imported here, so compiling doesn't pay the pandas import
+        import pandas as pd
+
+        result = pd.DataFrame(
+            dict(enumerate(columns)), columns=range(len(names))
+        )
+        result.columns = names
+        return result
 
     def execute(self, expr) -> pd.DataFrame:
-        request_str = self.compile(expr)
-        print(request_str)
-        return pd.DataFrame()
+        """
+        Execute an expression, fetching the result in chunks.
+
+        The rows are fetched ``arraysize`` at a time and moved to a buffer
+        for each column, so the DataFrame is created just once from the
+        columns, without a Python object for each row.
+
+        The buffers are lists, not preallocated arrays: SQLite doesn't
+        report the number of rows of a query (``cursor.rowcount`` is -1
+        for ``SELECT``), so it would cost a second ``COUNT(*)`` scan, and
+        the chunks are appended in bulk, with the list growth amortised.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+
+        Returns
+        -------
+        pd.DataFrame
+        """
+        with self._cursor(expr) as cursor:
+            names = [column[0] for column in cursor.description]
+            buffers: List[list] = [[] for _ in names]
+            while True:
+                rows = cursor.fetchmany(self.arraysize)
+                if not rows:
+                    break
+                for buffer, values in zip(buffers, zip(*rows)):
+                    buffer.extend(values)
+        return self._dataframe(names, buffers)
+
+    def execute_stream(
+        self, expr, chunksize: Optional[int] = None
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Execute an expression, yielding the result in chunks.
+
+        Just one chunk is held in memory at a time.
+
+        Parameters
+        ----------
+        expr : toki.types.Expr
+        chunksize : int, optional, default None
+            Number of rows for each chunk, ``arraysize`` by default.
+
+        Returns
+        -------
+        Iterator[pd.DataFrame]
+        """
+        with self._cursor(expr) as cursor:
+            names = [column[0] for column in cursor.description]
+            while True:
+                rows = cursor.fetchmany(chunksize or self.arraysize)
+                if not rows:
+                    break
+                yield self._dataframe(names, [list(v) for v in zip(*rows)])
@@ -0,0 +1,113 @@
+"""Cost model for the choices between equivalent plans."""
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from toki import operations as ops
+from toki import types as tps
+from toki.statistics import TableStatistics
+from toki.types import postorder
+
+StatisticsGetter = Callable[[tps.Table], Optional[TableStatistics]]
+
+
+@dataclass(frozen=True)
+class PlanEstimate:
+    """
+    Size of the work done to evaluate an expression.
+
+    Parameters
+    ----------
+    rows : int
+        Number of rows of the source table.
+    operations : int
+        Number of operations computed for each row.
+    columns : int
+        Number of source columns read.
+    result_columns : int, default 1
+        Number of columns of the result.
+    """
+
+    rows: int
+    operations: int
+    columns: int
+    result_columns: int = 1
+
+
+def estimate(expr: tps.Expr, statistics: StatisticsGetter) -> PlanEstimate:
+    """
+    Estimate the work to evaluate an expression from the table statistics.
+
+    Parameters
+    ----------
+    expr : toki.types.Expr
+    statistics : Callable[[toki.types.Table], Optional[TableStatistics]]
+        Get the statistics of a table, e.g. the backend ``statistics``
+        method. The tables without statistics are assumed to have one row.
+
+    Returns
+    -------
+    PlanEstimate
+    """
+    rows = 1
+    operations = 0
+    columns = set()
+    for node in postorder(expr):
+        if isinstance(node, tps.Table):
+            table_statistics = statistics(node)
+            if table_statistics is not None:
+                rows = max(rows, table_statistics.row_count)
+        elif isinstance(node, tps.Column):
+            columns.add(node.columns)
+        elif isinstance(node, ops.OperationExpr):
+            operations += 1
+
+    result_columns = 1
+    if isinstance(expr, tps.TableBase):
+        result_columns = len(expr.schema.structure)
+        columns.update(expr.schema.structure)
+    return PlanEstimate(rows, operations, len(columns), result_columns)
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """
+    Cost of the plans, in arbitrary units.
+
+    Parameters
+    ----------
+    operation_cost : float, default 1.0
+        Cost of an operation over a row.
+    partition_cost : float, default 1e6
+        Fixed cost of each partition evaluated by another process (e.g.
+        dispatching it and copying its result).
+    """
+
+    operation_cost: float = 1.0
+    partition_cost: float = 1e6
+
+    def partitions(self, plan: PlanEstimate, workers: int) -> int:
+        """
+        Get the number of partitions that minimizes the evaluation cost.
+
+        The operations are split between the partitions, but each one adds
+        ``partition_cost``, so small expressions are not parallelised.
+
+        Parameters
+        ----------
+        plan : PlanEstimate
+        workers : int
+            Maximum number of partitions evaluated at once.
+
+        Returns
+        -------
+        int
+            1 when the expression should be evaluated sequentially.
+        """
+        work = plan.rows * max(plan.operations, 1) * self.operation_cost
+        # the cost ``work / n + partition_cost * n`` is minimal at
+        # ``sqrt(work / partition_cost)``
+        best = int((work / self.partition_cost) ** 0.5) if work else 0
+        best = max(1, min(best, workers, plan.rows))
+        if best > 1 and work / best + self.partition_cost * best >= work:
+            return 1
+        return best
@@ -3,10 +3,14 @@ from __future__ import annotations
 
 from typing import Union
 
-import metadsl
-
 from toki import types as tps
 
+# names of the numeric data types (see the constructors below)
+int_types = ('int8', 'int16', 'int32', 'int64')
+float_types = ('float16', 'float32', 'float64')
+
+number_types = int_types + float_types
+
 # datatype classes
 
 
@@ -30,90 +34,93 @@ class Number(DataType):
     def expr(value: Union[int, float]) -> Number:
         """Create a number expression with the given value."""
 
-    @metadsl.expression
+    @tps.expression
     def __add__(self, other: Union[Number, int, float]) -> Number:
         """Define ``add`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __div__(self, other: Union[Number, int, float]) -> Number:
         """Define ``div`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __divmod__(self, other: Union[Number, int, float]) -> Number:
         """Define ``divmod`` expression."""
 
     # note: maybe other should be Union[Number, int, float]
-    @metadsl.expression
+    @tps.expression
     def __eq__(self, other: Number) -> Number:
         """Define ``eq`` expression."""
 
-    @metadsl.expression
+    # defining ``__eq__`` drops the inherited ``__hash__``
+    __hash__ = tps.Expr.__hash__
+
+    @tps.expression
     def __floordiv__(self, other: Union[Number, int, float]) -> Number:
         """Define ``floordiv`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __ge__(  # type: ignore
         self, other: Union[Number, int, float]
     ) -> Boolean:
         """Define ``ge`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __gt__(  # type: ignore
         self, other: Union[Number, int, float]
     ) -> Boolean:
         """Define ``gt`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __le__(self, other: Union[Number, int, float]) -> Boolean:
         """Define ``le`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __lt__(self, other: Union[Number, int, float]) -> Boolean:
         """Define ``lt`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __mod__(self, other: Union[Number, int, float]) -> Number:
         """Define ``mod`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __mul__(self, other: Union[Number, int, float]) -> Number:
         """Define ``mul`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __pow__(self, other: Union[Number, int, float]) -> Number:
         """Define ``pow`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __radd__(self, other: Union[Number, int, float]) -> Number:
         """Define ``radd`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __rdivmod__(self, other: Union[Number, int, float]) -> Number:
         """Define ``rdivmod`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __rmod__(self, other: Union[Number, int, float]) -> Number:
         """Define ``rmod`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __rmul__(self, other: Union[Number, int, float]) -> Number:
         """Define ``rmul`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __rpow__(self, other: Union[Number, int, float]) -> Number:
         """Define ``rpow`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __rsub__(  # type: ignore
         self, other: Union[Number, int, float]
     ) -> Number:
         """Define ``rsub`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __sub__(self, other: Union[Number, int, float]) -> Number:
         """Define ``sub`` expression."""
 
-    @metadsl.expression
+    @tps.expression
     def __truediv__(self, other: Union[Number, int, float]) -> Number:
         """Define ``truediv`` expression."""
 
@@ -161,7 +168,8 @@ class Float64(Floating):
 # datatype function
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def int8(x: int) -> Int8:
     """
     Define int8 expression.
@@ -176,7 +184,8 @@ def int8(x: int) -> Int8:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def int16(x: int) -> Int16:
     """
     Define int16 expression.
@@ -191,7 +200,8 @@ def int16(x: int) -> Int16:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def int32(x: int) -> Int32:
     """
     Define int32 expression.
@@ -206,7 +216,8 @@ def int32(x: int) -> Int32:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def int64(x: int) -> Int64:
     """
     Define int64 expression.
@@ -221,7 +232,8 @@ def int64(x: int) -> Int64:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def float16(x: Union[int, float]) -> Float16:
     """
     Define float16 expression.
@@ -236,7 +248,8 @@ def float16(x: Union[int, float]) -> Float16:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def float32(x: Union[int, float]) -> Float32:
     """
     Define float32 expression.
@@ -251,7 +264,8 @@ def float32(x: Union[int, float]) -> Float32:
     """
 
 
-@metadsl.expression
+@tps.interned
+@tps.expression
 def float64(x: Union[int, float]) -> Float64:
     """
     Define float64 expression.
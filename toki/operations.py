@@ -65,7 +65,7 @@ class BinaryOp(OperationExpr):
         return _expr(cls, left, right)
 
 
-class NumericBinaryOp(BinaryOp):
+class NumericBinaryOp(BinaryOp, tps.NumericValue):
     """Base numeric binary operation."""
 
     result_type: Type = tps.NumericValue
@@ -99,7 +99,7 @@ class Modulus(NumericBinaryOp):
     """Division operation."""
 
 
-class ComparisonOp(BinaryOp):
+class ComparisonOp(BinaryOp, tps.BooleanValue):
     """Comparison base operation"""
 
     result_type: Type = tps.BooleanValue
@@ -133,7 +133,7 @@ class IdenticalTo(ComparisonOp):
     """IdenticalTo operation"""
 
 
-class LogicalBinaryOp(BinaryOp):
+class LogicalBinaryOp(BinaryOp, tps.BooleanValue):
     """LogicalBinary base operation."""
 
     result_type: Type = tps.BooleanValue
@@ -0,0 +1,309 @@
+"""Optimization rewrite passes, applied before the backend translation."""
+import functools
+import operator
+from typing import Any, Callable, Dict, List, Union
+
+import metadsl
+import metadsl_rewrite
+import numpy as np
+
+from toki import datatypes as dtypes
+from toki import operations as ops
+from toki import types as tps
+from toki.datatypes import int_types, number_types
+from toki.rules import REWRITE_LOCK, RegisterStrategy
+from toki.types import postorder
+
+FOLD_STRATEGY = RegisterStrategy()
+
+# operations with the same result in Python and in the databases for the
+# values accepted by ``_fold_value``. ``truediv`` is not folded because
+# some databases (e.g. SQLite) divide integers as ``floordiv``.
+FOLD_OPS = {
+    'add': operator.add,
+    'sub': operator.sub,
+    'mul': operator.mul,
+    'pow': operator.pow,
+    'floordiv': operator.floordiv,
+    'mod': operator.mod,
+}
+
+FOLD_OP_CLASSES = {
+    'add': ops.Add,
+    'sub': ops.Subtract,
+    'mul': ops.Multiply,
+    'pow': ops.Power,
+    'floordiv': ops.FloorDivide,
+    'mod': ops.Modulus,
+}
+
+# associative operations, with the operator that creates them
+ASSOCIATIVE_OPS = {
+    ops.Add: operator.add,
+    ops.Multiply: operator.mul,
+    ops.And: operator.and_,
+    ops.Or: operator.or_,
+}
+
+
+def _fold_value(
+    op: str, result_type: str, x: Union[int, float], y: Union[int, float]
+) -> Union[int, float]:
+    """
+    Compute the folded value of a binary operation.
+
+    Raises
+    ------
+    metadsl_rewrite.NoMatch
+        When the operation shouldn't be folded: the values aren't plain
+        numbers (e.g. bind parameters), the result overflows the result
+        type, or the result could be different in the database.
+    """
+    if type(x) not in (int, float) or type(y) not in (int, float):
+        raise metadsl_rewrite.NoMatch
+    if op in ('floordiv', 'mod') and (x < 0 or y <= 0):
+        # negative values are rounded differently by the databases
+        raise metadsl_rewrite.NoMatch
+
+    if result_type in int_types:
+        if op == 'pow' and (y < 0 or (abs(x) > 1 and y > 64)):
+            # a float result, or an overflow computed slowly
+            raise metadsl_rewrite.NoMatch
+        value = FOLD_OPS[op](x, y)
+        info = np.iinfo(result_type)
+        if not info.min <= value <= info.max:
+            raise metadsl_rewrite.NoMatch
+        return value
+
+    np_type = getattr(np, result_type)
+    with np.errstate(all='ignore'):
+        value = FOLD_OPS[op](np_type(x), np_type(y))
+    if not np.isfinite(value):
+        raise metadsl_rewrite.NoMatch
+    return value.item()
+
+
+def fold_builder(op: str, tp_x: str, tp_y: str, owner: type) -> Callable:
+    """
+    Build a rule that folds ``op`` between two literals.
+
+    The operation methods are matched by the class they were called from,
+    so ``owner`` should be ``Number`` for operations created by a literal
+    and ``NumericValue`` for operations created by another operation
+    (e.g. the outer operation of ``int32(3) * int32(4) + int8(1)``).
+    """
+    dunder_op = '__{}__'.format(op)
+    result_type = np.result_type(tp_x, tp_y).name
+
+    def __fn(x, y):
+        _dtype_x = getattr(dtypes, tp_x)
+        _dtype_y = getattr(dtypes, tp_y)
+
+        return (
+            getattr(owner, dunder_op)(_dtype_x(x), _dtype_y(y)),
+            lambda: getattr(dtypes, result_type)(
+                _fold_value(op, result_type, x, y)
+            ),
+        )
+
+    # float literals can be created from an int, e.g. ``float64(1)``
+    if tp_x in int_types:
+        if tp_y in int_types:
+
+            def _fn(x: int, y: int) -> dtypes.Number:
+                return __fn(x, y)
+
+        else:
+
+            def _fn(  # type: ignore
+                x: int, y: Union[int, float]
+            ) -> dtypes.Number:
+                return __fn(x, y)
+
+    else:
+        if tp_y in int_types:
+
+            def _fn(  # type: ignore
+                x: Union[int, float], y: int
+            ) -> dtypes.Number:
+                return __fn(x, y)
+
+        else:
+
+            def _fn(  # type: ignore
+                x: Union[int, float], y: Union[int, float]
+            ) -> dtypes.Number:
+                return __fn(x, y)
+
+    _fn.__name__ = 'fold_{}_{}_{}'.format(op, tp_x, tp_y)
+    return _fn
+
+
+def fold_rule(op: str, tp_x: str, tp_y: str, owner: type) -> Callable:
+    return metadsl_rewrite.rule(fold_builder(op, tp_x, tp_y, owner))
+
+
+# the rules are built by the first fold that needs them
+for tp_x in number_types:
+    for tp_y in number_types:
+        for op in FOLD_OPS:
+            for owner in (dtypes.Number, tps.NumericValue):
+                FOLD_STRATEGY.register_lazy(
+                    functools.partial(fold_rule, op, tp_x, tp_y, owner),
+                    key=(
+                        FOLD_OP_CLASSES[op],
+                        getattr(dtypes, tp_x.capitalize()),
+                        getattr(dtypes, tp_y.capitalize()),
+                    ),
+                    name='{}.fold_rule'.format(__name__),
+                )
+
+
+def fold_constants(expr: Any) -> Any:
+    """
+    Collapse the operations between literals into a single literal.
+
+    The operations are folded from the leaves, so a sub-tree of literals
+    becomes one literal, e.g. ``int32(3) * int32(4) + t['x']`` becomes
+    ``int32(12) + t['x']``. The result type follows the NumPy promotion
+    rules, and an operation whose result overflows it is kept.
+
+    Parameters
+    ----------
+    expr : toki.types.Expr
+
+    Returns
+    -------
+    toki.types.Expr
+    """
+    if not isinstance(expr, metadsl.Expression) or (
+        not FOLD_STRATEGY.can_rewrite(expr)
+    ):
+        return expr
+    with REWRITE_LOCK:
+        result = metadsl_rewrite.execute(expr, FOLD_STRATEGY.get_rules())
+    # the rewrite makes a copy of the expression without its alias
+    if getattr(expr, 'rename', None) and isinstance(
+        result, metadsl.Expression
+    ):
+        result.rename = expr.rename
+    return result
+
+
+def collapse_projections(expr: Any) -> Any:
+    """
+    Collapse the nested projections of an expression.
+
+    A projection (or column) over other projections is replaced by the
+    same projection over the base table, e.g. ``t[['a', 'b']][['a']]['a']``
+    becomes ``t['a']``. The projected columns are always a subset of the
+    source columns, so the result is the same, but the backends read just
+    the columns that are used.
+
+    Parameters
+    ----------
+    expr : toki.types.Expr
+
+    Returns
+    -------
+    toki.types.Expr
+    """
+    if not isinstance(expr, metadsl.Expression):
+        return expr
+
+    replaced: Dict[int, Any] = {}
+    for node in postorder(expr):
+        new_node = node
+        if any(id(arg) in replaced for arg in node.args):
+            new_node = node._map(lambda arg: replaced.get(id(arg), arg))
+
+        if isinstance(new_node, tps.Projection) and isinstance(
+            new_node.source, tps.Projection
+        ):
+            source = new_node.source
+            while isinstance(source, tps.Projection):
+                source = source.source
+            columns = new_node.columns
+            # built as ``TableBase.__getitem__`` does
+            new_node = source[
+                columns if isinstance(columns, str) else list(columns)
+            ]
+
+        if new_node is not node:
+            if getattr(node, 'rename', None):
+                new_node.rename = node.rename
+            replaced[id(node)] = new_node
+
+    return replaced.get(id(expr), expr)
+
+
+def _chain_operands(root: Any, replaced: Dict[int, Any]) -> List[Any]:
+    """Get the operands of a chain of ``root`` operations, in order."""
+    operands = []
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if type(node) is type(root):
+            stack.extend(reversed(node.args))
+        else:
+            operands.append(replaced.get(id(node), node))
+    return operands
+
+
+def reassociate(expr: Any, min_operands: int = 32) -> Any:
+    """
+    Rebalance the long chains of an associative operation.
+
+    A chain like ``((a + b) + c) + d``, e.g. built by ``sum`` over many
+    columns, becomes ``(a + b) + (c + d)``, so its depth is logarithmic
+    instead of linear. The operands order is kept. The operations are
+    ``Add``, ``Multiply``, ``And`` and ``Or`` (see ``ASSOCIATIVE_OPS``).
+
+    Parameters
+    ----------
+    expr : toki.types.Expr
+    min_operands : int, default 32
+        Shorter chains are kept as they are.
+
+    Returns
+    -------
+    toki.types.Expr
+    """
+    if not isinstance(expr, metadsl.Expression):
+        return expr
+
+    nodes = postorder(expr)
+    # the chains are rebalanced from their top operation
+    roots = {id(expr)}
+    for node in nodes:
+        for arg in node.args:
+            if type(arg) in ASSOCIATIVE_OPS and type(arg) is not type(node):
+                roots.add(id(arg))
+
+    replaced: Dict[int, Any] = {}
+    for node in nodes:
+        new_node = node
+        if id(node) in roots and type(node) in ASSOCIATIVE_OPS:
+            operands = _chain_operands(node, replaced)
+            # python values could be the left operand of the new operations
+            if len(operands) >= min_operands and all(
+                isinstance(operand, metadsl.Expression) for operand in operands
+            ):
+                combine = ASSOCIATIVE_OPS[type(node)]
+                while len(operands) > 1:
+                    pairs = [
+                        combine(x, y)
+                        for x, y in zip(operands[::2], operands[1::2])
+                    ]
+                    operands = pairs + operands[len(pairs) * 2 :]
+                new_node = operands[0]
+
+        if new_node is node and any(id(arg) in replaced for arg in node.args):
+            new_node = node._map(lambda arg: replaced.get(id(arg), arg))
+
+        if new_node is not node:
+            if getattr(node, 'rename', None):
+                new_node.rename = node.rename
+            replaced[id(node)] = new_node
+
+    return replaced.get(id(expr), expr)
@@ -1,17 +1,363 @@
 """Strategy rules mechanism module."""
 from __future__ import annotations
 
-from typing import Callable
+import hashlib
+import heapq
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 import metadsl
 import metadsl_rewrite
 from metadsl_core.strategies import register_core
 
+from toki.types import expression, interned_method, postorder
+
+# metadsl keeps the type variables in scope in a global counter, so rewrites
+# from different threads should not run at the same time.
+REWRITE_LOCK = threading.RLock()
+
+
+def dispatch_key(expr: object) -> Optional[Tuple[type, ...]]:
+    """
+    Get the dispatch key for an expression.
+
+    The key is composed by the expression type followed by the type of
+    each of its arguments, e.g. ``(Add, Int8, Int16)``.
+
+    Parameters
+    ----------
+    expr : object
+
+    Returns
+    -------
+    Optional[Tuple[type, ...]]
+        None if the given object is not an expression.
+    """
+    if not isinstance(expr, metadsl.Expression):
+        return None
+    return (type(expr),) + tuple(type(arg) for arg in expr.args)
+
+
+class LazyRule(metadsl_rewrite.Strategy):
+    """
+    Rule built the first time it is tried.
+
+    Building a rule creates its template expression, which is slow for
+    modules that register hundreds of rules, so the registration just
+    records the ``factory`` and the dispatch ``key`` of the rule.
+
+    Parameters
+    ----------
+    factory : Callable[[], Callable]
+        Function that builds the rule, e.g. with ``metadsl_rewrite.rule``.
+    key : Tuple[type, ...], optional, default None
+        Dispatch key of the rule template (see ``dispatch_key``). It should
+        be the same as the key of the built rule. When None, the rule is
+        tried for every expression, so it is built by the first rewrite.
+    name : str, optional, default None
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Callable],
+        key: Optional[Tuple[type, ...]] = None,
+        name: Optional[str] = None,
+    ):
+        self.factory = factory
+        self.key = key
+        self.name = name or getattr(factory, '__qualname__', repr(factory))
+        self._rule: Optional[Callable] = None
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def built(self) -> bool:
+        return self._rule is not None
+
+    @property
+    def rule(self) -> Callable:
+        """Get the rule, building it if needed."""
+        if self._rule is None:
+            # metadsl creates the templates in a global type variable scope
+            with REWRITE_LOCK:
+                if self._rule is None:
+                    self._rule = self.factory()
+        return self._rule
+
+    def __call__(
+        self, ref: metadsl.ExpressionReference
+    ) -> Iterable[metadsl_rewrite.Result]:
+        return self.rule(ref)
+
+    def optimize(self, executor, strategy):
+        self.rule.optimize(executor, strategy)
+
+
+def _rule_key(strategy: Callable) -> Optional[Tuple[type, ...]]:
+    """Get the dispatch key for a rule, None if it can't be indexed."""
+    if isinstance(strategy, LazyRule):
+        return strategy.key
+    results = getattr(strategy, 'results', None)
+    if not isinstance(strategy, metadsl_rewrite.rules.Rule) or (
+        len(results) != 1
+    ):
+        return None
+
+    template = results[0][0]
+    if not isinstance(template, metadsl.Expression) or template.kwargs:
+        return None
+
+    # a template argument that is not an expression (a wildcard or a
+    # literal value) could match an argument from a different type.
+    for node in [template] + list(template.args):
+        if not isinstance(node, metadsl.Expression) or hasattr(
+            node, '__orig_class__'
+        ):
+            return None
+    return dispatch_key(template)
+
+
+class StrategyDispatch(metadsl_rewrite.Strategy):
+    """
+    Strategy that dispatches an expression just to the candidate rules.
+
+    Rules are indexed by the dispatch key of their template, so instead of
+    trying all the rules in sequence, just the rules with the same key as
+    the expression (and the rules that couldn't be indexed) are tried. The
+    registration order is kept, so the result is the same as using
+    ``metadsl_rewrite.StrategySequence``.
+    """
+
+    def __init__(self, *strategies: Callable):
+        self.strategies = strategies
+        self.index: Dict[tuple, List[Tuple[int, Callable]]] = defaultdict(list)
+        self.fallback: List[Tuple[int, Callable]] = []
+
+        for i, strategy in enumerate(strategies):
+            key = _rule_key(strategy)
+            if key is None:
+                self.fallback.append((i, strategy))
+            else:
+                self.index[key].append((i, strategy))
+
+    def candidates(self, expr: object) -> Iterable[Tuple[int, Callable]]:
+        """
+        Get the candidate rules for the given expression.
+
+        Parameters
+        ----------
+        expr : object
+
+        Returns
+        -------
+        Iterable[Tuple[int, Callable]]
+            Pairs of registration position and rule.
+        """
+        indexed = self.index.get(dispatch_key(expr), [])  # type: ignore
+        if not self.fallback:
+            return indexed
+        if not indexed:
+            return self.fallback
+        return heapq.merge(indexed, self.fallback, key=lambda v: v[0])
+
+    def __call__(
+        self, ref: metadsl.ExpressionReference
+    ) -> Iterable[metadsl_rewrite.Result]:
+        for _, strategy in self.candidates(ref.expression):
+            for replacement in strategy(ref):
+                yield replacement
+                return
+
+    def optimize(self, executor, strategy):
+        for strategy_ in self.strategies:
+            strategy_.optimize(executor, strategy)
+
+
+def rule_name(strategy: Callable) -> str:
+    """
+    Get a readable name for a rule, e.g. ``module.fn[Add,Int8,Int16]``.
+
+    Rules created by the same function are told apart by the types of
+    their template (see ``dispatch_key``).
+
+    Parameters
+    ----------
+    strategy : Callable
+
+    Returns
+    -------
+    str
+    """
+    key = _rule_key(strategy)
+    if key is None:
+        return str(strategy)
+    return '{}[{}]'.format(strategy, ','.join(tp.__name__ for tp in key))
+
+
+class RuleProfile:
+    """
+    Counters recorded by the rules of a profiled ``RegisterStrategy``.
+
+    For each rule, the number of times it was tried (``attempts``), the
+    number of times it matched (``matches``) and the cumulative time
+    spent trying it (``time``, in seconds). ``iterations`` is the number
+    of passes of the fixpoint loop that applies the rules until none of
+    them matches.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.reset()
+
+    def reset(self):
+        """Set all the counters to zero."""
+        self.iterations = 0
+        self.attempts: Dict[int, int] = defaultdict(int)
+        self.matches: Dict[int, int] = defaultdict(int)
+        self.time: Dict[int, float] = defaultdict(float)
+
+    def record(self, position: int, matched: bool, elapsed: float):
+        """
+        Record an attempt of the rule at the given registration position.
+
+        Parameters
+        ----------
+        position : int
+        matched : bool
+        elapsed : float
+            Seconds spent trying the rule.
+        """
+        self.attempts[position] += 1
+        self.matches[position] += matched
+        self.time[position] += elapsed
+
+    def to_dict(self) -> dict:
+        """
+        Export the counters.
+
+        Returns
+        -------
+        dict
+            ``iterations`` and ``rules``, a list with the ``rule`` name,
+            ``position``, ``attempts``, ``matches`` and ``time`` of the
+            rules tried, the slowest first.
+        """
+        rules = [
+            {
+                'rule': self.names[position],
+                'position': position,
+                'attempts': self.attempts[position],
+                'matches': self.matches[position],
+                'time': self.time[position],
+            }
+            for position in self.attempts
+        ]
+        rules.sort(key=lambda rule: (-rule['time'], rule['position']))
+        return {'iterations': self.iterations, 'rules': rules}
+
+    def to_folded(self, root: str = 'rewrite') -> str:
+        """
+        Export the rules time in the folded stacks format.
+
+        Each line is ``<root>;<rule> <microseconds>``, the format read by
+        flame graph tools (e.g. ``flamegraph.pl`` or speedscope).
+
+        Parameters
+        ----------
+        root : str, default 'rewrite'
+            Name of the frame the rules are nested in.
+
+        Returns
+        -------
+        str
+        """
+        return ''.join(
+            '{};{} {}\n'.format(
+                root, rule['rule'], int(round(rule['time'] * 1e6))
+            )
+            for rule in self.to_dict()['rules']
+        )
+
+
+class ProfiledRule(metadsl_rewrite.Strategy):
+    """Rule wrapper that records its attempts in a ``RuleProfile``."""
+
+    def __init__(self, rule: Callable, profile: RuleProfile, position: int):
+        self.rule = rule
+        self.profile = profile
+        self.position = position
+
+    def __call__(
+        self, ref: metadsl.ExpressionReference
+    ) -> Iterable[metadsl_rewrite.Result]:
+        # the replacement is computed before yielding it, so the time the
+        # caller spends using it is not counted
+        start = time.perf_counter()
+        replacement = next(iter(self.rule(ref)), None)
+        self.profile.record(
+            self.position,
+            replacement is not None,
+            time.perf_counter() - start,
+        )
+        if replacement is not None:
+            yield replacement
+
+    def optimize(self, executor, strategy):
+        self.rule.optimize(executor, strategy)
+
+
+class _ProfiledIteration(metadsl_rewrite.Strategy):
+    """Count the passes of the fixpoint loop over the wrapped strategy."""
+
+    def __init__(self, strategy: Callable, profile: RuleProfile):
+        self.strategy = strategy
+        self.profile = profile
+
+    def __call__(
+        self, ref: metadsl.ExpressionReference
+    ) -> Iterable[metadsl_rewrite.Result]:
+        self.profile.iterations += 1
+        return self.strategy(ref)
+
+    def optimize(self, executor, strategy):
+        self.strategy.optimize(executor, strategy)
+
 
 class RegisterStrategy:
-    """Registrer Strategy class for metadsl strategy."""
+    """
+    Registrer Strategy class for metadsl strategy.
+
+    The rules strategy is built once and reused by every ``get_rules`` call
+    until ``register`` changes the registered rules. Each change increments
+    ``version``, so it can be used to invalidate data derived from the rules.
+
+    By default, the rules are dispatched by their types (see
+    ``StrategyDispatch``), ``indexed=False`` tries them in sequence.
+
+    The rules registered by ``register_lazy`` are built the first time
+    they are tried, so a rewrite builds just the rules it needs.
+
+    With ``profile=True`` (or after ``set_profiling(True)``) each rule
+    records its attempts, matches and time in ``profile`` (see
+    ``RuleProfile``). Profiling makes the rewrites slower, so it is
+    disabled by default.
+    """
 
-    _inner_strategy: list = []
+    def __init__(self, indexed: bool = True, profile: bool = False):
+        self.indexed = indexed
+        self._inner_strategy: List[Callable] = []
+        self._rules: Optional[metadsl_rewrite.StrategyRepeat] = None
+        self._dispatch: Optional[StrategyDispatch] = None
+        self.profile: Optional[RuleProfile] = (
+            RuleProfile() if profile else None
+        )
+        self.version: int = 0
+        self._signature: Optional[Tuple[int, str]] = None
+        self.rebuild_count: int = 0
+        self.rebuild_time: float = 0.0
 
     def register(self, fn: Callable):
         """
@@ -22,6 +368,80 @@ class RegisterStrategy:
         fn : Callable
         """
         self._inner_strategy.append(fn)
+        self._rules = None
+        self.version += 1
+
+    def register_lazy(
+        self,
+        factory: Callable[[], Callable],
+        key: Optional[Tuple[type, ...]] = None,
+        name: Optional[str] = None,
+    ):
+        """
+        Register a rule that is built the first time it is tried.
+
+        Parameters
+        ----------
+        factory : Callable[[], Callable]
+        key : Tuple[type, ...], optional, default None
+        name : str, optional, default None
+
+        See Also
+        --------
+        LazyRule
+        """
+        self.register(LazyRule(factory, key, name))
+
+    def __iter__(self):
+        return iter(self._inner_strategy)
+
+    def __len__(self) -> int:
+        return len(self._inner_strategy)
+
+    def set_profiling(self, enabled: bool):
+        """
+        Enable or disable the rules profiling.
+
+        Enabling it starts a new ``profile``. The registered rules are not
+        changed, so ``version`` is kept.
+
+        Parameters
+        ----------
+        enabled : bool
+        """
+        self.profile = RuleProfile() if enabled else None
+        self._rules = None
+
+    def _build_rules(self) -> metadsl_rewrite.StrategyRepeat:
+        inner_strategy = (
+            StrategyDispatch(*self._inner_strategy)
+            if self.indexed
+            else metadsl_rewrite.StrategySequence(*self._inner_strategy)
+        )
+        self._dispatch = inner_strategy if self.indexed else None
+        fold = metadsl_rewrite.StrategyFold(inner_strategy)
+
+        profile = self.profile
+        if profile is not None:
+            profile.names = [rule_name(rule) for rule in self._inner_strategy]
+            # the rules are wrapped after the dispatch index is built, since
+            # the index is built from the rule templates
+            if self.indexed:
+                for rules in list(inner_strategy.index.values()) + [
+                    inner_strategy.fallback
+                ]:
+                    rules[:] = [
+                        (i, ProfiledRule(rule, profile, i))
+                        for i, rule in rules
+                    ]
+            else:
+                inner_strategy.strategies = tuple(
+                    ProfiledRule(rule, profile, i)
+                    for i, rule in enumerate(inner_strategy.strategies)
+                )
+            fold = _ProfiledIteration(fold, profile)
+
+        return metadsl_rewrite.StrategyRepeat(fold)
 
     def get_rules(self) -> metadsl_rewrite.StrategyRepeat:
         """
@@ -31,13 +451,86 @@ class RegisterStrategy:
         -------
         metadsl_rewrite.StrategyRepeat
         """
-        inner_strategy = metadsl_rewrite.StrategySequence(
-            *self._inner_strategy
-        )
-        return metadsl_rewrite.StrategyRepeat(
-            metadsl_rewrite.StrategyFold(inner_strategy)
+        if self._rules is None:
+            start = time.perf_counter()
+            self._rules = self._build_rules()
+            self.rebuild_time += time.perf_counter() - start
+            self.rebuild_count += 1
+        return self._rules
+
+    def can_rewrite(self, expr: object) -> bool:
+        """
+        Check if any rule could match an expression or its sub-expressions.
+
+        With ``indexed=True``, a rule is tried just for the expressions with
+        its dispatch key, so when no sub-expression has the key of a rule
+        the rewrite would return the same expression. This check walks the
+        tree without recursion, so it is cheaper than the rewrite, which
+        builds a graph of the whole tree.
+
+        Parameters
+        ----------
+        expr : object
+
+        Returns
+        -------
+        bool
+            False just when the rewrite can't change the expression.
+        """
+        self.get_rules()
+        dispatch = self._dispatch
+        if dispatch is None or dispatch.fallback:
+            return True
+        return any(
+            dispatch_key(node) in dispatch.index for node in postorder(expr)
         )
 
+    @property
+    def signature(self) -> str:
+        """
+        Get a digest of the registered rules.
+
+        Unlike ``version``, it is the same in different processes that
+        register the same rules (by ``rule_name``, in the same order), so
+        it can be used to key data shared between them.
+
+        Returns
+        -------
+        str
+        """
+        if self._signature is None or self._signature[0] != self.version:
+            names = '\n'.join(rule_name(rule) for rule in self._inner_strategy)
+            self._signature = (
+                self.version,
+                hashlib.blake2b(
+                    names.encode('utf-8'), digest_size=16
+                ).hexdigest(),
+            )
+        return self._signature[1]
+
+    @property
+    def stats(self) -> dict:
+        """
+        Get the rules build statistics.
+
+        Returns
+        -------
+        dict
+            ``rules``, ``lazy_rules`` (the lazy rules not built yet),
+            ``version``, ``rebuild_count`` and ``rebuild_time`` (in seconds)
+            values.
+        """
+        return {
+            'rules': len(self),
+            'lazy_rules': sum(
+                isinstance(rule, LazyRule) and not rule.built
+                for rule in self._inner_strategy
+            ),
+            'version': self.version,
+            'rebuild_count': self.rebuild_count,
+            'rebuild_time': self.rebuild_time,
+        }
+
 
 def register(
     name: str,
@@ -56,15 +549,21 @@ def register(
     f_target : Callable
     """
     f_target.__qualname__ = name
-    setattr(klass, f_source_name, metadsl.expression(f_target))
+    setattr(klass, f_source_name, interned_method(expression(f_target)))
 
 
-def rewrite(fn: Callable):
+def rewrite(fn: Callable, strategy: Optional[RegisterStrategy] = None):
     """
     Register a function expression.
 
     Parameters
     ----------
     fn : Callable
+    strategy : RegisterStrategy, optional, default None
+        Strategy the rule is registered to, by default the rule is
+        registered to the metadsl core rules.
     """
-    register_core(metadsl_rewrite.rule(fn))
+    if strategy is None:
+        register_core(metadsl_rewrite.rule(fn))
+    else:
+        strategy.register(metadsl_rewrite.rule(fn))
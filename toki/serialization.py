@@ -0,0 +1,476 @@
+"""
+Binary serialization of expressions.
+
+The expressions are encoded as a header (``TOKI`` and the format version)
+followed by tables, each one a count and its items:
+
+- strings: the UTF-8 strings (names, string values, ...), each one once;
+- classes: the expression types, by module and qualified name;
+- functions: the expression functions (see ``toki.types.function_name``)
+  and, for the bound ones, their owner class;
+- layouts: the schema layouts, by columns;
+- nodes: the expressions, in post-order, by class, function, arguments
+  and alias.
+
+After the tables comes the encoded root value. The integers (counts,
+table indexes and integer values) are variable-length, so small values
+take one byte. The expressions shared by more than one parent (and, by
+default, the structurally identical ones) are encoded once.
+
+The classes and functions are looked up, not imported or called, so
+decoding an untrusted payload can't run arbitrary code, unlike pickle.
+"""
+import struct
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import metadsl
+
+from toki import types as tps
+from toki.types import SchemaLayout, fingerprint, function_name, postorder
+
+MAGIC = b'TOKI'
+VERSION = 1
+
+# value tags
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_BYTES = 6
+_LIST = 7
+_TUPLE = 8
+_DICT = 9
+_NODE = 10
+_LAYOUT = 11
+
+# node flags
+_RENAMED = 1
+
+_FLOAT_STRUCT = struct.Struct('<d')
+
+
+def _write_uint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: Dict[str, int] = {}
+        self.classes: Dict[type, int] = {}
+        self.functions: Dict[Tuple[str, Optional[type], bool], int] = {}
+        self.function_ids: Dict[int, int] = {}
+        self.layouts: Dict[int, int] = {}
+        self.layout_items: List[SchemaLayout] = []
+        self.nodes: Dict[Any, int] = {}
+        self.body = bytearray()
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def klass(self, cls: type) -> int:
+        index = self.classes.get(cls)
+        if index is None:
+            self.string(cls.__module__)
+            self.string(cls.__qualname__)
+            index = self.classes[cls] = len(self.classes)
+        return index
+
+    def function(self, function: Callable) -> int:
+        # the functions are kept alive by the nodes that use them
+        index = self.function_ids.get(id(function))
+        if index is None:
+            index = self.function_ids[id(function)] = self._function(function)
+        return index
+
+    def _function(self, function: Callable) -> int:
+        name = function_name(function)
+        if name not in tps.EXPRESSION_FUNCTIONS:
+            raise TypeError(
+                'Expression function ``{}`` not registered.'.format(name)
+            )
+        owner = getattr(function, 'owner', None)
+        key = (name, owner, bool(getattr(function, 'is_classmethod', False)))
+        index = self.functions.get(key)
+        if index is None:
+            self.string(name)
+            if owner is not None:
+                self.klass(owner)
+            index = self.functions[key] = len(self.functions)
+        return index
+
+    def layout(self, layout: SchemaLayout) -> int:
+        index = self.layouts.get(id(layout))
+        if index is None:
+            for name, tp in zip(layout.names, layout.types):
+                self.string(name)
+                self.string(tp)
+            index = self.layouts[id(layout)] = len(self.layout_items)
+            self.layout_items.append(layout)
+        return index
+
+    def value(self, out: bytearray, value: Any, keys: Callable):
+        if value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, metadsl.Expression):
+            out.append(_NODE)
+            _write_uint(out, self.nodes[keys(value)])
+        elif type(value) is int:
+            out.append(_INT)
+            # zigzag, so small negative values are small too
+            _write_uint(out, value * 2 if value >= 0 else -value * 2 - 1)
+        elif type(value) is float:
+            out.append(_FLOAT)
+            out += _FLOAT_STRUCT.pack(value)
+        elif type(value) is str:
+            out.append(_STR)
+            _write_uint(out, self.string(value))
+        elif type(value) is bytes:
+            out.append(_BYTES)
+            _write_uint(out, len(value))
+            out += value
+        elif type(value) in (list, tuple):
+            out.append(_LIST if type(value) is list else _TUPLE)
+            _write_uint(out, len(value))
+            for item in value:
+                self.value(out, item, keys)
+        elif type(value) is dict:
+            out.append(_DICT)
+            _write_uint(out, len(value))
+            for key, item in value.items():
+                self.value(out, key, keys)
+                self.value(out, item, keys)
+        elif isinstance(value, SchemaLayout):
+            out.append(_LAYOUT)
+            _write_uint(out, self.layout(value))
+        else:
+            raise TypeError(
+                'Value of type ``{}`` not supported.'.format(
+                    type(value).__name__
+                )
+            )
+
+    def node(self, node: metadsl.Expression, keys: Callable):
+        if hasattr(node, '__orig_class__'):
+            raise TypeError(
+                'Generic expression ``{}`` not supported.'.format(
+                    type(node).__name__
+                )
+            )
+        out = self.body
+        _write_uint(out, self.klass(type(node)))
+        _write_uint(out, self.function(node.function))
+        rename = getattr(node, 'rename', None)
+        out.append(_RENAMED if rename is not None else 0)
+        if rename is not None:
+            _write_uint(out, self.string(rename))
+        _write_uint(out, len(node.args))
+        for arg in node.args:
+            self.value(out, arg, keys)
+        _write_uint(out, len(node.kwargs))
+        for key, arg in node.kwargs.items():
+            _write_uint(out, self.string(key))
+            self.value(out, arg, keys)
+
+    def header(self) -> bytearray:
+        out = bytearray(MAGIC)
+        out.append(VERSION)
+
+        _write_uint(out, len(self.strings))
+        for value in self.strings:
+            encoded = value.encode('utf-8')
+            _write_uint(out, len(encoded))
+            out += encoded
+
+        _write_uint(out, len(self.classes))
+        for cls in self.classes:
+            _write_uint(out, self.strings[cls.__module__])
+            _write_uint(out, self.strings[cls.__qualname__])
+
+        _write_uint(out, len(self.functions))
+        for name, owner, is_classmethod in self.functions:
+            _write_uint(out, self.strings[name])
+            # 0 for the functions that are not bound
+            _write_uint(out, 0 if owner is None else self.classes[owner] + 1)
+            out.append(int(is_classmethod))
+
+        _write_uint(out, len(self.layout_items))
+        for layout in self.layout_items:
+            _write_uint(out, len(layout))
+            for name, tp in zip(layout.names, layout.types):
+                _write_uint(out, self.strings[name])
+                _write_uint(out, self.strings[tp])
+            out += _pack_bits(layout.nullable)
+
+        _write_uint(out, len(self.nodes))
+        return out
+
+
+def _pack_bits(values: Tuple[bool, ...]) -> bytes:
+    result = bytearray((len(values) + 7) // 8)
+    for i, value in enumerate(values):
+        if value:
+            result[i // 8] |= 1 << (i % 8)
+    return bytes(result)
+
+
+def serialize(expr: Any, structural: bool = True) -> bytes:
+    """
+    Encode an expression in the toki binary format.
+
+    Parameters
+    ----------
+    expr : Any
+        An expression, or a value with expressions (e.g. a list of
+        expressions). The values supported are None, bool, int, float,
+        str, bytes, lists, tuples, dicts and schema layouts.
+    structural : bool, default True
+        When True, the structurally identical sub-expressions (with the
+        same fingerprint) are encoded once, even when they are different
+        objects. When False, just the objects shared by more than one
+        parent are encoded once, which is faster.
+
+    Returns
+    -------
+    bytes
+
+    Raises
+    ------
+    TypeError
+        If the expression has values or functions that can't be encoded.
+    """
+    encoder = _Encoder()
+    if structural:
+        memo: Dict[int, str] = {}
+        fingerprint(expr, memo)
+
+        def keys(node):
+            return memo[id(node)]
+
+    else:
+        keys = id
+
+    # keep the expressions alive while their ids are used as keys
+    nodes = postorder(expr)
+    for node in nodes:
+        key = keys(node)
+        if key not in encoder.nodes:
+            encoder.node(node, keys)
+            encoder.nodes[key] = len(encoder.nodes)
+
+    root = bytearray()
+    encoder.value(root, expr, keys)
+    return bytes(encoder.header() + encoder.body + root)
+
+
+class _Decoder:
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        self.position = 0
+        self.strings: List[str] = []
+        self.classes: List[type] = []
+        self.functions: List[Callable] = []
+        self.layouts: List[SchemaLayout] = []
+        self.nodes: List[Any] = []
+
+    def byte(self) -> int:
+        try:
+            value = self.data[self.position]
+        except IndexError:
+            raise ValueError('Truncated data.')
+        self.position += 1
+        return value
+
+    def uint(self) -> int:
+        try:
+            value = self.data[self.position]
+        except IndexError:
+            raise ValueError('Truncated data.')
+        self.position += 1
+        if value < 0x80:
+            return value
+        result = value & 0x7F
+        shift = 7
+        while True:
+            value = self.byte()
+            result |= (value & 0x7F) << shift
+            if value < 0x80:
+                return result
+            shift += 7
+
+    def raw(self, size: int) -> bytes:
+        end = self.position + size
+        if end > len(self.data):
+            raise ValueError('Truncated data.')
+        value = self.data[self.position : end].tobytes()
+        self.position = end
+        return value
+
+    def item(self, items: List[Any], index: int) -> Any:
+        if index >= len(items):
+            raise ValueError('Invalid reference {}.'.format(index))
+        return items[index]
+
+    def klass(self) -> type:
+        module_name = self.item(self.strings, self.uint())
+        qualname = self.item(self.strings, self.uint())
+        # just the modules already imported, the data doesn't import code
+        cls = sys.modules.get(module_name)
+        for name in qualname.split('.'):
+            cls = getattr(cls, name, None)
+        if not (isinstance(cls, type) and issubclass(cls, metadsl.Expression)):
+            raise ValueError(
+                'Expression class ``{}.{}`` not found.'.format(
+                    module_name, qualname
+                )
+            )
+        return cls
+
+    def function(self) -> Callable:
+        name = self.item(self.strings, self.uint())
+        owner = self.uint()
+        is_classmethod = bool(self.byte())
+        function = tps.EXPRESSION_FUNCTIONS.get(name)
+        if function is None:
+            raise ValueError(
+                'Expression function ``{}`` not registered.'.format(name)
+            )
+        if owner:
+            # bound as ``Infer.__get__`` does when called from the class
+            function = function.__get__(
+                None, self.item(self.classes, owner - 1)
+            )
+            if function.is_classmethod != is_classmethod:
+                raise ValueError(
+                    'Expression function ``{}`` changed.'.format(name)
+                )
+        return function
+
+    def layout(self) -> SchemaLayout:
+        size = self.uint()
+        columns = [
+            (
+                self.item(self.strings, self.uint()),
+                self.item(self.strings, self.uint()),
+            )
+            for _ in range(size)
+        ]
+        bits = self.raw((size + 7) // 8)
+        return SchemaLayout.from_structure(
+            {
+                name: {
+                    'type': tp,
+                    'nullable': bool(bits[i // 8] >> (i % 8) & 1),
+                }
+                for i, (name, tp) in enumerate(columns)
+            }
+        )
+
+    def value(self) -> Any:
+        tag = self.byte()
+        if tag == _NONE:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _NODE:
+            return self.item(self.nodes, self.uint())
+        if tag == _INT:
+            value = self.uint()
+            return value // 2 if not value & 1 else -(value + 1) // 2
+        if tag == _FLOAT:
+            return _FLOAT_STRUCT.unpack(self.raw(_FLOAT_STRUCT.size))[0]
+        if tag == _STR:
+            return self.item(self.strings, self.uint())
+        if tag == _BYTES:
+            return self.raw(self.uint())
+        if tag == _LIST:
+            return [self.value() for _ in range(self.uint())]
+        if tag == _TUPLE:
+            return tuple(self.value() for _ in range(self.uint()))
+        if tag == _DICT:
+            return {self.value(): self.value() for _ in range(self.uint())}
+        if tag == _LAYOUT:
+            return self.item(self.layouts, self.uint())
+        raise ValueError('Invalid value tag {}.'.format(tag))
+
+    def node(self) -> metadsl.Expression:
+        cls = self.item(self.classes, self.uint())
+        function = self.item(self.functions, self.uint())
+        flags = self.byte()
+        rename = None
+        if flags & _RENAMED:
+            rename = self.item(self.strings, self.uint())
+        args = [self.value() for _ in range(self.uint())]
+        kwargs = {
+            self.item(self.strings, self.uint()): self.value()
+            for _ in range(self.uint())
+        }
+        node = cls(function, args, kwargs)
+        if rename is not None:
+            node.rename = rename
+        return node
+
+    def decode(self) -> Any:
+        if self.raw(len(MAGIC)) != MAGIC:
+            raise ValueError('Not a toki serialized expression.')
+        version = self.byte()
+        if version != VERSION:
+            raise ValueError(
+                'Format version {} not supported.'.format(version)
+            )
+
+        for _ in range(self.uint()):
+            self.strings.append(self.raw(self.uint()).decode('utf-8'))
+        for _ in range(self.uint()):
+            self.classes.append(self.klass())
+        for _ in range(self.uint()):
+            self.functions.append(self.function())
+        for _ in range(self.uint()):
+            self.layouts.append(self.layout())
+        for _ in range(self.uint()):
+            self.nodes.append(self.node())
+
+        result = self.value()
+        if self.position != len(self.data):
+            raise ValueError('Unexpected data after the expression.')
+        return result
+
+
+@tps.interned
+def deserialize(data: bytes) -> Any:
+    """
+    Decode an expression encoded by ``serialize``.
+
+    The expression classes should be imported and the expression functions
+    registered (e.g. by importing ``toki``) before decoding. The decoded
+    expressions are interned when the interning is enabled.
+
+    Parameters
+    ----------
+    data : bytes
+
+    Returns
+    -------
+    Any
+
+    Raises
+    ------
+    ValueError
+        If the data is not valid, or it uses classes or functions that
+        are not available.
+    """
+    return _Decoder(data).decode()
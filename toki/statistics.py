@@ -0,0 +1,143 @@
+"""Table statistics gathered from the backends."""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class ColumnStatistics:
+    """
+    Statistics of a table column.
+
+    The values not known are None.
+
+    Parameters
+    ----------
+    min : Any, optional, default None
+    max : Any, optional, default None
+    null_count : int, optional, default None
+    distinct_count : int, optional, default None
+        Number of distinct values, null values excluded.
+    """
+
+    min: Any = None
+    max: Any = None
+    null_count: Optional[int] = None
+    distinct_count: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class TableStatistics:
+    """
+    Statistics of a table.
+
+    Parameters
+    ----------
+    row_count : int
+    columns : Dict[str, ColumnStatistics], default {}
+        Statistics by column name, for the columns of the table schema.
+    gathered_at : float, default time.time()
+        Time the statistics were gathered, in seconds since the epoch.
+    """
+
+    row_count: int
+    columns: Dict[str, ColumnStatistics] = field(default_factory=dict)
+    gathered_at: float = field(default_factory=time.time)
+
+    @property
+    def age(self) -> float:
+        """Seconds since the statistics were gathered."""
+        return time.time() - self.gathered_at
+
+    def is_fresh(self, max_age: Optional[float] = None) -> bool:
+        """
+        Check if the statistics are newer than the given age.
+
+        Parameters
+        ----------
+        max_age : float, optional, default None
+            Maximum age, in seconds. When None, the statistics are always
+            fresh.
+
+        Returns
+        -------
+        bool
+        """
+        return max_age is None or self.age <= max_age
+
+
+class StatisticsCache:
+    """
+    Table statistics by table name.
+
+    Parameters
+    ----------
+    max_age : float, optional, default None
+        Statistics older than this, in seconds, are stale, so they are
+        gathered again. When None, they are kept until invalidated.
+
+    The cache can be shared by backends running in different threads.
+    """
+
+    def __init__(self, max_age: Optional[float] = None):
+        if max_age is not None and max_age < 0:
+            raise ValueError('Statistics max_age should not be negative.')
+        self.max_age = max_age
+        self._data: Dict[str, TableStatistics] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, name: str) -> bool:
+        return self.get(name) is not None
+
+    def get(self, name: str) -> Optional[TableStatistics]:
+        """
+        Get the fresh statistics of a table.
+
+        Parameters
+        ----------
+        name : str
+
+        Returns
+        -------
+        TableStatistics, optional
+            None if there are no statistics or they are stale.
+        """
+        with self._lock:
+            statistics = self._data.get(name)
+            if statistics is not None and not statistics.is_fresh(
+                self.max_age
+            ):
+                del self._data[name]
+                return None
+            return statistics
+
+    def set(self, name: str, statistics: TableStatistics):
+        """
+        Store the statistics of a table.
+
+        Parameters
+        ----------
+        name : str
+        statistics : TableStatistics
+        """
+        with self._lock:
+            self._data[name] = statistics
+
+    def invalidate(self, name: Optional[str] = None):
+        """
+        Remove the statistics of a table, or of all tables.
+
+        Parameters
+        ----------
+        name : str, optional, default None
+            When None, all the statistics are removed.
+        """
+        with self._lock:
+            if name is None:
+                self._data.clear()
+            else:
+                self._data.pop(name, None)
@@ -1,24 +1,267 @@
 """Type expressions definition."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional, Union
+import contextlib
+import functools
+import hashlib
+import sys
+import threading
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import metadsl
+from metadsl.expressions import extract_expression_type
+from metadsl.typing_tools import infer
+
+# Expressions interning
+
+_INTERNING = False
+_INTERNED: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+def set_interning(enabled: bool):
+    """
+    Enable or disable the interning of new expressions.
+
+    When enabled, expressions created by the toki constructors and
+    operations are hash-consed: structurally equal expressions are the same
+    object and carry a precomputed hash.
+
+    Parameters
+    ----------
+    enabled : bool
+    """
+    global _INTERNING
+    _INTERNING = enabled
+
+
+@contextlib.contextmanager
+def interning(enabled: bool = True) -> Iterator[None]:
+    """
+    Context manager that enables (or disables) expressions interning.
+
+    Parameters
+    ----------
+    enabled : bool, default True
+    """
+    previous = _INTERNING
+    set_interning(enabled)
+    try:
+        yield
+    finally:
+        set_interning(previous)
+
+
+def is_interned(expr: Any) -> bool:
+    """
+    Check if the given expression is interned.
+
+    Parameters
+    ----------
+    expr : Any
+
+    Returns
+    -------
+    bool
+    """
+    return isinstance(expr, metadsl.Expression) and '_hash' in expr.__dict__
+
+
+def _intern_value_key(value: Any, canonical: Dict[int, Any]) -> Any:
+    if isinstance(value, metadsl.Expression):
+        return ('expr', id(canonical.get(id(value), value)))
+    if isinstance(value, (list, tuple)):
+        return (
+            type(value),
+            tuple(_intern_value_key(v, canonical) for v in value),
+        )
+    if isinstance(value, dict):
+        return (
+            dict,
+            tuple(
+                (k, _intern_value_key(v, canonical)) for k, v in value.items()
+            ),
+        )
+    try:
+        hash(value)
+    except TypeError:
+        return ('id', id(value))
+    return (type(value), value)
+
+
+def _intern_replace(value: Any, canonical: Dict[int, Any]) -> Any:
+    if isinstance(value, metadsl.Expression):
+        return canonical.get(id(value), value)
+    if isinstance(value, list):
+        return [_intern_replace(v, canonical) for v in value]
+    if isinstance(value, tuple):
+        items = [_intern_replace(v, canonical) for v in value]
+        # named tuples are built from their fields
+        if hasattr(value, '_fields'):
+            return type(value)(*items)
+        return type(value)(items)
+    if isinstance(value, dict):
+        return {k: _intern_replace(v, canonical) for k, v in value.items()}
+    return value
+
+
+def intern_expr(expr: Any) -> Any:
+    """
+    Get the interned (shared) instance of the given expression.
+
+    The expression sub-trees are interned as well.
+
+    Parameters
+    ----------
+    expr : Any
+
+    Returns
+    -------
+    Any
+        The interned expression, or the given value if it is not an
+        expression.
+    """
+    if not isinstance(expr, metadsl.Expression) or is_interned(expr):
+        return expr
 
-# Expressions definition
+    canonical: Dict[int, Any] = {}
+    stack: List[Any] = [expr]
+
+    while stack:
+        node = stack[-1]
+        if id(node) in canonical:
+            stack.pop()
+            continue
+
+        pending = [
+            child
+            for child in expression_children(node)
+            if id(child) not in canonical and not is_interned(child)
+        ]
+        if pending:
+            stack.extend(pending)
+            continue
+
+        stack.pop()
+        key = (
+            type(node),
+            node.function,
+            _intern_value_key(node.args, canonical),
+            _intern_value_key(node.kwargs, canonical),
+            getattr(node, 'rename', None),
+        )
+        interned = _INTERNED.get(key)
+        if interned is None:
+            # the node can be held by the caller, so a copy is interned,
+            # with its arguments replaced by the interned expressions.
+            interned = node._map(lambda arg: _intern_replace(arg, canonical))
+            if getattr(node, 'rename', None):
+                interned.rename = node.rename
+            interned._hash = hash(key)
+            _INTERNED[key] = interned
+        canonical[id(node)] = interned
 
+    return canonical[id(expr)]
 
-def constructor(fn: Callable):
-    """Decorator for expression constructor."""
 
+def interned(fn: Callable) -> Callable:
+    """Decorator that interns the expressions returned by ``fn``."""
+
+    @functools.wraps(fn)
     def _fn(*args, **kwargs):
-        fn.__qualname__ = fn.__qualname__.split('.')[0]
-        return metadsl.expression(fn)(*args, **kwargs)
+        result = fn(*args, **kwargs)
+        return intern_expr(result) if _INTERNING else result
 
     return _fn
 
 
+class interned_method:
+    """
+    Descriptor that interns the expressions returned by a method.
+
+    It wraps an ``expression`` method, when interning is disabled
+    the method is returned as is.
+    """
+
+    def __init__(self, method: Any):
+        self.method = method
+        functools.update_wrapper(self, method)
+
+    def __get__(self, instance, owner):
+        method = self.method.__get__(instance, owner)
+        if instance is None or not _INTERNING:
+            return method
+        return interned(method)
+
+
+# Expressions definition
+
+
+# expression functions by name (see ``function_name``), so the serialized
+# expressions can be decoded
+EXPRESSION_FUNCTIONS: Dict[str, Callable] = {}
+
+
+def function_name(function: Callable) -> str:
+    """
+    Get the name of an expression function, e.g. ``toki.api:Add``.
+
+    Bound functions (e.g. operation methods) have the name of the function
+    they were created from.
+
+    Parameters
+    ----------
+    function : Callable
+
+    Returns
+    -------
+    str
+    """
+    fn = getattr(function, 'fn', function)
+    return '{}:{}'.format(
+        getattr(fn, '__module__', ''), getattr(fn, '__qualname__', repr(fn))
+    )
+
+
+def _wrapper(fn, args, kwargs, return_type):
+    return extract_expression_type(return_type)(fn, list(args), kwargs)
+
+
+def expression(fn: Callable) -> Callable:
+    """
+    Decorator for expression functions, like ``metadsl.expression``.
+
+    ``metadsl.expression`` copies the whole tree of each new expression,
+    so building a chain of ``n`` operations (e.g. a sum of ``n`` columns)
+    is quadratic and recursive. The toki expressions are not changed in
+    place (``Column.name`` renames a copy), so the arguments are kept.
+
+    The function is registered in ``EXPRESSION_FUNCTIONS``, so the
+    expressions it creates can be decoded by ``toki.serialization``.
+    """
+    result = infer(fn, _wrapper)
+    EXPRESSION_FUNCTIONS[function_name(result)] = result
+    return result
+
+
+def constructor(fn: Callable):
+    """Decorator for expression constructor."""
+    fn.__qualname__ = fn.__qualname__.split('.')[0]
+    return interned(expression(fn))
+
+
 @dataclass
 class Expr(metadsl.Expression):
     """Base expression class."""
@@ -36,6 +279,29 @@ class Expr(metadsl.Expression):
         output = '{}({})'.format(fn_name, self.args)
         return output
 
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        if is_interned(self) and is_interned(other):
+            return False
+        return (self.function, self.args, self.kwargs) == (
+            other.function,
+            other.args,
+            other.kwargs,
+        )
+
+    def __hash__(self) -> int:
+        try:
+            return self.__dict__['_hash']
+        except KeyError:
+            raise TypeError(
+                'unhashable type: {} (not interned)'.format(
+                    self.__class__.__name__
+                )
+            )
+
     @property
     def _display_name(self) -> str:
         return self.__class__.__name__
@@ -46,6 +312,172 @@ class Expr(metadsl.Expression):
         raise NotImplementedError('Operation not supported yet.')
 
 
+def _function_key(function: Callable) -> str:
+    owner = getattr(function, 'owner', None)
+    return '{}{}'.format(
+        function_name(function),
+        '@{}'.format(owner.__qualname__) if owner is not None else '',
+    )
+
+
+def _value_key(value: Any, children: Dict[int, str]) -> str:
+    if isinstance(value, metadsl.Expression):
+        return children[id(value)]
+    if isinstance(value, SchemaLayout):
+        return 'layout:{}'.format(value.key)
+    if isinstance(value, (list, tuple)):
+        return '{}[{}]'.format(
+            type(value).__name__,
+            ','.join(_value_key(v, children) for v in value),
+        )
+    if isinstance(value, dict):
+        return 'dict{{{}}}'.format(
+            ','.join(
+                '{}:{}'.format(repr(k), _value_key(v, children))
+                for k, v in sorted(value.items(), key=lambda kv: repr(kv[0]))
+            )
+        )
+    if isinstance(value, type):
+        return 'type:{}.{}'.format(value.__module__, value.__qualname__)
+    return '{}:{}'.format(type(value).__name__, repr(value))
+
+
+def expression_children(value: Any) -> List[Any]:
+    """
+    Get the child expressions of an expression or a value.
+
+    The expressions inside the arguments (e.g. in a list of expressions)
+    are included, in the order of the arguments.
+
+    Parameters
+    ----------
+    value : Any
+        An expression, or a list, tuple or dict of values.
+
+    Returns
+    -------
+    List[Any]
+    """
+    if isinstance(value, metadsl.Expression):
+        values = list(value.args) + list(value.kwargs.values())
+    elif isinstance(value, (list, tuple)):
+        values = list(value)
+    elif isinstance(value, dict):
+        values = list(value.values())
+    else:
+        return []
+
+    result = []
+    for v in values:
+        if isinstance(v, metadsl.Expression):
+            result.append(v)
+        elif isinstance(v, (list, tuple, dict)):
+            result.extend(expression_children(v))
+    return result
+
+
+def postorder(
+    expr: Any, is_leaf: Optional[Callable[[Any], bool]] = None
+) -> List[Any]:
+    """
+    Get the expressions from an expression tree in post-order.
+
+    When ``expr`` is not an expression, the expressions inside it (e.g. a
+    list of expressions) are used as roots. The children come before their
+    parents and each expression is returned once, even when it is shared by
+    more than one parent. The tree is walked without recursion, so deep
+    trees are supported.
+
+    Parameters
+    ----------
+    expr : Any
+    is_leaf : Callable[[Any], bool], optional, default None
+        When given, the children of the expressions for which it returns
+        True are not walked.
+
+    Returns
+    -------
+    List[Any]
+    """
+    roots = (
+        [expr]
+        if isinstance(expr, metadsl.Expression)
+        else expression_children(expr)
+    )
+    result: List[Any] = []
+    visited = set()
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            result.append(node)
+            continue
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        stack.append((node, True))
+        if is_leaf is not None and is_leaf(node):
+            continue
+        for child in reversed(expression_children(node)):
+            if id(child) not in visited:
+                stack.append((child, False))
+    return result
+
+
+def fingerprint(expr: Any, memo: Optional[Dict[int, str]] = None) -> str:
+    """
+    Compute a structural fingerprint for an expression.
+
+    Expressions with the same structure (types, functions and argument
+    values) have the same fingerprint, even when they are different
+    objects. The fingerprint is stable between processes.
+
+    Parameters
+    ----------
+    expr : Any
+    memo : Dict[int, str], optional, default None
+        Fingerprints by expression ``id``, filled with the fingerprint of
+        every sub-expression. It can be shared by calls over expressions
+        that are kept alive, to avoid computing the same sub-tree twice.
+
+    Returns
+    -------
+    str
+    """
+    children: Dict[int, str] = {} if memo is None else memo
+    if id(expr) in children:
+        return children[id(expr)]
+
+    for node in postorder(expr):
+        if id(node) in children:
+            continue
+
+        if '_fingerprint' in node.__dict__:
+            children[id(node)] = node._fingerprint
+            continue
+
+        key = '{}.{}|{}|{}|{}|{}'.format(
+            type(node).__module__,
+            type(node).__qualname__,
+            _function_key(node.function),
+            _value_key(node.args, children),
+            _value_key(node.kwargs, children),
+            getattr(node, 'rename', None),
+        )
+        children[id(node)] = hashlib.blake2b(
+            key.encode('utf-8'), digest_size=16
+        ).hexdigest()
+        if is_interned(node):
+            # interned expressions are shared, so the result is reused
+            node._fingerprint = children[id(node)]
+
+    if isinstance(expr, metadsl.Expression):
+        return children[id(expr)]
+    return hashlib.blake2b(
+        _value_key(expr, children).encode('utf-8'), digest_size=16
+    ).hexdigest()
+
+
 class Database(Expr):
     """Database expression."""
 
@@ -54,38 +486,232 @@ class DatabaseSchema(Expr):
     """Database schema expression."""
 
 
+# the layouts in use, by their columns
+_LAYOUTS: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+_LAYOUTS_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True, eq=False, repr=False)
+class SchemaLayout(Mapping):
+    """
+    Frozen layout of the columns of a table schema.
+
+    It is a read-only mapping from column name to the column description
+    (``{'type': ..., 'nullable': ...}``), like the dictionary given to
+    ``TableSchema.expr``, but the columns are stored in tuples, with
+    their position and expression type precomputed, so a column lookup
+    and the layout hash are O(1).
+
+    The layouts should be created by ``SchemaLayout.from_structure``, so
+    the schemas with the same columns share the same instance.
+
+    Parameters
+    ----------
+    names : Tuple[str, ...]
+    types : Tuple[str, ...]
+    nullable : Tuple[bool, ...]
+    """
+
+    names: Tuple[str, ...]
+    types: Tuple[str, ...]
+    nullable: Tuple[bool, ...]
+    index: Dict[str, int] = field(init=False)
+    column_types: Tuple[Optional[type], ...] = field(init=False)
+    key: str = field(init=False)
+
+    def __post_init__(self):
+        setattr_ = functools.partial(object.__setattr__, self)
+        setattr_('index', {name: i for i, name in enumerate(self.names)})
+        setattr_(
+            'column_types',
+            tuple(COLUMN_TYPE_MAP.get(tp) for tp in self.types),
+        )
+        key = '|'.join(
+            '{!r}:{!r}:{!r}'.format(*column)
+            for column in zip(self.names, self.types, self.nullable)
+        )
+        setattr_(
+            'key',
+            hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest(),
+        )
+        setattr_('_hash', hash(self.key))
+        setattr_('_lines', None)
+
+    @classmethod
+    def from_structure(
+        cls, structure: Union[SchemaLayout, Dict[str, Dict[str, Any]]]
+    ) -> SchemaLayout:
+        """
+        Get the shared layout for a schema structure.
+
+        Parameters
+        ----------
+        structure : Union[SchemaLayout, Dict[str, Dict[str, Any]]]
+            Column descriptions by column name. The columns are nullable
+            by default.
+
+        Returns
+        -------
+        SchemaLayout
+        """
+        if isinstance(structure, SchemaLayout):
+            return structure
+        return cls._shared(
+            tuple(
+                (
+                    sys.intern(name),
+                    column['type'],
+                    bool(column.get('nullable', True)),
+                )
+                for name, column in structure.items()
+            )
+        )
+
+    @classmethod
+    def _shared(cls, columns: Tuple[Tuple[str, str, bool], ...]):
+        with _LAYOUTS_LOCK:
+            layout = _LAYOUTS.get(columns)
+            if layout is None:
+                names = tuple(column[0] for column in columns)
+                types = tuple(column[1] for column in columns)
+                nullable = tuple(column[2] for column in columns)
+                layout = cls(names, types, nullable)
+                _LAYOUTS[columns] = layout
+            return layout
+
+    def select(self, names: Iterable[str]) -> SchemaLayout:
+        """
+        Get the shared layout of some of the columns.
+
+        Parameters
+        ----------
+        names : Iterable[str]
+
+        Returns
+        -------
+        SchemaLayout
+
+        Raises
+        ------
+        KeyError
+            If a column is not in the layout.
+        """
+        positions = [self.index[name] for name in names]
+        return self._shared(
+            tuple(
+                (self.names[i], self.types[i], self.nullable[i])
+                for i in positions
+            )
+        )
+
+    def column_type(self, name: str) -> type:
+        """
+        Get the expression type of a column, e.g. ``IntegerColumn``.
+
+        Raises
+        ------
+        KeyError
+            If the column is not in the layout, or its type has no
+            expression type (see ``COLUMN_TYPE_MAP``).
+        """
+        column_type = self.column_types[self.index[name]]
+        if column_type is None:
+            raise KeyError(self.types[self.index[name]])
+        return column_type
+
+    def format_columns(self) -> str:
+        """Get the description of the columns, a line by column."""
+        if self._lines is None:
+            object.__setattr__(
+                self,
+                '_lines',
+                ''.join(
+                    '  {}: {}({})\n'.format(
+                        name, tp, 'nullale' if nullable else 'non-nullable'
+                    )
+                    for name, tp, nullable in zip(
+                        self.names, self.types, self.nullable
+                    )
+                ),
+            )
+        return self._lines
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        i = self.index[name]
+        return {'type': self.types[i], 'nullable': self.nullable[i]}
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __eq__(self, other) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, SchemaLayout):
+            return NotImplemented
+        return self.key == other.key
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return '{}({} columns)'.format(type(self).__name__, len(self))
+
+    def __reduce__(self):
+        # unpickled layouts are shared as well
+        return (
+            SchemaLayout._shared,
+            (tuple(zip(self.names, self.types, self.nullable)),),
+        )
+
+
 class TableSchema(Expr):
     """Table schema expression."""
 
     @staticmethod
-    @constructor
-    def expr(structure: Dict[str, Dict[str, Any]]) -> TableSchema:
+    def expr(
+        structure: Union[SchemaLayout, Dict[str, Dict[str, Any]]]
+    ) -> TableSchema:
         """
         Create a table schema expression from a dictionary.
 
         Parameters
         ----------
-        structure : dict
+        structure : Union[SchemaLayout, dict]
+            Column descriptions (``{'type': ..., 'nullable': ...}``) by
+            column name. It is stored as a shared ``SchemaLayout``.
 
         Returns
         -------
         TableSchema
         """
+        return _table_schema(SchemaLayout.from_structure(structure))
 
     @property
-    def structure(self) -> dict:
+    def structure(self) -> SchemaLayout:
         return self.args[0]
 
     def __str__(self) -> str:
         return self.__repr__()
 
     def __repr__(self) -> str:
-        output = '{}\n'.format(self._display_name)
-        for k, v in self.structure.items():
-            output += '  {}: {}({})\n'.format(
-                k, v['type'], 'nullale' if v['nullable'] else 'non-nullable'
-            )
-        return output
+        return '{}\n{}'.format(
+            self._display_name, self.structure.format_columns()
+        )
+
+
+def _table_schema(layout: SchemaLayout) -> TableSchema:
+    """Create a table schema expression from a layout."""
+
+
+_table_schema.__qualname__ = 'TableSchema.expr'
+_table_schema.__name__ = 'expr'
+_table_schema = constructor(_table_schema)
 
 
 class TableBase(Expr):
@@ -108,17 +734,15 @@ class TableBase(Expr):
             if the given ``key`` is a string, return is a Column
             if the given ``key`` is a list of string, return a Projection
         """
+        layout = self.schema.structure
         if isinstance(key, str):
-            if key not in self.schema.structure:
+            if key not in layout:
                 raise TypeError('Column ``{}`` not found.'.format(key))
-            _col_type = COLUMN_TYPE_MAP[self.schema.structure[key]['type']]
+            _col_type = layout.column_type(key)
             # TODO: check a way to normalize this problem
             expr = _col_type.expr(self, key)  # type: ignore
         else:
-            cols_not_found = []
-            for k in key:
-                if k not in self.schema.structure:
-                    cols_not_found += [k]
+            cols_not_found = [k for k in key if k not in layout]
             if cols_not_found:
                 raise TypeError(
                     'Columns {} not found.\n'.format(str(cols_not_found))
@@ -126,7 +750,8 @@ class TableBase(Expr):
             expr = self._get_columns(key)
         return expr
 
-    @metadsl.expression
+    @interned_method
+    @expression
     def _get_columns(self: TableBase, keys: List[str]) -> Projection:
         """
         Get columns projection for the given keys.
@@ -140,7 +765,7 @@ class TableBase(Expr):
         Projection
         """
 
-    @metadsl.expression
+    @expression
     def __add__(self, other: Union[int, float]) -> TableBase:
         """
         Add a number to a table expression.
@@ -154,7 +779,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __truediv__(self, other: Union[int, float]) -> TableBase:
         """
         Divide a table expression by a given number.
@@ -168,7 +793,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __floordiv__(self, other: Union[int, float]) -> TableBase:
         """
         Divide a table expression by a given number.
@@ -184,7 +809,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __mod__(self, other: Union[int, float]) -> TableBase:
         """
         Calculate the modulus of table expression by a number.
@@ -198,7 +823,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __mul__(self, other: Union[int, float]) -> TableBase:
         """
         Multiply a number to a table expression.
@@ -212,7 +837,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __sub__(self, other: Union[int, float]) -> TableBase:
         """
         Subtract a number from a table expression.
@@ -226,7 +851,7 @@ class TableBase(Expr):
         TableBase
         """
 
-    @metadsl.expression
+    @expression
     def __pow__(self, other: Union[int, float]) -> TableBase:
         """
         Calculate the power of the table expression to the given number.
@@ -294,12 +919,11 @@ class Table(TableBase):
         )
 
     def __repr__(self) -> str:
-        output = '{}: {}\n'.format(self._display_name, self.__class__.__name__)
-        for k, v in self.schema.structure.items():
-            output += '  {}: {}({})\n'.format(
-                k, v['type'], 'nullale' if v['nullable'] else 'non-nullable'
-            )
-        return output
+        return '{}: {}\n{}'.format(
+            self._display_name,
+            self.__class__.__name__,
+            self.schema.structure.format_columns(),
+        )
 
 
 class Projection(TableBase):
@@ -329,6 +953,19 @@ class Projection(TableBase):
     def columns(self) -> Union[str, List[str]]:
         return self.args[1]
 
+    @property
+    def schema(self) -> TableSchema:
+        """Get the source schema restricted to the projected columns."""
+        # the expressions are not changed in place, so it is computed once
+        schema = self.__dict__.get('_schema')
+        if schema is None:
+            columns = self.columns
+            if isinstance(columns, str):
+                columns = [columns]
+            layout = self.source.schema.structure.select(columns)
+            schema = self.__dict__['_schema'] = TableSchema.expr(layout)
+        return schema
+
     @property
     def _display_name(self) -> str:
         return '{}[{}]'.format(self.__class__.__name__, str(self.columns))
@@ -398,8 +1035,10 @@ class Column(Projection, Value):
         return result
 
     def name(self, name: str) -> Column:
-        self.rename = name
-        return self
+        # expressions are shared by their parents, so rename a copy of it
+        column = self._map(lambda v: v)
+        column.rename = name
+        return column
 
 
 class Scalar(Value):
@@ -441,6 +1080,22 @@ class BooleanScalar(Scalar, BooleanValue):
 class BooleanColumn(Column, BooleanValue):
     """Boolean column expression."""
 
+    @staticmethod
+    @constructor
+    def expr(source: TableBase, column: str) -> BooleanColumn:
+        """
+        Create a boolean column projection expression.
+
+        Parameters
+        ----------
+        source : TableBase
+        column : str
+
+        Returns
+        -------
+        BooleanColumn
+        """
+
 
 class IntegerValue(NumericValue):
     """Integer value expression."""
@@ -481,6 +1136,22 @@ class FloatingScalar(Scalar, FloatingValue):
 class FloatingColumn(Column, FloatingValue):
     """Floating column expression."""
 
+    @staticmethod
+    @constructor
+    def expr(source: TableBase, column: str) -> FloatingColumn:
+        """
+        Create a floating column projection expression.
+
+        Parameters
+        ----------
+        source : TableBase
+        column : str
+
+        Returns
+        -------
+        FloatingColumn
+        """
+
 
 class DecimalValue(NumericValue):
     """Decimal value expression."""
@@ -1,13 +1,16 @@
-from typing import List
-from uuid import uuid4
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, Optional, TextIO, Tuple, Union
 
 import graphviz as gv
 
-from toki import types as tt
-from toki.types import Expr
+from toki.types import Expr, expression_children, fingerprint
 
+# items of ``iter_graph``: ('node', node_id, node, hidden_children) and
+# ('edge', parent_id, child_id)
+GraphItem = Tuple[Any, ...]
 
-def _get_entity_class_html(expr):
+
+def _get_entity_class_html(expr, hidden: int = 0):
     expr_template = '''<
     <TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0" CELLPADDING="1">
       {}
@@ -36,50 +39,211 @@ def _get_entity_class_html(expr):
     entity_attrs = []
 
     if hasattr(expr, 'schema') and expr.schema:
-        for k, v in expr.schema.structure.items():
+        layout = expr.schema.structure
+        for k, tp, nullable in zip(
+            layout.names, layout.types, layout.nullable
+        ):
             entity_attrs.append(
                 row_key_value_template.format(
-                    k,
-                    v['type'],
-                    'nullable' if v['nullable'] else 'non-nullable',
+                    k, tp, 'nullable' if nullable else 'non-nullable'
                 )
             )
         schema_content = row_template.format(
             expr_schema_template.format('\n'.join(entity_attrs))
         )
 
+    if hidden:
+        schema_content += row_template.format(
+            '<I>+{} hidden</I>'.format(hidden)
+        )
+
     output = expr_template.format(entity_title, schema_content)
     return output
 
 
-def visualize(expr: Expr) -> gv.Digraph:
+def iter_graph(
+    expr: Expr,
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    structural: bool = True,
+) -> Iterator[GraphItem]:
+    """
+    Walk the graph of an expression, breadth-first and without recursion.
+
+    Every operand of a node is followed (not just the first one) and each
+    node is yielded once, even when it is shared by more than one parent.
+    The node ids (``n0``, ``n1``, ...) follow the walk order, so the same
+    expression always gets the same ids.
+
+    Parameters
+    ----------
+    expr : Expr
+    max_nodes : int, optional, default None
+        Maximum number of nodes, the nodes over the limit are not walked.
+    max_depth : int, optional, default None
+        The children of the nodes at this depth are not walked (the root
+        is at depth 0).
+    structural : bool, default True
+        When True, structurally equal sub-trees (see ``fingerprint``) are
+        a single node, otherwise just the same objects are.
+
+    Returns
+    -------
+    Iterator[GraphItem]
+        ``('node', node_id, node, hidden_children)`` for each node, with
+        the number of children not walked because of the limits, followed
+        by ``('edge', parent_id, child_id)`` for each of its children.
+    """
+    memo: Dict[int, str] = {}
+    if structural:
+        fingerprint(expr, memo)
+
+    def _key(node) -> Union[int, str]:
+        return memo[id(node)] if structural else id(node)
+
+    ids: Dict[Union[int, str], str] = {_key(expr): 'n0'}
+    queue: Deque[Tuple[Expr, int]] = deque([(expr, 0)])
+    while queue:
+        node, depth = queue.popleft()
+        children = expression_children(node)
+        if max_depth is not None and depth >= max_depth:
+            yield ('node', ids[_key(node)], node, len(children))
+            continue
+
+        edges = []
+        hidden = 0
+        for child in children:
+            key = _key(child)
+            if key not in ids:
+                if max_nodes is not None and len(ids) >= max_nodes:
+                    hidden += 1
+                    continue
+                ids[key] = 'n{}'.format(len(ids))
+                queue.append((child, depth + 1))
+            edges.append(('edge', ids[_key(node)], ids[key]))
+
+        yield ('node', ids[_key(node)], node, hidden)
+        yield from edges
+
+
+def _label(node: Expr, hidden: int) -> str:
+    label = '{}: {}'.format(node._display_name, type(node).__name__)
+    values = [
+        repr(arg)
+        for arg in node.args
+        if isinstance(arg, (str, int, float, bool))
+    ]
+    if values:
+        label += ' ({})'.format(', '.join(values))
+    if hidden:
+        label += ' [+{} hidden]'.format(hidden)
+    return label
+
+
+def _quote(text: str) -> str:
+    return '"{}"'.format(text.replace('\\', '\\\\').replace('"', '\\"'))
+
+
+def iter_dot(
+    expr: Expr,
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    structural: bool = True,
+) -> Iterator[str]:
+    """
+    Get the graph of an expression in the DOT language, line by line.
+
+    The lines are generated while the graph is walked (see
+    ``iter_graph``), so large graphs are not kept in memory.
+
+    Parameters
+    ----------
+    expr : Expr
+    max_nodes : int, optional, default None
+    max_depth : int, optional, default None
+    structural : bool, default True
+
+    Returns
+    -------
+    Iterator[str]
+    """
+    yield 'digraph {\n'
+    yield '  node [shape=box]\n'
+    for item in iter_graph(expr, max_nodes, max_depth, structural):
+        if item[0] == 'node':
+            _, node_id, node, hidden = item
+            yield '  {} [label={}]\n'.format(
+                node_id, _quote(_label(node, hidden))
+            )
+        else:
+            yield '  {} -> {}\n'.format(item[1], item[2])
+    yield '}\n'
+
+
+def write_dot(
+    expr: Expr,
+    file: Union[str, TextIO],
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    structural: bool = True,
+):
+    """
+    Write the graph of an expression in the DOT language.
+
+    Parameters
+    ----------
+    expr : Expr
+    file : Union[str, TextIO]
+        A path or a text stream.
+    max_nodes : int, optional, default None
+    max_depth : int, optional, default None
+    structural : bool, default True
+
+    See Also
+    --------
+    iter_dot
+    """
+    if isinstance(file, str):
+        with open(file, 'w') as stream:
+            write_dot(expr, stream, max_nodes, max_depth, structural)
+        return
+    file.writelines(iter_dot(expr, max_nodes, max_depth, structural))
+
+
+def visualize(
+    expr: Expr,
+    max_nodes: Optional[int] = None,
+    max_depth: Optional[int] = None,
+    structural: bool = True,
+) -> gv.Digraph:
     """
     Visualize a graph representation of an expression.
 
+    For large expressions, use the limits or ``write_dot``, which doesn't
+    keep the graph in memory.
+
     Parameters
     ----------
     expr : Expr
+    max_nodes : int, optional, default None
+    max_depth : int, optional, default None
+    structural : bool, default True
 
     Returns
     -------
     gv.Digraph
+
+    See Also
+    --------
+    iter_graph
     """
     g = gv.Digraph(comment='Graph')
     g.attr('node', shape='none', rankdir='BT')
 
-    edges: List = []
-
-    nodes: List = [expr]
-    parent = None
-    while len(nodes):
-        node = nodes.pop(0)
-        node_id = uuid4().hex
-        g.node(node_id, _get_entity_class_html(node))
-        if parent:
-            edges.append((parent[0], node_id))
-        parent = (node_id, node)
-        if isinstance(node.args[0], tt.Expr):
-            nodes.append(node.args[0])
-
-    g.edges(edges)
+    for item in iter_graph(expr, max_nodes, max_depth, structural):
+        if item[0] == 'node':
+            _, node_id, node, hidden = item
+            g.node(node_id, _get_entity_class_html(node, hidden))
+        else:
+            g.edge(item[1], item[2])
     return g